@@ -1,9 +1,30 @@
 from flask import Flask
 from flask_cors import CORS
+from dotenv import load_dotenv
+
+# Load environment variables (GOOGLE_API_KEY enables Gemini alongside Ollama)
+load_dotenv()
+
 from routes.upload_routes import upload_routes
 from routes.ollama_routes import ollama_routes
 from routes.match_routes import match_routes
 from routes.bulk_match_routes import bulk_match_routes  # ✅ new import
+from routes.job_routes import job_routes
+from routes.metrics_routes import metrics_routes
+from routes.match_matrix_routes import match_matrix_routes
+from routes.jd_index_routes import jd_index_routes
+from routes.resume_routes import resume_routes
+from services.admission import init_admission_control
+from services.compression import init_compression
+from services.deadline import init_deadlines
+from services.llm_router import get_llm_router, init_llm_router
+from services.llm_scheduler import init_llm_priorities
+from services.metrics import init_metrics
+from services.request_profiler import init_request_profiler
+from services.stage_timing import init_stage_timing
+from services.job_runner import start_job_workers
+from services.ollama_warmup import get_ollama_warmup_manager, start_ollama_warmup
+from services.serving import is_serving_process
 
 app = Flask(__name__)    # ✅ moved up here
 CORS(app, origins=["http://localhost:3000", "http://192.168.0.114:3000"], methods=["GET", "POST", "OPTIONS"])
@@ -12,6 +33,58 @@ app.register_blueprint(upload_routes)
 app.register_blueprint(ollama_routes)
 app.register_blueprint(match_routes)
 app.register_blueprint(bulk_match_routes)  # ✅ register new blueprint
+app.register_blueprint(job_routes)
+app.register_blueprint(metrics_routes)
+app.register_blueprint(match_matrix_routes)
+app.register_blueprint(jd_index_routes)
+app.register_blueprint(resume_routes)
+
+# Route latency and in-flight requests for /metrics
+init_metrics(app)
+
+# Per-stage timings (extract, cache, queue, llm, parse) in a Server-Timing header
+init_stage_timing(app)
+
+# cProfile a sample of requests into PROFILE_DIR (off unless PROFILE_SAMPLE_RATE or PROFILE_TOKEN is set)
+init_request_profiler(app)
+
+# Gzip large JSON responses (whole-resume results) for clients that accept it
+init_compression(app)
+
+# Give every request a total time budget shared by its LLM calls
+init_deadlines(app)
+
+# Single-bullet endpoints are scheduled ahead of resume-wide work on the LLM backends
+init_llm_priorities(app)
+
+# Cap LLM-bound requests, share the slots fairly per client and answer 429 + Retry-After when full
+init_admission_control(app)
+
+# Each LLM call goes to Ollama or Gemini by LLM_ROUTING_POLICY; X-LLM-Provider pins a request to one
+init_llm_router(app)
+
+# Background threads run only in the process that serves requests: the debug reloader's watcher
+# process imports this module too, and its threads would duplicate the serving child's
+if is_serving_process(run_as_main=__name__ == "__main__"):
+    # Load the Ollama models now so the first user request doesn't pay the cold start
+    start_ollama_warmup()
+
+    # Background workers for /api/jobs; queued jobs from a previous run are resumed. A second pool
+    # could requeue jobs this one has claimed
+    start_job_workers(app)
+
+@app.route('/api/health')
+def api_health():
+    """Health check endpoint for monitoring"""
+    warmup = get_ollama_warmup_manager().status()
+    # Warming up only until the first pass finishes; a model that failed to load degrades, not blocks
+    status = "ready" if warmup["state"] == "disabled" else warmup["state"]
+    return {
+        "status": status,
+        "message": "JobPal Ollama API is running!",
+        "ollama_models": warmup,
+        "llm_router": get_llm_router().status()
+    }
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0')
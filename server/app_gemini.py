@@ -6,44 +6,104 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Import Gemini-powered routes
+# Import the same routes as app.py (cheap: the Gemini SDK and pdfplumber load on first use)
 from routes.upload_routes import upload_routes
-from routes.ollama_routes_gemini import ollama_routes_gemini
-from routes.match_routes_gemini import match_routes_gemini
-from routes.bulk_match_routes_gemini import bulk_match_routes_gemini
-
-app = Flask(__name__)
-
-# Configure CORS for Vercel deployment
-CORS(app, origins=["*"], methods=["GET", "POST", "OPTIONS"])
-
-# Register blueprints with Gemini-powered routes
-app.register_blueprint(upload_routes)
-app.register_blueprint(ollama_routes_gemini)
-app.register_blueprint(match_routes_gemini)
-app.register_blueprint(bulk_match_routes_gemini)
-
-@app.route('/')
-def health_check():
-    return {"status": "healthy", "message": "JobPal Gemini API is running!"}
-
-@app.route('/api/health')
-def api_health():
-    """Health check endpoint for monitoring"""
-    try:
-        # Test if Gemini API key is available
-        api_key = os.getenv('GOOGLE_API_KEY')
-        if not api_key:
-            return {"status": "error", "message": "GOOGLE_API_KEY not configured"}, 500
-        
-        return {
-            "status": "healthy", 
-            "message": "JobPal Gemini API is running!",
-            "version": "gemini-1.0",
-            "api_configured": bool(api_key)
-        }
-    except Exception as e:
-        return {"status": "error", "message": str(e)}, 500
+from routes.ollama_routes import ollama_routes
+from routes.match_routes import match_routes
+from routes.bulk_match_routes import bulk_match_routes
+from routes.job_routes import job_routes
+from routes.metrics_routes import metrics_routes
+from routes.match_matrix_routes import match_matrix_routes
+from routes.jd_index_routes import jd_index_routes
+from routes.resume_routes import resume_routes
+from services.admission import init_admission_control
+from services.compression import init_compression
+from services.deadline import init_deadlines
+from services.llm_router import init_llm_router
+from services.llm_scheduler import init_llm_priorities
+from services.metrics import init_metrics
+from services.request_profiler import init_request_profiler
+from services.resilience import get_fallback_provider
+from services.stage_timing import init_stage_timing
+from services.job_runner import start_job_workers
+from services.serving import is_serving_process
+
+
+def create_app() -> Flask:
+    """Build the Gemini app; nothing here constructs GeminiService or imports the SDK"""
+    app = Flask(__name__)
+
+    # Configure CORS for Vercel deployment
+    CORS(app, origins=["*"], methods=["GET", "POST", "OPTIONS"])
+
+    # Same blueprints as app.py; init_llm_router below sends their LLM calls to Gemini
+    app.register_blueprint(upload_routes)
+    app.register_blueprint(ollama_routes)
+    app.register_blueprint(match_routes)
+    app.register_blueprint(bulk_match_routes)
+    app.register_blueprint(job_routes)
+    app.register_blueprint(metrics_routes)
+    app.register_blueprint(match_matrix_routes)
+    app.register_blueprint(jd_index_routes)
+    app.register_blueprint(resume_routes)
+
+    # Route latency and in-flight requests for /metrics
+    init_metrics(app)
+
+    # Per-stage timings (extract, cache, queue, llm, parse) in a Server-Timing header
+    init_stage_timing(app)
+
+    # cProfile a sample of requests into PROFILE_DIR (off unless PROFILE_SAMPLE_RATE or PROFILE_TOKEN is set)
+    init_request_profiler(app)
+
+    # Gzip large JSON responses (whole-resume results) for clients that accept it
+    init_compression(app)
+
+    # Give every request a total time budget shared by its LLM calls
+    init_deadlines(app)
+
+    # Single-bullet endpoints are scheduled ahead of resume-wide work on the LLM backends
+    init_llm_priorities(app)
+
+    # Cap LLM-bound requests, share the slots fairly per client and answer 429 + Retry-After when full
+    init_admission_control(app)
+
+    # Every LLM call goes to Gemini; Ollama takes over only with LLM_FALLBACK_PROVIDER=ollama
+    providers = ["gemini"] + (["ollama"] if get_fallback_provider("gemini") == "ollama" else [])
+    init_llm_router(app, providers=providers)
+
+    # Background workers for /api/jobs only when JOB_WORKERS is set: on serverless hosts threads don't
+    # outlive a request, and the job database shouldn't be created on every cold start. Never in the
+    # debug reloader's watcher process, which would requeue jobs the serving child has claimed
+    if is_serving_process(run_as_main=__name__ == "__main__"):
+        start_job_workers(app, default_workers=0)
+
+    @app.route('/')
+    def health_check():
+        return {"status": "healthy", "message": "JobPal Gemini API is running!"}
+
+    @app.route('/api/health')
+    def api_health():
+        """Health check endpoint for monitoring"""
+        try:
+            # Test if Gemini API key is available
+            api_key = os.getenv('GOOGLE_API_KEY')
+            if not api_key:
+                return {"status": "error", "message": "GOOGLE_API_KEY not configured"}, 500
+
+            return {
+                "status": "healthy",
+                "message": "JobPal Gemini API is running!",
+                "version": "gemini-1.0",
+                "api_configured": bool(api_key)
+            }
+        except Exception as e:
+            return {"status": "error", "message": str(e)}, 500
+
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0')
@@ -1,7 +1,25 @@
 from flask import Blueprint, request, jsonify
 import requests
 import json
-import re
+import logging
+from services.bullet_cache import lookup_cached_bullets, merge_rewrites
+from services.chunk_planner import estimate_tokens, plan_chunks, run_chunks_concurrently
+from services.deadline import DeadlineExceeded, current_deadline
+from services.jd_digest import jd_prompt_prefix
+from services.job_runner import current_job_progress
+from services.llm_router import get_llm_router, provider_model
+from services.near_duplicates import collapse_near_duplicates
+from services.relevance import select_relevant
+from services.local_rewriter import rewrite_bullets
+from services.resilience import CircuitOpenError, RateLimitedError
+from services.resume_delta import resume_delta, wants_delta
+from services.resume_store import resume_from_request, stored_duplicate_groups
+from services.stage_timing import stage_timer
+from services.structured_output import (
+    fill_missing_rewrites, format_id_bullets, json_output_instructions, rewrite_by_id
+)
+
+OLLAMA_RESUME_MODEL = "phi3:mini"
 
 bulk_match_routes = Blueprint('bulk_match_routes', __name__)
 
@@ -16,37 +34,28 @@ def bulk_match_bullets_to_jd():
     if not bullets or not jd:
         return jsonify({"error": "Missing bullets or job description"}), 400
 
-    # Build optimized prompt for faster processing with structure guidance
-    prompt = _build_structured_prompt(bullets, jd, structure_type, project_context)
-
-    try:
+    def generate(prompt):
         # Use the faster phi3:mini model with optimized parameters
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "phi3:mini",  # Faster, smaller model
-                "prompt": prompt,
-                "stream": False,  # Disable streaming for faster response
-                "options": {
-                    "temperature": 0.7,  # Slightly creative but focused
-                    "top_p": 0.9,  # Focus on most likely tokens
-                    "num_predict": 300  # Increased for structured responses
-                }
+        return get_llm_router().generate(
+            prompt,
+            prefix=jd_prompt_prefix(jd),
+            model="phi3:mini",  # Faster, smaller model
+            options={
+                "temperature": 0.7,  # Slightly creative but focused
+                "top_p": 0.9,  # Focus on most likely tokens
+                "num_predict": 300  # Increased for structured responses
             },
-            timeout=30  # Reduced timeout for faster feedback
+            timeout=30,  # Reduced timeout for faster feedback
+            format="json"
         )
-        response.raise_for_status()
-
-        # Get the response directly (no streaming)
-        response_data = response.json()
-        full_output = response_data.get("response", "").strip()
 
-        # Parse response based on structure type
-        improved_bullets = _parse_structured_response(full_output, structure_type)
-
-        # If parsing failed, return the raw output
-        if not improved_bullets:
-            improved_bullets = [full_output]
+    try:
+        # Bullets are sent with IDs; any the model leaves out are asked for again on their own
+        rewrites = rewrite_by_id(
+            bullets, lambda items: _build_structured_prompt(items, structure_type, project_context),
+            generate, structure_type
+        )
+        improved_bullets, _ = fill_missing_rewrites(rewrites, bullets, jd, structure_type)
 
         return jsonify({
             "improved_bullets": improved_bullets,
@@ -60,73 +69,121 @@ def bulk_match_bullets_to_jd():
         return jsonify({"error": "AI model is taking too long. Try using a shorter job description or fewer bullets."}), 408
     except requests.exceptions.ConnectionError:
         return jsonify({"error": "Cannot connect to AI model. Make sure Ollama is running with 'ollama serve'."}), 503
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(int(e.retry_after) + 1)}
+    except RateLimitedError as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         return jsonify({"error": f"Error processing request: {str(e)}"}), 500
 
 @bulk_match_routes.route('/api/match_entire_resume', methods=['POST'])
 def match_entire_resume():
     """Match entire parsed resume to job description - FAST VERSION"""
-    print("=== match_entire_resume called (FAST VERSION) ===")
     data = request.get_json()
-    resume_data = data.get("resume_data", {})
+    try:
+        resume_data, artifacts = resume_from_request(data)  # Inline "resume_data", or a stored resume's "resume_id"
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     jd = data.get("jd", "")
     structure_type = data.get("structure", "star")  # star, xyz, standard
     focus_areas = data.get("focus_areas", [])  # Specific areas to focus on
+    top_k = data.get("top_k")  # Most relevant bullets to rewrite, 0 for all; defaults to RELEVANCE_TOP_K
+
+    try:
+        top_k = int(top_k) if top_k is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
 
     if not resume_data or not jd:
         return jsonify({"error": "Missing resume data or job description"}), 400
 
     try:
-        print("=== Starting bullet extraction ===")
         # Extract ALL bullets from the parsed resume
-        all_bullets = _extract_all_bullets_from_resume(resume_data)
-        print(f"Extracted {len(all_bullets)} bullets")
+        with stage_timer("extract"):
+            # Stored resumes come with their bullets and duplicate groups already worked out
+            all_bullets = artifacts["bullets"] if artifacts else _extract_all_bullets_from_resume(resume_data)
         
         if not all_bullets:
             return jsonify({"error": "No bullets found in resume data"}), 400
 
-        # FAST APPROACH: Process all bullets in ONE request instead of chunking
-        print("=== Processing all bullets in single request ===")
-        
-        # Build a comprehensive but concise prompt
-        prompt = _build_fast_resume_prompt(all_bullets, jd, structure_type)
-        
-        try:
-            # Single AI request with optimized parameters
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "phi3:mini",
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.5,  # More focused
-                        "top_p": 0.8,
-                        "num_predict": 150  # Reduced for speed
-                    }
-                },
-                timeout=15  # Much shorter timeout
+        # Skill context windows overlap the lines they were cut from; each near-duplicate group is rewritten once
+        with stage_timer("dedupe"):
+            representatives, groups = stored_duplicate_groups(artifacts) or collapse_near_duplicates(all_bullets)
+        unique_bullets = [all_bullets[idx] for idx in representatives]
+
+        # Only the bullets most relevant to the JD are rewritten; the rest are returned as-is
+        with stage_timer("rank"):
+            relevant_positions = select_relevant(unique_bullets, jd, top_k)
+        relevant_bullets = [unique_bullets[idx] for idx in relevant_positions]
+        relevant_groups = set(relevant_positions)
+
+        # Provider chosen up front: the cache key and chunk budgets depend on the model it runs
+        provider = get_llm_router().pick()
+        model = provider_model(provider, OLLAMA_RESUME_MODEL)
+
+        # Reuse per-bullet rewrites from earlier requests; only cache misses go to the LLM
+        with stage_timer("cache"):
+            cache_keys, cached_bullets, miss_positions = lookup_cached_bullets(
+                relevant_bullets, jd, structure_type, model
             )
-            
-            response_data = response.json()
-            output = response_data.get("response", "").strip()
-            
-            # Parse the response
-            improved_bullets = _parse_fast_response(output, structure_type)
-            
-            # If AI failed, use original bullets
-            if not improved_bullets or len(improved_bullets) < len(all_bullets) * 0.5:
-                print("AI response insufficient, using original bullets")
-                improved_bullets = all_bullets
-            
-            print(f"Successfully processed: {len(improved_bullets)} bullets")
-            
-        except Exception as ai_error:
-            print(f"AI processing failed: {ai_error}, using original bullets")
-            improved_bullets = all_bullets
-        
+        bullets_to_process = [relevant_bullets[idx] for idx in miss_positions]
+
+        # Split bullets into chunks sized to the model's token budget and run them concurrently
+        overhead_tokens = estimate_tokens(jd_prompt_prefix(jd) + _build_chunk_prompt([], structure_type, 1, 1))
+        chunks = plan_chunks(bullets_to_process, model, overhead_tokens)
+        logging.debug(
+            f"match_entire_resume: {len(all_bullets)} bullets, {len(unique_bullets)} distinct, "
+            f"{len(relevant_bullets)} relevant, {len(bullets_to_process)} cache misses in {len(chunks)} chunk(s)"
+        )
+
+        # Worker threads have no request context, so hand them the deadline explicitly
+        deadline = current_deadline()
+
+        def process_chunk(chunk, chunk_number, total_chunks):
+            return _process_resume_chunk(chunk, jd, structure_type, chunk_number, total_chunks, deadline, provider)
+
+        rewritten_bullets = run_chunks_concurrently(chunks, process_chunk, on_progress=_chunk_progress())
+        # Local degraded-mode rewrites are returned but never cached
+        cacheable = [idx not in chunk.get("local_positions", ()) for chunk in chunks
+                     for idx in range(len(chunk["bullets"]))]
+        improved_relevant = merge_rewrites(cached_bullets, cache_keys, miss_positions, relevant_bullets,
+                                           rewritten_bullets, cacheable)
+        # Fan each rewrite out to every position in its group
+        rewrites = dict(zip(relevant_positions, improved_relevant))
+        improved_bullets = [rewrites.get(group, bullet) for bullet, group in zip(all_bullets, groups)]
+        
+        summary = {
+            "total_original_bullets": len(all_bullets),
+            "total_improved_bullets": len(improved_bullets),
+            "skipped_bullets": sum(len(chunk["bullets"]) for chunk in chunks if chunk.get("skipped")),
+            "locally_rewritten_bullets": sum(len(chunk.get("local_positions", ())) for chunk in chunks),
+            "not_relevant_bullets": sum(group not in relevant_groups for group in groups),
+            "collapsed_duplicates": len(all_bullets) - len(unique_bullets)
+        }
+        partial = any(chunk.get("skipped") for chunk in chunks)
+
+        # Slim mode: the client already has the resume, so send back only what changed
+        if wants_delta(data):
+            changes = resume_delta(all_bullets, improved_bullets, resume_data)
+            summary["changed_bullets"] = len(changes)
+            return jsonify({
+                "success": True,
+                "response_mode": "delta",
+                "structure_used": structure_type,
+                "focus_areas": focus_areas,
+                "changes": changes,
+                "partial": partial,
+                "summary": summary
+            })
+
         # Organize results back into resume structure
-        improved_results = _organize_bullets_into_resume(improved_bullets, resume_data)
+        with stage_timer("organize"):
+            improved_results = _organize_bullets_into_resume(improved_bullets, resume_data)
+        summary["sections_processed"] = list(improved_results.keys())
         
         return jsonify({
             "success": True,
@@ -134,25 +191,24 @@ def match_entire_resume():
             "focus_areas": focus_areas,
             "original_resume": resume_data,
             "improved_results": improved_results,
-            "summary": {
-                "total_original_bullets": len(all_bullets),
-                "total_improved_bullets": len(improved_bullets),
-                "sections_processed": list(improved_results.keys())
-            }
+            "partial": partial,
+            "summary": summary
         })
 
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error in match_entire_resume: {str(e)}")
-        print(f"Traceback: {error_details}")
+        logging.exception("match_entire_resume failed")
         return jsonify({"error": f"Error processing entire resume: {str(e)}"}), 500
 
 @bulk_match_routes.route('/api/match_structured_resume', methods=['POST'])
 def match_structured_resume():
     """Match structured resume data to job description with enhanced formatting"""
     data = request.get_json()
-    resume_data = data.get("resume_data", {})
+    try:
+        resume_data, _ = resume_from_request(data)  # Inline "resume_data", or a stored resume's "resume_id"
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     jd = data.get("jd", "")
     structure_type = data.get("structure", "star")  # star, xyz, hybrid
     focus_areas = data.get("focus_areas", [])  # Specific areas to focus on
@@ -162,47 +218,71 @@ def match_structured_resume():
 
     try:
         # Extract and organize bullets by category
-        organized_bullets = _organize_resume_bullets(resume_data)
+        with stage_timer("extract"):
+            organized_bullets = _organize_resume_bullets(resume_data)
         
         # Match each category to the job description
         matched_results = {}
+        skipped_categories = []
+        deadline = current_deadline()
+        progress = current_job_progress()
         
-        for category, bullets in organized_bullets.items():
+        for done, (category, bullets) in enumerate(organized_bullets.items()):
+            if progress:
+                progress(done, len(organized_bullets), "categories")
             if bullets:
-                category_prompt = _build_category_prompt(category, bullets, jd, structure_type, focus_areas)
+                # Out of time: rewrite locally instead of starting work nobody will receive
+                if deadline and deadline.expired():
+                    skipped_categories.append(category)
+                    matched_results[category] = _local_category_result(bullets, jd, structure_type)
+                    continue
                 
-                response = requests.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": "phi3:mini",
-                        "prompt": category_prompt,
-                        "stream": False,
-                        "options": {
+                def generate(prompt):
+                    return get_llm_router().generate(
+                        prompt,
+                        prefix=jd_prompt_prefix(jd),
+                        model="phi3:mini",
+                        options={
                             "temperature": 0.6,
                             "top_p": 0.9,
                             "num_predict": 250
-                        }
-                    },
-                    timeout=25
-                )
-                response.raise_for_status()
+                        },
+                        timeout=25,
+                        format="json"
+                    )
                 
-                response_data = response.json()
-                category_output = response_data.get("response", "").strip()
+                try:
+                    rewrites = rewrite_by_id(
+                        bullets,
+                        lambda items: _build_category_prompt(category, items, structure_type, focus_areas),
+                        generate, structure_type
+                    )
+                except DeadlineExceeded:
+                    skipped_categories.append(category)
+                    matched_results[category] = _local_category_result(bullets, jd, structure_type)
+                    continue
+                except Exception as category_error:
+                    logging.warning(f"LLM call failed for category {category}: {category_error}, using local rewrites")
+                    matched_results[category] = _local_category_result(bullets, jd, structure_type)
+                    continue
                 
-                # Parse the structured response
-                matched_bullets = _parse_structured_response(category_output, structure_type)
+                matched_bullets, _ = fill_missing_rewrites(rewrites, bullets, jd, structure_type)
                 matched_results[category] = {
                     "original_bullets": bullets,
                     "improved_bullets": matched_bullets,
                     "count": len(matched_bullets)
                 }
         
+        if progress:
+            progress(len(organized_bullets), len(organized_bullets), "categories")
+        
         return jsonify({
             "success": True,
             "structure_used": structure_type,
             "focus_areas": focus_areas,
             "results": matched_results,
+            "partial": bool(skipped_categories),
+            "skipped_categories": skipped_categories,
             "summary": {
                 "total_categories": len(matched_results),
                 "total_improved_bullets": sum(len(result["improved_bullets"]) for result in matched_results.values())
@@ -216,7 +296,12 @@ def match_structured_resume():
 def bundle_bullets_by_project():
     """Bundle and organize bullets by project/experience for better storytelling"""
     data = request.get_json()
-    resume_data = data.get("resume_data", {})
+    try:
+        resume_data, _ = resume_from_request(data)  # Inline "resume_data", or a stored resume's "resume_id"
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     jd = data.get("jd", "")
     bundling_strategy = data.get("strategy", "project")  # project, experience, skill
 
@@ -225,32 +310,45 @@ def bundle_bullets_by_project():
 
     try:
         # Bundle bullets based on strategy
-        bundled_bullets = _bundle_bullets_by_strategy(resume_data, bundling_strategy)
+        with stage_timer("extract"):
+            bundled_bullets = _bundle_bullets_by_strategy(resume_data, bundling_strategy)
         
         # Create project narratives
         project_narratives = []
-        
-        for bundle in bundled_bullets:
-            narrative_prompt = _build_narrative_prompt(bundle, jd)
+        skipped_projects = []
+        deadline = current_deadline()
+        progress = current_job_progress()
+        
+        for done, bundle in enumerate(bundled_bullets):
+            if progress:
+                progress(done, len(bundled_bullets), "projects")
+            # Out of time: return the narratives we have instead of starting work nobody will receive
+            if deadline and deadline.expired():
+                skipped_projects.append(bundle.get("name", "Unknown Project"))
+                continue
             
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "phi3:mini",
-                    "prompt": narrative_prompt,
-                    "stream": False,
-                    "options": {
+            narrative_prompt = _build_narrative_prompt(bundle)
+            
+            try:
+                narrative = get_llm_router().generate(
+                    narrative_prompt,
+                    prefix=jd_prompt_prefix(jd),
+                    model="phi3:mini",
+                    options={
                         "temperature": 0.7,
                         "top_p": 0.9,
                         "num_predict": 200
-                    }
-                },
-                timeout=20
-            )
-            response.raise_for_status()
-            
-            response_data = response.json()
-            narrative = response_data.get("response", "").strip()
+                    },
+                    timeout=20
+                )
+            except DeadlineExceeded:
+                skipped_projects.append(bundle.get("name", "Unknown Project"))
+                continue
+            except Exception as narrative_error:
+                logging.warning(f"LLM call failed for the {bundle.get('name')} narrative: {narrative_error}")
+                skills = bundle.get("skills", [])
+                narrative = (f"Worked on {bundle.get('name', 'Unknown Project')} project involving "
+                             f"{', '.join(skills) if skills else 'various technologies'}.")
             
             project_narratives.append({
                 "project_name": bundle.get("name", "Unknown Project"),
@@ -260,16 +358,38 @@ def bundle_bullets_by_project():
                 "impact": bundle.get("impact", "")
             })
         
+        if progress:
+            progress(len(bundled_bullets), len(bundled_bullets), "projects")
+        
         return jsonify({
             "success": True,
             "bundling_strategy": bundling_strategy,
             "project_narratives": project_narratives,
-            "total_projects": len(project_narratives)
+            "total_projects": len(project_narratives),
+            "partial": bool(skipped_projects),
+            "skipped_projects": skipped_projects
         })
 
     except Exception as e:
         return jsonify({"error": f"Error bundling bullets: {str(e)}"}), 500
 
+def _chunk_progress():
+    """Job progress callback counting bullet chunks, or None outside a job"""
+    progress = current_job_progress()
+    if progress is None:
+        return None
+    return lambda done, total: progress(done, total, "chunks")
+
+def _local_category_result(bullets, jd, structure_type):
+    """Category result from the local rewriter, used when the LLM fails or can't answer in time"""
+    improved_bullets = rewrite_bullets(bullets, jd, structure_type)
+    return {
+        "original_bullets": bullets,
+        "improved_bullets": improved_bullets,
+        "count": len(improved_bullets),
+        "degraded": True
+    }
+
 def _extract_all_bullets_from_resume(resume_data):
     """Extract ALL bullets from the parsed resume data"""
     all_bullets = []
@@ -295,8 +415,8 @@ def _extract_all_bullets_from_resume(resume_data):
     
     return all_bullets
 
-def _build_comprehensive_resume_prompt(resume_data, all_bullets, jd, structure_type, focus_areas):
-    """Build comprehensive prompt for entire resume processing"""
+def _build_structured_prompt(items, structure_type, project_context):
+    """Build prompt for (id, bullet) pairs based on desired structure type; the JD goes in the shared prefix"""
     
     structure_guidance = {
         "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
@@ -304,180 +424,39 @@ def _build_comprehensive_resume_prompt(resume_data, all_bullets, jd, structure_t
         "xyz": "Rewrite these resume bullets using the XYZ format: 'Accomplished X by implementing Y, which resulted in Z.' Focus on achievements and quantifiable results."
     }
     
-    focus_text = f"\nFocus Areas: {', '.join(focus_areas)}" if focus_areas else ""
+    project_context_text = f"\nProject Context: {project_context}\n" if project_context else ""
     
-    # Build comprehensive prompt
     prompt = (
-        f"Rewrite this entire resume to match the job description using {structure_type.upper()} format.\n\n"
-        f"Job Description: {jd}\n"
-        f"{focus_text}\n\n"
-        f"Resume Summary:\n"
-        f"Name: {resume_data.get('name', 'Unknown')}\n"
-        f"Summary: {resume_data.get('summary', 'No summary provided')}\n\n"
-        f"Skills Detected: {_format_skills_summary(resume_data.get('skills', []))}\n\n"
-        f"All Resume Bullets ({len(all_bullets)} total):\n"
-    )
-    
-    for idx, bullet in enumerate(all_bullets, 1):
-        prompt += f"{idx}. {bullet}\n"
-    
-    prompt += f"\n{structure_guidance.get(structure_type, structure_guidance['standard'])}\n"
-    prompt += f"Rewrite ALL bullets using {structure_type.upper()} format, maintaining the same number of bullets:\n"
-    
-    return prompt
-
-def _format_skills_summary(skills_data):
-    """Format skills data for prompt"""
-    if not skills_data:
-        return "No skills detected"
-    
-    summary = []
-    for category in skills_data:
-        category_name = category.get("category", "Unknown")
-        skill_count = len(category.get("skills", []))
-        summary.append(f"{category_name}: {skill_count} skills")
-    
-    return "; ".join(summary)
-
-def _parse_comprehensive_response(response_text, structure_type, original_resume):
-    """Parse comprehensive AI response and organize by section"""
-    
-    lines = response_text.split('\n')
-    improved_bullets = []
-    
-    # Parse the improved bullets
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('Improved') or line.startswith('Rewrite'):
-            continue
-            
-        # Remove numbering if present
-        if line[0].isdigit() and '. ' in line:
-            line = line.split('. ', 1)[1]
-        
-        # Clean up structure markers if present
-        if structure_type == "star":
-            line = re.sub(r'^(Situation|Task|Action|Result):\s*', '', line, flags=re.IGNORECASE)
-        elif structure_type == "xyz":
-            line = re.sub(r'^(Accomplished|Delivered|Improved|Achieved|Developed|Implemented|Managed|Led|Created|Built):\s*', '', line, flags=re.IGNORECASE)
-        
-        if line:
-            improved_bullets.append(line)
-    
-    # Organize improved bullets back into resume structure
-    organized_results = {
-        "experience": [],
-        "projects": [],
-        "skills": [],
-        "summary": original_resume.get("summary", "")
-    }
-    
-    # Distribute improved bullets back to original sections
-    bullet_index = 0
-    
-    # Experience section
-    for exp in original_resume.get("experience", []):
-        original_bullet_count = len(exp.get("bullets", []))
-        exp_improved_bullets = improved_bullets[bullet_index:bullet_index + original_bullet_count]
-        bullet_index += original_bullet_count
-        
-        organized_results["experience"].append({
-            "company": exp.get("company", ""),
-            "title": exp.get("title", ""),
-            "dates": exp.get("dates", ""),
-            "original_bullets": exp.get("bullets", []),
-            "improved_bullets": exp_improved_bullets
-        })
-    
-    # Projects section
-    for project in original_resume.get("projects", []):
-        original_bullet_count = len(project.get("bullets", []))
-        project_improved_bullets = improved_bullets[bullet_index:bullet_index + original_bullet_count]
-        bullet_index += original_bullet_count
-        
-        organized_results["projects"].append({
-            "name": project.get("name", ""),
-            "description": project.get("description", ""),
-            "tech_stack": project.get("tech_stack", []),
-            "original_bullets": project.get("bullets", []),
-            "improved_bullets": project_improved_bullets
-        })
-    
-    # Skills section (context-based)
-    for skill_category in original_resume.get("skills", []):
-        category_improved = {
-            "category": skill_category.get("category", ""),
-            "skills": []
-        }
-        
-        for skill in skill_category.get("skills", []):
-            if skill.get("context"):
-                original_bullet_count = 1
-                skill_improved_bullets = improved_bullets[bullet_index:bullet_index + original_bullet_count]
-                bullet_index += original_bullet_count
-                
-                category_improved["skills"].append({
-                    "skill": skill.get("skill", ""),
-                    "confidence": skill.get("confidence", 0),
-                    "original_context": skill.get("context", ""),
-                    "improved_context": skill_improved_bullets[0] if skill_improved_bullets else skill.get("context", "")
-                })
-        
-        if category_improved["skills"]:
-            organized_results["skills"].append(category_improved)
-    
-    return organized_results
-
-def _build_structured_prompt(bullets, jd, structure_type, project_context):
-    """Build prompt based on desired structure type"""
-    
-    structure_guidance = {
-        "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
-        "star": "Rewrite these resume bullets using the STAR method (Situation, Task, Action, Result). Each bullet should clearly show the context, what you did, and the outcome.",
-        "xyz": "Rewrite these resume bullets using the XYZ format: 'Accomplished X by implementing Y, which resulted in Z.' Focus on achievements and quantifiable results."
-    }
-    
-    project_context_text = f"\nProject Context: {project_context}" if project_context else ""
-    
-    prompt = (
-        f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n\n"
-        f"Job Description: {jd}\n"
-        f"{project_context_text}\n\n"
+        f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n"
+        f"{project_context_text}\n"
         f"Resume Bullets:\n"
+        f"{format_id_bullets(items)}\n"
+        f"Rewrite each bullet using {structure_type.upper()} format. "
+        f"{json_output_instructions([bullet_id for bullet_id, _ in items])}"
     )
-
-    for idx, bullet in enumerate(bullets, 1):
-        prompt += f"{idx}. {bullet}\n"
-
-    prompt += f"\nImproved bullets using {structure_type.upper()} format:"
     
     return prompt
 
-def _build_category_prompt(category, bullets, jd, structure_type, focus_areas):
-    """Build prompt for specific category matching"""
+def _build_category_prompt(category, items, structure_type, focus_areas):
+    """Build prompt for (id, bullet) pairs of one category; the JD goes in the shared prefix"""
     
     focus_text = f"\nFocus Areas: {', '.join(focus_areas)}" if focus_areas else ""
     
     prompt = (
         f"Rewrite these {category} resume bullets to match the job description using {structure_type.upper()} format.\n"
-        f"Job Description: {jd}\n"
         f"{focus_text}\n\n"
         f"{category} Bullets:\n"
+        f"{format_id_bullets(items)}\n"
+        f"{json_output_instructions([bullet_id for bullet_id, _ in items])}"
     )
     
-    for idx, bullet in enumerate(bullets, 1):
-        prompt += f"{idx}. {bullet}\n"
-    
-    prompt += f"\nImproved {category} bullets:"
-    
     return prompt
 
-def _build_narrative_prompt(bundle, jd):
-    """Build prompt for creating project narratives"""
+def _build_narrative_prompt(bundle):
+    """Build prompt for creating project narratives; the JD goes in the shared prefix"""
     
     prompt = (
-        f"Create a compelling narrative for this project that would impress HR managers.\n"
-        f"Job Description: {jd}\n\n"
+        f"Create a compelling narrative for this project that would impress HR managers.\n\n"
         f"Project: {bundle.get('name', 'Unknown')}\n"
         f"Skills Used: {', '.join(bundle.get('skills', []))}\n"
         f"Original Bullets:\n"
@@ -490,32 +469,6 @@ def _build_narrative_prompt(bundle, jd):
     
     return prompt
 
-def _parse_structured_response(response_text, structure_type):
-    """Parse AI response based on structure type"""
-    
-    lines = response_text.split('\n')
-    improved_bullets = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('Improved bullets:') or line.startswith('Improved'):
-            continue
-            
-        # Remove numbering if present
-        if line[0].isdigit() and '. ' in line:
-            line = line.split('. ', 1)[1]
-        
-        # Clean up structure markers if present
-        if structure_type == "star":
-            line = re.sub(r'^(Situation|Task|Action|Result):\s*', '', line, flags=re.IGNORECASE)
-        elif structure_type == "xyz":
-            line = re.sub(r'^(Accomplished|Delivered|Improved|Achieved|Developed|Implemented|Managed|Led|Created|Built):\s*', '', line, flags=re.IGNORECASE)
-        
-        if line:
-            improved_bullets.append(line)
-    
-    return improved_bullets
-
 def _organize_resume_bullets(resume_data):
     """Organize resume bullets by category"""
     
@@ -632,8 +585,8 @@ def _extract_skills_from_bullets(bullets):
     # For now, return empty list
     return []
 
-def _build_chunk_prompt(bullet_chunk, jd, structure_type, chunk_number, total_chunks):
-    """Build prompt for processing a chunk of bullets"""
+def _build_chunk_prompt(items, structure_type, chunk_number, total_chunks):
+    """Build prompt for a chunk of (id, bullet) pairs; the JD goes in the shared prefix"""
     
     structure_guidance = {
         "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
@@ -643,164 +596,69 @@ def _build_chunk_prompt(bullet_chunk, jd, structure_type, chunk_number, total_ch
     
     prompt = (
         f"This is chunk {chunk_number} of {total_chunks} from a resume optimization task.\n\n"
-        f"Job Description: {jd}\n\n"
         f"Resume Bullets (Chunk {chunk_number}):\n"
+        f"{format_id_bullets(items)}\n"
+        f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n"
+        f"Rewrite these bullets using {structure_type.upper()} format. "
+        f"{json_output_instructions([bullet_id for bullet_id, _ in items])}\n"
     )
     
-    for idx, bullet in enumerate(bullet_chunk, 1):
-        prompt += f"{idx}. {bullet}\n"
-    
-    prompt += f"\n{structure_guidance.get(structure_type, structure_guidance['standard'])}\n"
-    prompt += f"Rewrite these bullets using {structure_type.upper()} format, maintaining the same number of bullets:\n"
-    
     return prompt
 
-def _parse_chunk_response(response_text, structure_type):
-    """Parse AI response for a single chunk"""
-    
-    lines = response_text.split('\n')
-    improved_bullets = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('Improved') or line.startswith('Rewrite') or line.startswith('Chunk'):
-            continue
-            
-        # Remove numbering if present
-        if line[0].isdigit() and '. ' in line:
-            line = line.split('. ', 1)[1]
-        
-        # Clean up structure markers if present
-        if structure_type == "star":
-            line = re.sub(r'^(Situation|Task|Action|Result):\s*', '', line, flags=re.IGNORECASE)
-        elif structure_type == "xyz":
-            line = re.sub(r'^(Accomplished|Delivered|Improved|Achieved|Developed|Implemented|Managed|Led|Created|Built):\s*', '', line, flags=re.IGNORECASE)
-        
-        if line:
-            improved_bullets.append(line)
+def _process_resume_chunk(chunk, jd, structure_type, chunk_number, total_chunks, deadline=None, provider=None):
+    """
+    Rewrite one chunk of resume bullets, falling back to the local rewriter for anything the LLM misses
+
+    provider pins the calls to the provider the chunk was sized and cached for; with none the router picks
+    """
+    
+    bullets = chunk["bullets"]
+    if deadline and deadline.expired():
+        chunk["skipped"] = True
+        return _local_chunk_result(chunk, jd, structure_type)
+    
+    def generate(prompt):
+        return get_llm_router().generate(
+            prompt,
+            prefix=jd_prompt_prefix(jd),
+            model=OLLAMA_RESUME_MODEL,
+            options={
+                "temperature": 0.5,  # More focused
+                "top_p": 0.8,
+                "num_predict": chunk["num_predict"]  # Sized to the bullets in this chunk
+            },
+            timeout=15,
+            deadline=deadline,
+            format="json",
+            provider=provider
+        )
     
+    try:
+        rewrites = rewrite_by_id(
+            bullets, lambda items: _build_chunk_prompt(items, structure_type, chunk_number, total_chunks),
+            generate, structure_type
+        )
+    except DeadlineExceeded:
+        logging.debug(f"Deadline reached before chunk {chunk_number}/{total_chunks}, using local rewrites")
+        chunk["skipped"] = True
+        return _local_chunk_result(chunk, jd, structure_type)
+    except Exception as ai_error:
+        logging.warning(f"LLM call failed for chunk {chunk_number}/{total_chunks}: {ai_error}, using local rewrites")
+        return _local_chunk_result(chunk, jd, structure_type)
+    
+    # Bullets are matched by ID, so only the ones the model never returned are rewritten locally
+    improved_bullets, local_positions = fill_missing_rewrites(rewrites, bullets, jd, structure_type)
+    if local_positions:
+        logging.debug(f"Chunk {chunk_number}/{total_chunks}: {len(local_positions)} bullet(s) rewritten locally")
+        chunk["degraded"] = True
+        chunk["local_positions"] = local_positions
     return improved_bullets
 
-def _parse_comprehensive_response_from_chunks(all_improved_bullets, structure_type, original_resume):
-    """Parse comprehensive AI response from chunked processing and organize by section"""
-    
-    # Organize improved bullets back into resume structure
-    organized_results = {
-        "experience": [],
-        "projects": [],
-        "skills": [],
-        "summary": original_resume.get("summary", "")
-    }
-    
-    # Distribute improved bullets back to original sections
-    bullet_index = 0
-    
-    # Experience section
-    for exp in original_resume.get("experience", []):
-        original_bullet_count = len(exp.get("bullets", []))
-        exp_improved_bullets = all_improved_bullets[bullet_index:bullet_index + original_bullet_count]
-        bullet_index += original_bullet_count
-        
-        organized_results["experience"].append({
-            "company": exp.get("company", ""),
-            "title": exp.get("title", ""),
-            "dates": exp.get("dates", ""),
-            "original_bullets": exp.get("bullets", []),
-            "improved_bullets": exp_improved_bullets
-        })
-    
-    # Projects section
-    for project in original_resume.get("projects", []):
-        original_bullet_count = len(project.get("bullets", []))
-        project_improved_bullets = all_improved_bullets[bullet_index:bullet_index + original_bullet_count]
-        bullet_index += original_bullet_count
-        
-        organized_results["projects"].append({
-            "name": project.get("name", ""),
-            "description": project.get("description", ""),
-            "tech_stack": project.get("tech_stack", []),
-            "original_bullets": project.get("bullets", []),
-            "improved_bullets": project_improved_bullets
-        })
-    
-    # Skills section (context-based)
-    for skill_category in original_resume.get("skills", []):
-        category_improved = {
-            "category": skill_category.get("category", ""),
-            "skills": []
-        }
-        
-        for skill in skill_category.get("skills", []):
-            if skill.get("context"):
-                original_bullet_count = 1
-                skill_improved_bullets = all_improved_bullets[bullet_index:bullet_index + original_bullet_count]
-                bullet_index += original_bullet_count
-                
-                category_improved["skills"].append({
-                    "skill": skill.get("skill", ""),
-                    "confidence": skill.get("confidence", 0),
-                    "original_context": skill.get("context", ""),
-                    "improved_context": skill_improved_bullets[0] if skill_improved_bullets else skill.get("context", "")
-                })
-        
-        if category_improved["skills"]:
-            organized_results["skills"].append(category_improved)
-    
-    return organized_results
-
-def _build_fast_resume_prompt(all_bullets, jd, structure_type):
-    """Build a fast, concise prompt for all bullets"""
-    
-    structure_guidance = {
-        "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
-        "star": "Rewrite using STAR method (Situation, Task, Action, Result). Show context, action, outcome.",
-        "xyz": "Rewrite using XYZ format: 'Accomplished X by implementing Y, which resulted in Z.'"
-    }
-    
-    # Truncate JD if too long
-    jd_short = jd[:200] + "..." if len(jd) > 200 else jd
-    
-    # Limit bullets if too many
-    bullets_to_process = all_bullets[:20] if len(all_bullets) > 20 else all_bullets
-    
-    prompt = (
-        f"Rewrite these resume bullets to match the job description using {structure_type.upper()} format.\n\n"
-        f"Job Description: {jd_short}\n\n"
-        f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n\n"
-        f"Resume Bullets:\n"
-    )
-    
-    for idx, bullet in enumerate(bullets_to_process, 1):
-        prompt += f"{idx}. {bullet}\n"
-    
-    prompt += f"\nImproved bullets using {structure_type.upper()} format:\n"
-    
-    return prompt
-
-def _parse_fast_response(response_text, structure_type):
-    """Parse AI response quickly"""
-    lines = response_text.split('\n')
-    improved_bullets = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('Improved') or line.startswith('Rewrite'):
-            continue
-            
-        # Remove numbering if present
-        if line[0].isdigit() and '. ' in line:
-            line = line.split('. ', 1)[1]
-        
-        # Clean up structure markers
-        if structure_type == "star":
-            line = re.sub(r'^(Situation|Task|Action|Result):\s*', '', line, flags=re.IGNORECASE)
-        elif structure_type == "xyz":
-            line = re.sub(r'^(Accomplished|Delivered|Improved|Achieved|Developed|Implemented|Managed|Led|Created|Built):\s*', '', line, flags=re.IGNORECASE)
-        
-        if line:
-            improved_bullets.append(line)
-    
-    return improved_bullets
+def _local_chunk_result(chunk, jd, structure_type):
+    """Rewrite a whole chunk locally and mark it as not cacheable"""
+    chunk["degraded"] = True
+    chunk["local_positions"] = list(range(len(chunk["bullets"])))
+    return rewrite_bullets(chunk["bullets"], jd, structure_type)
 
 def _organize_bullets_into_resume(improved_bullets, original_resume):
     """Organize improved bullets back into resume structure"""
@@ -0,0 +1,84 @@
+from flask import Blueprint, request, jsonify
+from services.jd_index import get_jd_index
+from services.resume_store import resume_from_request
+from services.stage_timing import stage_timer
+
+jd_index_routes = Blueprint('jd_index_routes', __name__)
+
+@jd_index_routes.route('/api/jds', methods=['POST'])
+def add_jds():
+    """Add or replace stored job descriptions"""
+    data = request.get_json() or {}
+    jds = data.get("jds") or ([data] if data.get("text") or data.get("description") else [])  # List, or one {"id", "title", "text"}
+
+    if not jds:
+        return jsonify({"error": "Missing job descriptions"}), 400
+
+    try:
+        ids = get_jd_index().add_many(jds)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"success": True, "ids": ids, "total": get_jd_index().count()})
+
+@jd_index_routes.route('/api/jds/import', methods=['POST'])
+def import_jds():
+    """Bulk-load JSON Lines (one JD per line); the body is read as a stream, never held in memory whole"""
+    with stage_timer("ingest"):
+        result = get_jd_index().import_jsonl(request.stream)
+    result["success"] = True
+    result["total"] = get_jd_index().count()
+    return jsonify(result)
+
+@jd_index_routes.route('/api/jds/<jd_id>', methods=['GET'])
+def get_jd(jd_id):
+    jd = get_jd_index().get(jd_id)
+    if jd is None:
+        return jsonify({"error": "Job description not found"}), 404
+    return jsonify(jd)
+
+@jd_index_routes.route('/api/jds/<jd_id>', methods=['DELETE'])
+def delete_jd(jd_id):
+    if not get_jd_index().delete(jd_id):
+        return jsonify({"error": "Job description not found"}), 404
+    return jsonify({"success": True, "id": jd_id})
+
+@jd_index_routes.route('/api/jds/search', methods=['GET', 'POST'])
+def search_jds():
+    """BM25 search over stored job descriptions"""
+    data = request.get_json(silent=True) or request.args
+    query = data.get("q", "") or data.get("query", "")
+    try:
+        top_k = int(data.get("top_k", 10))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+
+    if not query.strip():
+        return jsonify({"error": "Missing query"}), 400
+
+    with stage_timer("search"):
+        results = get_jd_index().search(query, top_k)
+    return jsonify({"success": True, "results": results})
+
+@jd_index_routes.route('/api/jds/match', methods=['POST'])
+def match_jds():
+    """Stored job descriptions that best fit a resume's skills"""
+    data = request.get_json() or {}
+    try:
+        resume_data, _ = resume_from_request(data)  # Inline "resume_data", or a stored resume's "resume_id"
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Parsed skills (from /api/upload_resume), a list of skill names, or resume text to extract them from
+    skills = data.get("skills") or resume_data.get("skills") or data.get("resume_text", "")
+    try:
+        top_k = int(data.get("top_k", 10))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+
+    if not skills:
+        return jsonify({"error": "Missing resume skills"}), 400
+
+    with stage_timer("search"):
+        results = get_jd_index().match_skills(skills, top_k)
+    return jsonify({"success": True, "results": results})
@@ -0,0 +1,82 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+import json
+import os
+import time
+from services.job_runner import JOB_TYPES, get_job_runner
+from services.job_store import FINISHED_STATUSES
+
+JOB_EVENT_POLL_SECONDS = float(os.getenv("JOB_EVENT_POLL_SECONDS", "0.5"))
+JOB_EVENT_MAX_SECONDS = float(os.getenv("JOB_EVENT_MAX_SECONDS", "600"))
+
+job_routes = Blueprint('job_routes', __name__)
+
+@job_routes.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a long-running resume operation and return its job ID immediately"""
+    data = request.get_json() or {}
+    job_type = data.get("type", "")
+    payload = data.get("payload", {})
+
+    if job_type not in JOB_TYPES:
+        return jsonify({"error": f"Unknown job type. Use one of: {', '.join(JOB_TYPES)}"}), 400
+    if not isinstance(payload, dict) or not payload:
+        return jsonify({"error": "Missing job payload"}), 400
+
+    runner = get_job_runner()
+    if runner is None:
+        return jsonify({"error": "Job workers are disabled on this server"}), 503
+
+    job = runner.submit(job_type, payload)
+    job["status_url"] = f"/api/jobs/{job['job_id']}"
+    job["events_url"] = f"/api/jobs/{job['job_id']}/events"
+    job["result_url"] = f"/api/jobs/{job['job_id']}/result"
+    return jsonify(job), 202, {"Location": job["status_url"]}
+
+@job_routes.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status and progress, plus the result once it has finished"""
+    runner = get_job_runner()
+    job = runner.store.get(job_id, include_result=True) if runner else None
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@job_routes.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """The job's response body with the status code the endpoint returned"""
+    runner = get_job_runner()
+    job = runner.store.get(job_id, include_result=True) if runner else None
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    if job["status"] not in FINISHED_STATUSES:
+        return jsonify({"job_id": job_id, "status": job["status"], "progress": job["progress"]}), 202, {"Retry-After": "1"}
+    if "result" not in job:
+        return jsonify({"error": job["error"] or "Job failed"}), job["http_status"] or 500
+    return jsonify(job["result"]), job["http_status"]
+
+@job_routes.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Server-sent events with the job's progress until it finishes"""
+    runner = get_job_runner()
+    if runner is None or runner.store.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    def events():
+        last_sent = None
+        stop_at = time.monotonic() + JOB_EVENT_MAX_SECONDS
+        while time.monotonic() < stop_at:
+            job = runner.store.get(job_id)
+            if job is None:
+                return
+            state = (job["status"], job["progress"]["done"], job["progress"]["total"])
+            if state != last_sent:
+                last_sent = state
+                event = "done" if job["status"] in FINISHED_STATUSES else "progress"
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                if event == "done":
+                    return
+            time.sleep(JOB_EVENT_POLL_SECONDS)
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
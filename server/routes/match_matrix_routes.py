@@ -0,0 +1,77 @@
+from flask import Blueprint, request, jsonify
+from services.match_matrix import MATCH_MATRIX_MAX_CELLS, resume_text, top_matches
+from services.resume_store import resume_from_request
+from services.stage_timing import stage_timer
+
+match_matrix_routes = Blueprint('match_matrix_routes', __name__)
+
+@match_matrix_routes.route('/api/match_matrix', methods=['POST'])
+def match_matrix():
+    """Score many resumes against many job descriptions without an LLM"""
+    data = request.get_json() or {}
+    resumes = data.get("resumes", [])  # Parsed resumes (from /api/upload_resume), plain text, {"id", "resume_data"/"text"} or {"resume_id"}
+    jds = data.get("jds", [])  # Job description texts, or {"id": ..., "text": ...}
+    try:
+        top_k = int(data.get("top_k", 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+    include_matrix = bool(data.get("include_matrix", False))
+
+    if not resumes or not jds:
+        return jsonify({"error": "Missing resumes or job descriptions"}), 400
+    if len(resumes) * len(jds) > MATCH_MATRIX_MAX_CELLS:
+        return jsonify({"error": f"At most {MATCH_MATRIX_MAX_CELLS} resume x job description pairs per request"}), 413
+
+    resume_ids = [_item_id(item, idx) for idx, item in enumerate(resumes)]
+    jd_ids = [_item_id(item, idx) for idx, item in enumerate(jds)]
+    try:
+        resume_texts = [_resume_text(item) for item in resumes]
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    jd_texts = [_item_content(item) for item in jds]
+
+    with stage_timer("score"):
+        result = top_matches(resume_texts, jd_texts, top_k, include_matrix)
+
+    rows = []
+    for resume_id, matches in zip(resume_ids, result["matches"]):
+        for match in matches:
+            match["jd_id"] = jd_ids[match.pop("jd_index")]
+        rows.append({"resume_id": resume_id, "matches": matches})
+
+    response = {
+        "success": True,
+        "resumes": len(resumes),
+        "jds": len(jds),
+        "results": rows,
+        "common_gaps": result["common_gaps"]
+    }
+    if include_matrix:
+        response["matrix"] = result["matrix"]
+    return jsonify(response)
+
+def _item_id(item, index):
+    """The caller's ID for a resume or JD, or its position when it has none"""
+    if isinstance(item, dict):
+        for key in ("id", "resume_id"):
+            if key in item:
+                return item[key]
+    return index
+
+def _resume_text(item):
+    # Stored resumes were flattened when they were saved
+    if isinstance(item, dict) and item.get("resume_id"):
+        _, artifacts = resume_from_request(item)
+        return artifacts["text"]
+    return resume_text(_item_content(item))
+
+def _item_content(item):
+    if not isinstance(item, dict):
+        return item or ""
+    if "resume_data" in item:
+        return item["resume_data"]
+    if "text" in item:
+        return item["text"] or ""
+    return item
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
-import requests
-import json
+import logging
+from services.jd_digest import jd_prompt_prefix
+from services.llm_router import get_llm_router
+from services.deadline import DeadlineExceeded
+from services.resilience import CircuitOpenError, RateLimitedError
 
 match_routes = Blueprint('match_routes', __name__)
 
@@ -13,27 +16,26 @@ def match_bullet_to_jd():
     if not bullet or not jd:
         return jsonify({"error": "Missing bullet or job description"}), 400
 
+    # The JD goes in the shared prefix so Ollama reuses it across bullets
     prompt = (
-        f"Compare this resume bullet to the following job description, and rewrite it in 3 different ways to better match the job posting. "
+        f"Compare this resume bullet to the job description above, and rewrite it in 3 different ways to better match the job posting. "
         f"Keep each rewrite professional, resume-appropriate, and concise. Output exactly as a numbered list:\n\n"
         f"Resume Bullet:\n{bullet}\n\n"
-        f"Job Description:\n{jd}\n\n"
         f"Output format:\n"
         f"1. ...\n2. ...\n3. ..."
     )
 
-    response = requests.post(
-        "http://localhost:11434/api/generate",
-        json={"model": "mistral", "prompt": prompt},
-        stream=True,
-        timeout=60
-    )
-    response.raise_for_status()
-
-    result = ""
-    for line in response.iter_lines():
-        if line:
-            obj = json.loads(line.decode('utf-8'))
-            result += obj.get("response", "")
+    try:
+        result = get_llm_router().generate(prompt, prefix=jd_prompt_prefix(jd), model="mistral",
+                                           stream=True, timeout=60)
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(int(e.retry_after) + 1)}
+    except RateLimitedError as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
+    except Exception as e:
+        logging.error(f"Error in match_bullet_to_jd: {str(e)}")
+        return jsonify({"error": f"Error processing request: {str(e)}"}), 500
 
     return jsonify({"suggestions": result.strip()})
@@ -0,0 +1,9 @@
+from flask import Blueprint, Response
+from services.metrics import CONTENT_TYPE, registry
+
+metrics_routes = Blueprint('metrics_routes', __name__)
+
+@metrics_routes.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
+import logging
 import requests
-import json
+from services.llm_router import get_llm_router
+from services.deadline import DeadlineExceeded
+from services.resilience import CircuitOpenError, RateLimitedError
 
 ollama_routes = Blueprint('ollama_routes', __name__)
 
@@ -15,21 +18,18 @@ def improve_bullet():
     prompt = f"Improve this resume bullet point to sound more professional:\n\n'{bullet}'"
 
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "mistral", "prompt": prompt},
-            stream=True,
-            timeout=60
-        )
-        response.raise_for_status()
-
-        result = ""
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line.decode('utf-8'))
-                result += data.get("response", "")
+        result = get_llm_router().generate(prompt, model="mistral", stream=True, timeout=60)
 
         return jsonify({"improved": result.strip()})
 
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(int(e.retry_after) + 1)}
+    except RateLimitedError as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
+    except Exception as e:
+        logging.error(f"Error in improve_bullet: {str(e)}")
+        return jsonify({"error": f"Error processing request: {str(e)}"}), 500
@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify
+from services.resume_store import get_resume_store
+
+resume_routes = Blueprint('resume_routes', __name__)
+
+@resume_routes.route('/api/resumes', methods=['POST'])
+def save_resume():
+    """Store a parsed resume; match endpoints then take its "resume_id" instead of the full resume_data"""
+    data = request.get_json() or {}
+    resume_data = data.get("resume_data", {})
+    resume_id = data.get("resume_id")  # Add a version to this resume instead of creating one
+
+    if not resume_data or not isinstance(resume_data, dict):
+        return jsonify({"error": "Missing resume data"}), 400
+
+    try:
+        saved = get_resume_store().save(resume_data, resume_id)
+    except KeyError:
+        return jsonify({"error": f"Resume '{resume_id}' not found"}), 404
+    return jsonify(dict(saved, success=True)), 201 if saved["created"] else 200
+
+@resume_routes.route('/api/resumes/<resume_id>', methods=['GET'])
+def get_resume(resume_id):
+    """A stored resume (latest version unless ?version= is given), with ?artifacts=1 its derived data"""
+    version = request.args.get("version")
+    if version is not None:
+        if not version.isdigit():
+            return jsonify({"error": f"Invalid version: {version!r}"}), 400
+        version = int(version)
+    include_artifacts = request.args.get("artifacts", "").lower() in ("1", "true", "yes")
+    record = get_resume_store().get(resume_id, version, include_artifacts)
+    if record is None:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify(record)
+
+@resume_routes.route('/api/resumes/<resume_id>/versions', methods=['GET'])
+def list_resume_versions(resume_id):
+    versions = get_resume_store().versions(resume_id)
+    if not versions:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify({"resume_id": resume_id, "versions": versions})
+
+@resume_routes.route('/api/resumes/<resume_id>', methods=['DELETE'])
+def delete_resume(resume_id):
+    if not get_resume_store().delete(resume_id):
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify({"success": True, "resume_id": resume_id})
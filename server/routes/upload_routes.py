@@ -2,10 +2,14 @@ from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 import os
 import json
+import logging
+import sqlite3
 from services.resume_parser import extract_resume_data
+from services.resume_store import get_resume_store
+from services.stage_timing import stage_timer
 
 upload_routes = Blueprint('upload_routes', __name__)
-UPLOAD_FOLDER = './uploads'
+UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', './uploads')
 ALLOWED_EXTENSIONS = {'pdf', 'json', 'md', 'markdown', 'txt'}
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -68,7 +72,8 @@ def upload_resume():
         
         # Parse resume data
         try:
-            data = extract_resume_data(filepath)
+            with stage_timer("resume_parse"):
+                data = extract_resume_data(filepath)
             
             # Add file metadata
             data["file_info"] = {
@@ -78,11 +83,20 @@ def upload_resume():
                 "validation": validation_message
             }
             
-            return jsonify({
+            response = {
                 "success": True,
                 "message": f"Resume parsed successfully from {file_ext.upper()} format",
                 "data": data
-            })
+            }
+            # Later match requests can send this ID instead of the whole resume
+            try:
+                saved = get_resume_store().save(data)
+                response["resume_id"] = saved["resume_id"]
+                response["resume_version"] = saved["version"]
+            except (OSError, sqlite3.Error) as store_error:
+                logging.warning(f"Parsed resume not stored: {store_error}")
+            
+            return jsonify(response)
             
         except Exception as parse_error:
             # Clean up file if parsing fails
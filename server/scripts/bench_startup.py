@@ -0,0 +1,87 @@
+"""
+Measure cold-start cost of the Flask apps
+
+Each run is a fresh interpreter, as on a serverless cold start: it times importing the
+app module, then the first /api/health request through the test client.
+
+    python scripts/bench_startup.py                    # app_gemini, 5 runs
+    python scripts/bench_startup.py --app app --runs 10
+    python scripts/bench_startup.py --importtime        # slowest imports, from python -X importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import {app} as module
+imported = time.perf_counter()
+response = module.app.test_client().get("/api/health")
+done = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - started) * 1000, "health_ms": (done - imported) * 1000,
+                   "status": response.status_code}}))
+"""
+
+
+def _child_env():
+    # No background work in the probe: it would only add noise to the measurement
+    env = dict(os.environ, JOB_WORKERS="0", OLLAMA_WARMUP="0")
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    return env
+
+
+def run_once(app):
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(app=app)],
+        cwd=SERVER_DIR, env=_child_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(app, top):
+    """(cumulative ms, module) of the slowest top-level imports"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {app}"],
+        cwd=SERVER_DIR, env=_child_env(), capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Two levels of nesting: the app's own imports and what they pull in directly
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 2:
+            rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app_gemini", help="App module to import (app or app_gemini)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="List the slowest imports instead")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.importtime:
+        for cumulative_ms, name in slowest_imports(args.app, args.top):
+            print(f"{cumulative_ms:9.1f} ms  {name}")
+        return
+
+    runs = [run_once(args.app) for _ in range(args.runs)]
+    for field in ("import_ms", "health_ms"):
+        values = [run[field] for run in runs]
+        print(f"{field:10} median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+    print(f"cold start median {statistics.median(run['import_ms'] + run['health_ms'] for run in runs):.1f} ms "
+          f"over {args.runs} runs ({args.app}, /api/health -> {runs[0]['status']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Load job descriptions from JSON Lines into the local JD index
+
+Each line is a JD object ({"id", "title", "text", ...metadata}) or a plain string. The file is
+streamed in batches, so it can be larger than memory.
+
+    python scripts/import_jds.py jobs.jsonl
+    python scripts/import_jds.py jobs.jsonl --index data/jds.db
+    cat jobs.jsonl | python scripts/import_jds.py -
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from services.jd_index import DEFAULT_JD_INDEX_PATH, JDIndex  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSON Lines file, or - for stdin")
+    parser.add_argument("--index", default=os.getenv("JD_INDEX_PATH", DEFAULT_JD_INDEX_PATH),
+                        help="SQLite index file (default: JD_INDEX_PATH or data/jds.db)")
+    args = parser.parse_args()
+
+    index = JDIndex(args.index)
+    started = time.perf_counter()
+    if args.path == "-":
+        result = index.import_jsonl(sys.stdin.buffer)
+    else:
+        with open(args.path, "rb") as lines:
+            result = index.import_jsonl(lines)
+    elapsed = time.perf_counter() - started
+
+    result["total"] = index.count()
+    result["seconds"] = round(elapsed, 1)
+    print(json.dumps(result, indent=2))
+    return 1 if result["failed"] and not result["added"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
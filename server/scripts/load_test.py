@@ -0,0 +1,282 @@
+"""
+Drive the API at a target request rate and report throughput, latency percentiles and errors
+
+Load is open-loop: each request is sent at its scheduled time whether or not earlier ones
+have finished, and its latency is measured from that time. A stalled server therefore shows
+up as latency, instead of quietly lowering the load it is offered.
+
+    python scripts/load_test.py --rps 5 --duration 60
+    python scripts/load_test.py --routes improve_bullet,match_entire_resume:3 --rps 20 --poisson
+    python scripts/load_test.py --url http://localhost:5000 --json > report.json
+
+Run the app against scripts/stub_llm.py to load-test without Ollama or Gemini quota, and give it
+a throwaway UPLOAD_FOLDER so the uploaded sample resumes stay out of server/uploads:
+
+    UPLOAD_FOLDER=$(mktemp -d) OLLAMA_URL=http://localhost:11500 python app.py
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock, local
+
+import requests
+
+SAMPLE_RESUME = """{name}
+Summary
+Backend engineer building reliable APIs and data pipelines with Python.
+Experience
+Software Engineer, Acme Corp
+- Built REST APIs in Python and Flask serving 2M requests/day on AWS with Docker
+- Migrated PostgreSQL schemas with zero downtime using blue-green deploys
+- Cut p95 latency by 40% by adding Redis caching in front of hot endpoints
+- Mentored 3 junior engineers and led weekly code reviews
+Projects
+Resume Matcher
+- Ranked resumes against job descriptions with BM25 and skill overlap
+- Deployed the service on Kubernetes with GitHub Actions CI
+Skills
+Python, Flask, SQL, PostgreSQL, Redis, Docker, Kubernetes, AWS
+Education
+B.S. Computer Science, State University
+"""
+
+SAMPLE_JD = (
+    "We are hiring a backend engineer to design and scale Python services. You will build REST APIs "
+    "with Flask or FastAPI, own PostgreSQL data models, run services on AWS with Docker and Kubernetes, "
+    "and improve latency and reliability through caching and observability."
+)
+
+SAMPLE_BULLETS = [
+    "Built REST APIs in Python and Flask serving 2M requests/day on AWS with Docker",
+    "Migrated PostgreSQL schemas with zero downtime using blue-green deploys",
+    "Cut p95 latency by 40% by adding Redis caching in front of hot endpoints",
+    "Mentored 3 junior engineers and led weekly code reviews",
+]
+
+# Used when the upload that normally provides it fails
+FALLBACK_RESUME_DATA = {
+    "name": "Load Test",
+    "summary": "Backend engineer building reliable APIs and data pipelines with Python.",
+    "experience": [{"title": "Software Engineer", "company": "Acme Corp", "bullets": SAMPLE_BULLETS}],
+    "projects": [{"name": "Resume Matcher", "bullets": [
+        "Ranked resumes against job descriptions with BM25 and skill overlap",
+        "Deployed the service on Kubernetes with GitHub Actions CI",
+    ]}],
+    # Shaped like the parser's output: categories of skills, each with the line it was found in
+    "skills": [
+        {"category": "Programming Languages", "skills": [
+            {"skill": "Python", "confidence": 0.9,
+             "context": "Built REST APIs in Python and Flask serving 2M requests/day on AWS with Docker"},
+        ]},
+        {"category": "Databases", "skills": [
+            {"skill": "PostgreSQL", "confidence": 0.8,
+             "context": "Migrated PostgreSQL schemas with zero downtime using blue-green deploys"},
+            {"skill": "Redis", "confidence": 0.8,
+             "context": "Cut p95 latency by 40% by adding Redis caching in front of hot endpoints"},
+        ]},
+    ],
+}
+
+
+def _upload(seq, ctx):
+    # A different name per upload, so the server parses and stores each one instead of deduplicating
+    text = SAMPLE_RESUME.format(name=f"Candidate {seq}")
+    return "POST", "/api/upload_resume", {"files": {"file": ("resume.txt", text, "text/plain")}}
+
+
+# name -> builds (method, path, requests kwargs) from a sequence number and the shared context
+ROUTES = {
+    "health": lambda seq, ctx: ("GET", "/api/health", {}),
+    "upload_resume": _upload,
+    "improve_bullet": lambda seq, ctx: ("POST", "/api/improve_bullet", {
+        "json": {"bullet": SAMPLE_BULLETS[seq % len(SAMPLE_BULLETS)]}}),
+    "match_bullet_to_jd": lambda seq, ctx: ("POST", "/api/match_bullet_to_jd", {
+        "json": {"bullet": SAMPLE_BULLETS[seq % len(SAMPLE_BULLETS)], "jd": SAMPLE_JD}}),
+    "bulk_match_bullets_to_jd": lambda seq, ctx: ("POST", "/api/bulk_match_bullets_to_jd", {
+        "json": {"bullets": SAMPLE_BULLETS, "jd": SAMPLE_JD, "structure": "star"}}),
+    "match_entire_resume": lambda seq, ctx: ("POST", "/api/match_entire_resume", {
+        "json": {"resume_data": ctx["resume_data"], "jd": SAMPLE_JD}}),
+    "match_structured_resume": lambda seq, ctx: ("POST", "/api/match_structured_resume", {
+        "json": {"resume_data": ctx["resume_data"], "jd": SAMPLE_JD}}),
+    "bundle_bullets_by_project": lambda seq, ctx: ("POST", "/api/bundle_bullets_by_project", {
+        "json": {"resume_data": ctx["resume_data"], "jd": SAMPLE_JD}}),
+    "match_matrix": lambda seq, ctx: ("POST", "/api/match_matrix", {
+        "json": {"resumes": [ctx["resume_data"]], "jds": [SAMPLE_JD] * 5}}),
+    "jds_search": lambda seq, ctx: ("GET", "/api/jds/search", {"params": {"q": "python backend aws"}}),
+    "jds_match": lambda seq, ctx: ("POST", "/api/jds/match", {"json": {"resume_data": ctx["resume_data"]}}),
+}
+
+
+def parse_routes(spec):
+    """'a,b:3' -> {"a": 1.0, "b": 3.0}; every route if spec is empty"""
+    if not spec:
+        return {name: 1.0 for name in ROUTES}
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadTest:
+    def __init__(self, url, weights, rps, duration, concurrency, timeout, poisson, seed):
+        self.url = url.rstrip("/")
+        self.weights = weights
+        self.rps = rps
+        self.duration = duration
+        self.timeout = timeout
+        self.poisson = poisson
+        self.rng = random.Random(seed)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.results = []
+        self._lock = Lock()
+        self._local = local()
+        self.context = {"resume_data": FALLBACK_RESUME_DATA}
+
+    def prepare(self):
+        """Upload the sample resume once, so the match routes get a realistic parsed one"""
+        try:
+            response = self._session().post(
+                f"{self.url}/api/upload_resume", files={"file": ("resume.txt", SAMPLE_RESUME.format(name="Jane Doe"))},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            self.context["resume_data"] = response.json().get("data") or FALLBACK_RESUME_DATA
+        except (requests.RequestException, ValueError) as e:
+            print(f"Sample upload failed, using the built-in resume: {e}", file=sys.stderr)
+
+    def run(self):
+        names, weights = list(self.weights), list(self.weights.values())
+        futures = []
+        started = time.perf_counter()
+        scheduled = 0.0
+        seq = 0
+        while scheduled < self.duration:
+            delay = started + scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            route = self.rng.choices(names, weights)[0]
+            futures.append(self.executor.submit(self._request, route, seq, started + scheduled))
+            seq += 1
+            scheduled += self.rng.expovariate(self.rps) if self.poisson else 1 / self.rps
+
+        wait(futures)
+        self.executor.shutdown()
+        return time.perf_counter() - started
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _request(self, route, seq, scheduled_at):
+        method, path, kwargs = ROUTES[route](seq, self.context)
+        sent_at = time.perf_counter()
+        try:
+            response = self._session().request(method, f"{self.url}{path}", timeout=self.timeout, **kwargs)
+            outcome = response.status_code
+        except requests.RequestException as e:
+            outcome = type(e).__name__
+        done = time.perf_counter()
+        with self._lock:
+            # Latency counts from the scheduled send time, so time spent waiting for a free worker is included
+            self.results.append((route, outcome, done - scheduled_at, sent_at - scheduled_at))
+
+    def report(self, elapsed):
+        by_route = defaultdict(list)
+        for result in self.results:
+            by_route[result[0]].append(result)
+        rows = {name: _summarize(results, elapsed) for name, results in sorted(by_route.items())}
+        rows["total"] = _summarize(self.results, elapsed)
+        return {
+            "url": self.url,
+            "target_rps": self.rps,
+            "send_seconds": self.duration,
+            # Until the last response arrived; throughput is measured over this
+            "duration_seconds": round(elapsed, 2),
+            "routes": rows
+        }
+
+
+def _summarize(results, elapsed):
+    latencies = sorted(latency for _, _, latency, _ in results)
+    outcomes = Counter(str(outcome) for _, outcome, _, _ in results)
+    errors = sum(count for outcome, count in outcomes.items() if not (outcome.isdigit() and int(outcome) < 400))
+    ms = lambda value: None if value is None else round(value * 1000, 1)
+    return {
+        "requests": len(results),
+        "throughput_rps": round((len(results) - errors) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "outcomes": dict(outcomes),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+        # Time requests sat waiting for a free worker; if this grows, raise --concurrency
+        "max_send_delay_ms": ms(max((delay for _, _, _, delay in results), default=None)),
+    }
+
+
+def print_table(report):
+    print(f"{report['url']}: {report['target_rps']:g} rps target, sent for {report['send_seconds']:g}s, "
+          f"last response after {report['duration_seconds']}s")
+    header = f"{'route':<26}{'reqs':>6}{'ok rps':>8}{'err %':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  outcomes"
+    print(header)
+    print("-" * len(header))
+    for name, row in report["routes"].items():
+        outcomes = " ".join(f"{outcome}:{count}" for outcome, count in sorted(row["outcomes"].items()))
+        print(f"{name:<26}{row['requests']:>6}{row['throughput_rps']:>8.2f}{row['error_rate'] * 100:>7.1f}"
+              f"{_cell(row['p50_ms'])}{_cell(row['p95_ms'])}{_cell(row['p99_ms'])}  {outcomes}")
+
+
+def _cell(value):
+    return f"{value:>9.0f}" if value is not None else f"{'-':>9}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--rps", type=float, default=5, help="Target request rate (default: 5)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to send requests for (default: 30)")
+    parser.add_argument("--routes", default="",
+                        help=f"Comma-separated routes, optionally name:weight (default: all of {', '.join(ROUTES)})")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight at most (default: 64)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds (default: 120)")
+    parser.add_argument("--poisson", action="store_true", help="Random (Poisson) arrivals instead of evenly spaced")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        weights = parse_routes(args.routes)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    test = LoadTest(args.url, weights, args.rps, args.duration, args.concurrency, args.timeout, args.poisson, args.seed)
+    test.prepare()
+    report = test.report(test.run())
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    return 1 if report["routes"]["total"]["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Stand-in for Ollama and Gemini, for load-testing the app without a GPU box or Gemini quota
+
+Serves Ollama's /api/generate (streaming and not), /api/ps and /api/tags, and Gemini's
+models/<model>:generateContent, all on one port. Answers come back in the shape the app's
+parsers expect: a JSON object keyed by bullet ID for ID-tagged prompts, a numbered list where
+the prompt asks for one, plain text otherwise. Latency, generation speed, dropped IDs and
+injected errors are configurable.
+
+    python scripts/stub_llm.py                                      # :11500, ~0.5s to first token
+    python scripts/stub_llm.py --latency lognormal:1.2,0.6 --tokens-per-second 30 --max-concurrent 2
+    python scripts/stub_llm.py --shape lines --drop-rate 0.1 --error-rate 0.02 --error-status 429
+
+Point the app at it:
+
+    OLLAMA_URL=http://localhost:11500 GEMINI_API_ENDPOINT=http://localhost:11500 GOOGLE_API_KEY=stub \
+        UPLOAD_FOLDER=$(mktemp -d) python app.py
+
+Latency specs (seconds): fixed:S, uniform:LOW,HIGH, normal:MEAN,SD, lognormal:MEDIAN,SIGMA,
+exponential:MEAN. The latency is time to first token; output then takes one token per
+1/--tokens-per-second, and is cut off at the request's num_predict / maxOutputTokens.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from threading import BoundedSemaphore, Lock
+
+from flask import Flask, Response, jsonify, request
+
+SHAPES = ("auto", "json", "lines", "text")
+
+_ID_LINE = re.compile(r'^\s*\[(b\d+)\]\s*(.+?)\s*$', re.MULTILINE)
+_BULLET_LABEL = re.compile(r'(?:resume\s+)?bullet(?:\s+point)?:\s*\n?\s*(.+)', re.IGNORECASE)
+_NUMBERED_REQUEST = re.compile(r'^\s*1\.\s*\.\.\.', re.MULTILINE)
+
+_METRICS = ("latency", "throughput", "error rates", "deploy time", "cloud costs", "onboarding time")
+
+
+def parse_distribution(spec: str):
+    """Sampler for a latency spec such as 'lognormal:0.5,0.4'; raises ValueError if malformed"""
+    name, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+    except ValueError:
+        raise ValueError(f"Bad latency parameters: {spec!r}") from None
+    samplers = {
+        "fixed": (1, lambda rng, s: s),
+        "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+        "normal": (2, lambda rng, mean, sd: rng.gauss(mean, sd)),
+        "lognormal": (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+        "exponential": (1, lambda rng, mean: rng.expovariate(1 / mean)),
+    }
+    if name not in samplers or len(values) != samplers[name][0]:
+        raise ValueError(f"Unknown latency spec: {spec!r}")
+    sample = samplers[name][1]
+    return lambda rng: max(0.0, sample(rng, *values))
+
+
+class StubModel:
+    """Produces answers and their timing; shared by the Ollama and Gemini endpoints"""
+
+    def __init__(self, args):
+        self.latency = parse_distribution(args.latency)
+        self.tokens_per_second = args.tokens_per_second
+        self.shape = args.shape
+        self.drop_rate = args.drop_rate
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.slots = BoundedSemaphore(args.max_concurrent) if args.max_concurrent > 0 else None
+        self._rng = random.Random(args.seed)
+        self._lock = Lock()
+        self.models = set()
+        self.calls = {"ollama": 0, "gemini": 0, "errors": 0}
+
+    def rng(self) -> random.Random:
+        # One generator per call, seeded from the shared one, so threads never share state mid-call
+        with self._lock:
+            return random.Random(self._rng.getrandbits(64))
+
+    def record(self, provider: str, model: str, failed: bool) -> None:
+        with self._lock:
+            self.calls[provider] += 1
+            self.calls["errors"] += failed
+            self.models.add(model)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.calls, models=sorted(self.models))
+
+    def answer(self, prompt: str, rng: random.Random) -> str:
+        items = _ID_LINE.findall(prompt)
+        if items and self.shape != "text":
+            kept = [(bullet_id, bullet) for bullet_id, bullet in items if rng.random() >= self.drop_rate]
+            if self.shape == "lines":
+                return "\n".join(f"[{bullet_id}] {_rewrite(bullet, rng)}" for bullet_id, bullet in kept)
+            return json.dumps({bullet_id: _rewrite(bullet, rng) for bullet_id, bullet in kept}, indent=1)
+
+        bullet = _prompt_bullet(prompt)
+        if _NUMBERED_REQUEST.search(prompt):
+            return "\n".join(f"{number}. {_rewrite(bullet, rng)}" for number in range(1, 4))
+        return _rewrite(bullet, rng)
+
+    def fail(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+    def slot(self):
+        return self.slots if self.slots is not None else _NoLimit()
+
+
+class _NoLimit:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _prompt_bullet(prompt: str) -> str:
+    match = _BULLET_LABEL.search(prompt)
+    if match:
+        return match.group(1).strip()
+    lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+    return lines[-1][:200] if lines else "Delivered the project"
+
+
+def _rewrite(bullet: str, rng: random.Random) -> str:
+    bullet = bullet.strip().rstrip(".") or "Delivered the project"
+    return f"{bullet}, improving {rng.choice(_METRICS)} by {rng.randint(10, 60)}%"
+
+
+def _tokens(text: str) -> list:
+    """Whitespace-kept word pieces, streamed one per token"""
+    return re.findall(r'\S+\s*', text)
+
+
+def _truncate(text: str, max_tokens) -> str:
+    if not max_tokens or max_tokens <= 0:
+        return text
+    return "".join(_tokens(text)[:int(max_tokens)])
+
+
+def create_app(model: StubModel) -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/api/generate", methods=["POST"])
+    def ollama_generate():
+        data = request.get_json(force=True, silent=True) or {}
+        name = data.get("model", "stub")
+        prompt = data.get("prompt", "")
+        options = data.get("options") or {}
+        rng = model.rng()
+        failed = model.fail(rng)
+        model.record("ollama", name, failed)
+
+        if failed:
+            time.sleep(model.latency(rng))
+            return jsonify({"error": "stub: injected failure"}), model.error_status
+        # An empty prompt only loads the model (the app's warm-up)
+        if not prompt and not data.get("context"):
+            return jsonify(_ollama_chunk(name, "", done=True, done_reason="load"))
+
+        text = _truncate(model.answer(prompt, rng), options.get("num_predict"))
+        prompt_tokens = len(_tokens(prompt)) + len(data.get("context") or [])
+        first_token = model.latency(rng)
+
+        if not data.get("stream", True):
+            with model.slot():
+                started = time.perf_counter()
+                time.sleep(first_token + _generation_seconds(model, text))
+                elapsed = time.perf_counter() - started
+            return jsonify(_ollama_final(name, text, prompt_tokens, elapsed))
+
+        def stream():
+            with model.slot():
+                started = time.perf_counter()
+                time.sleep(first_token)
+                for token in _tokens(text):
+                    yield json.dumps(_ollama_chunk(name, token)) + "\n"
+                    if model.tokens_per_second > 0:
+                        time.sleep(1 / model.tokens_per_second)
+                final = _ollama_final(name, "", prompt_tokens, time.perf_counter() - started, len(_tokens(text)))
+                yield json.dumps(final) + "\n"
+
+        return Response(stream(), mimetype="application/x-ndjson")
+
+    @app.route("/api/ps", methods=["GET"])
+    @app.route("/api/tags", methods=["GET"])
+    def ollama_models():
+        names = model.stats()["models"]
+        return jsonify({"models": [{"name": name, "model": name} for name in names]})
+
+    @app.route("/<version>/models/<name>:generateContent", methods=["POST"])
+    def gemini_generate_content(version, name):
+        data = request.get_json(force=True, silent=True) or {}
+        config = data.get("generationConfig") or data.get("generation_config") or {}
+        prompt = "\n".join(
+            part.get("text", "") for content in data.get("contents", []) for part in content.get("parts", [])
+        )
+        rng = model.rng()
+        failed = model.fail(rng)
+        model.record("gemini", name, failed)
+
+        if failed:
+            time.sleep(model.latency(rng))
+            return jsonify({"error": {"code": model.error_status, "message": "stub: injected failure",
+                                      "status": "UNAVAILABLE"}}), model.error_status
+        text = _truncate(model.answer(prompt, rng), config.get("maxOutputTokens") or config.get("max_output_tokens"))
+        with model.slot():
+            time.sleep(model.latency(rng) + _generation_seconds(model, text))
+
+        prompt_tokens, output_tokens = len(_tokens(prompt)), len(_tokens(text))
+        return jsonify({
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens
+            }
+        })
+
+    @app.route("/stub/stats", methods=["GET"])
+    def stub_stats():
+        return jsonify(model.stats())
+
+    return app
+
+
+def _generation_seconds(model: StubModel, text: str) -> float:
+    return len(_tokens(text)) / model.tokens_per_second if model.tokens_per_second > 0 else 0.0
+
+
+def _ollama_chunk(name, text, done=False, done_reason=None):
+    chunk = {"model": name, "created_at": datetime.now(timezone.utc).isoformat(), "response": text, "done": done}
+    if done_reason:
+        chunk["done_reason"] = done_reason
+    return chunk
+
+
+def _ollama_final(name, text, prompt_tokens, elapsed, output_tokens=None):
+    output_tokens = len(_tokens(text)) if output_tokens is None else output_tokens
+    final = _ollama_chunk(name, text, done=True, done_reason="stop")
+    nanoseconds = int(elapsed * 1e9)
+    final.update({
+        # A fake context, sized like a real one, so the app's prefix cache has something to store
+        "context": list(range(prompt_tokens + output_tokens)),
+        "total_duration": nanoseconds,
+        "load_duration": 0,
+        "prompt_eval_count": prompt_tokens,
+        "eval_count": output_tokens,
+        "eval_duration": nanoseconds,
+    })
+    return final
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", default="lognormal:0.5,0.4", help="Time to first token (default: lognormal:0.5,0.4)")
+    parser.add_argument("--tokens-per-second", type=float, default=60, help="Generation speed; 0 for instant (default: 60)")
+    parser.add_argument("--shape", choices=SHAPES, default="auto",
+                        help="Answer shape for ID-tagged prompts: JSON object, [bN] lines, or untagged text")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Chance each bullet ID is left out of an answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Chance a call fails with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Calls generated at once, later ones queue as on a real Ollama (default: unlimited)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        model = StubModel(args)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Stub LLM on http://{args.host}:{args.port} (latency {args.latency}, "
+          f"{args.tokens_per_second:g} tokens/s, shape {args.shape})", file=sys.stderr)
+    create_app(model).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Cooperative serving mode: LLM waits yield to other requests instead of holding a thread
+
+Every blueprint blocks on requests.post (Ollama) or the Gemini SDK for 5-60s per call.
+Under gevent those blocking calls become non-blocking waits on one event loop, so a
+single process can hold hundreds of in-flight generations with the same routes and
+JSON responses. `python app.py` / `app_gemini.py` remain the threaded mode.
+
+    python serve_async.py                          # app.py (routed Ollama + Gemini)
+    JOBPAL_APP=app_gemini python serve_async.py    # Gemini-only app
+    gunicorn -k gevent --worker-connections 500 serve_async:app
+
+Raise OLLAMA_MAX_CONCURRENT / GEMINI_MAX_CONCURRENT to let more calls run at once.
+"""
+from gevent import monkey
+
+# Must run before anything imports socket, ssl or threading
+monkey.patch_all()
+
+import importlib
+import logging
+import os
+
+# The Gemini SDK's default gRPC transport blocks the whole loop; REST goes through patched sockets
+os.environ.setdefault("GEMINI_TRANSPORT", "rest")
+
+from gevent.pywsgi import WSGIServer
+
+app = importlib.import_module(os.getenv("JOBPAL_APP", "app")).app
+
+if __name__ == "__main__":
+    port = int(os.getenv("PORT", "5000"))
+    logging.basicConfig(level=logging.INFO)
+    logging.info(f"Serving {os.getenv('JOBPAL_APP', 'app')} with gevent on port {port}")
+    WSGIServer(("0.0.0.0", port), app).serve_forever()
@@ -0,0 +1,218 @@
+from itertools import count
+from threading import Condition, Lock
+from typing import Any, Dict, Optional
+import math
+import os
+import time
+
+from flask import g, jsonify, request
+
+from services.llm_scheduler import PRIORITY_INTERACTIVE, current_priority
+from services.metrics import Counter, Gauge, registry
+
+# LLM-bound requests served at once across all clients (0 turns admission control off)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "8"))
+# Longest a request waits for admission before it is turned away with 429
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "10"))
+# Requests beyond this many waiting are turned away at once
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+# Header a trusted proxy sets to identify the client; the peer address is used when unset or missing
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER", "")
+
+# Endpoints that make LLM calls (matched by view name, so both apps share the list)
+LLM_ENDPOINTS = {
+    "improve_bullet", "match_bullet_to_jd", "bulk_match_bullets_to_jd",
+    "match_entire_resume", "match_structured_resume", "bundle_bullets_by_project",
+}
+
+# Background jobs share one client identity and wait as long as their deadline allows
+JOB_CLIENT = "jobs"
+
+ADMISSION_REJECTED = registry.register(Counter(
+    "jobpal_admission_rejected_total", "LLM-bound requests turned away with 429", ["reason"]
+))
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request can't be admitted within its wait budget"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server is busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("client", "interactive", "seq")
+
+    def __init__(self, client, interactive, seq):
+        self.client = client
+        self.interactive = interactive
+        self.seq = seq
+
+
+class AdmissionController:
+    """
+    Caps concurrent LLM-bound requests and shares the slots fairly between clients
+
+    While more than one client is waiting, each is held to an equal share of the slots, and a free
+    slot goes to the waiting client with the fewest requests in flight (interactive endpoints, then
+    the oldest request, break ties). With no competition one client may use every slot.
+    """
+
+    def __init__(self, max_concurrent: int, max_wait: float, max_queue: int):
+        """
+        Args:
+            max_concurrent (int): Requests admitted at once
+            max_wait (float): Seconds a request may wait before it is rejected
+            max_queue (int): Waiting requests allowed before new ones are rejected immediately
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._cond = Condition(Lock())
+        self._active = {}
+        self._waiting = []
+        self._seq = count()
+        # Smoothed request duration, for Retry-After estimates
+        self._service_seconds = 5.0
+
+    def acquire(self, client: str, interactive: bool = False, max_wait: Optional[float] = None) -> None:
+        """
+        Wait for a slot
+
+        Args:
+            client (str): Client identity the fair share is counted by
+            interactive (bool): A user is waiting on this request; it goes first among equals
+            max_wait (float): Seconds to wait; defaults to the controller's max_wait
+
+        Raises:
+            AdmissionRejected: If the queue is full or no slot frees up in time
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        with self._cond:
+            waiter = _Waiter(client, interactive, next(self._seq))
+            self._waiting.append(waiter)
+            # The queue bound only applies to requests that would actually have to wait
+            if self._next_waiter() is not waiter and len(self._waiting) > self.max_queue:
+                self._waiting.remove(waiter)
+                raise AdmissionRejected("queue full", self._retry_after())
+
+            give_up_at = time.monotonic() + max_wait
+            while self._next_waiter() is not waiter:
+                remaining = give_up_at - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    self._cond.notify_all()
+                    raise AdmissionRejected("wait limit reached", self._retry_after())
+                self._cond.wait(remaining)
+
+            self._waiting.remove(waiter)
+            self._active[client] = self._active.get(client, 0) + 1
+            # Another slot may still be free for the next waiter in line
+            self._cond.notify_all()
+
+    def release(self, client: str, service_seconds: Optional[float] = None) -> None:
+        with self._cond:
+            self._active[client] -= 1
+            if not self._active[client]:
+                del self._active[client]
+            if service_seconds is not None:
+                self._service_seconds = 0.8 * self._service_seconds + 0.2 * service_seconds
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "active": sum(self._active.values()),
+                "max_concurrent": self.max_concurrent,
+                "queued": len(self._waiting),
+                "clients": len(set(self._active) | {waiter.client for waiter in self._waiting})
+            }
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        if not self._waiting or sum(self._active.values()) >= self.max_concurrent:
+            return None
+        clients = set(self._active) | {waiter.client for waiter in self._waiting}
+        share = math.ceil(self.max_concurrent / len(clients))
+        # Over its share a client only gets a slot no client under its share is waiting for
+        eligible = [waiter for waiter in self._waiting if self._active.get(waiter.client, 0) < share] or self._waiting
+        return min(eligible, key=lambda waiter: (self._active.get(waiter.client, 0), not waiter.interactive, waiter.seq))
+
+    def _retry_after(self) -> int:
+        # Time for the queue ahead to drain through every slot, at the recent request duration
+        estimate = self._service_seconds * (len(self._waiting) + 1) / self.max_concurrent
+        return int(min(max(math.ceil(estimate), 1), 60))
+
+
+def client_id(req) -> str:
+    """Who a request counts against: ADMISSION_CLIENT_HEADER if set by the proxy, else the peer address"""
+    if ADMISSION_CLIENT_HEADER:
+        # X-Forwarded-For style headers list the original client first
+        value = req.headers.get(ADMISSION_CLIENT_HEADER, "").split(",")[0].strip()
+        if value:
+            return value
+    return req.remote_addr or "unknown"
+
+
+def init_admission_control(app) -> None:
+    """Queue LLM-bound requests for a bounded time and answer 429 with Retry-After beyond that"""
+    if ADMISSION_MAX_CONCURRENT <= 0:
+        return
+
+    @app.before_request
+    def _admit_request():
+        endpoint = (request.endpoint or "").rsplit(".", 1)[-1]
+        if endpoint not in LLM_ENDPOINTS:
+            return None
+
+        controller = get_admission_controller()
+        deadline = g.get("deadline")
+        max_wait = controller.max_wait
+        if g.get("job_id"):
+            # Jobs were already accepted; they only give up when their own deadline does
+            client, max_wait = JOB_CLIENT, deadline.remaining() if deadline else controller.max_wait
+        else:
+            client = client_id(request)
+        if deadline:
+            max_wait = min(max_wait, deadline.remaining())
+
+        try:
+            controller.acquire(client, current_priority() == PRIORITY_INTERACTIVE, max_wait)
+        except AdmissionRejected as e:
+            ADMISSION_REJECTED.inc(reason=e.reason)
+            return jsonify({"error": str(e)}), 429, {"Retry-After": str(e.retry_after)}
+        g.admission = (client, time.monotonic())
+        # The LLM schedulers queue each client's calls as a separate flow
+        g.llm_client = client
+        return None
+
+    @app.teardown_request
+    def _release_admission(exc):
+        admission = g.pop("admission", None)
+        if admission:
+            client, admitted_at = admission
+            get_admission_controller().release(client, time.monotonic() - admitted_at)
+
+
+# Global instance for reuse
+admission_controller = None
+_admission_lock = Lock()
+
+def get_admission_controller() -> AdmissionController:
+    global admission_controller
+    with _admission_lock:
+        if admission_controller is None:
+            admission_controller = AdmissionController(
+                ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_WAIT_SECONDS, ADMISSION_MAX_QUEUE
+            )
+    return admission_controller
+
+registry.register(Gauge(
+    "jobpal_admission_active", "LLM-bound requests admitted and running",
+    collect=lambda: {(): admission_controller.stats()["active"] if admission_controller else 0}
+))
+registry.register(Gauge(
+    "jobpal_admission_queued", "LLM-bound requests waiting for admission",
+    collect=lambda: {(): admission_controller.stats()["queued"] if admission_controller else 0}
+))
@@ -0,0 +1,73 @@
+from typing import List, Optional, Tuple
+import hashlib
+import os
+import re
+from services.cache import LRUCache
+from services.metrics import register_cache
+
+# Rewritten bullets keyed by (normalized bullet, JD fingerprint, structure type, model)
+bullet_cache = LRUCache(
+    max_size=int(os.getenv("BULLET_CACHE_SIZE", "5000")),
+    ttl_seconds=float(os.getenv("BULLET_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+)
+register_cache("bullet", bullet_cache)
+
+
+def normalize_bullet(bullet: str) -> str:
+    """Normalize a bullet so cosmetic edits (markers, spacing, case) hit the same cache entry"""
+    text = re.sub(r'^\s*(?:[•\-*]|\d+[.)])\s*', '', bullet or "")
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def jd_fingerprint(job_description: str) -> str:
+    """Stable short hash of a job description, ignoring whitespace and case differences"""
+    normalized = re.sub(r'\s+', ' ', job_description or "").strip().lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def bullet_cache_key(bullet: str, jd_hash: str, structure_type: str, model: str) -> Tuple[str, str, str, str]:
+    """Build the cache key for one bullet rewrite"""
+    bullet_hash = hashlib.sha256(normalize_bullet(bullet).encode('utf-8')).hexdigest()[:16]
+    return (bullet_hash, jd_hash, structure_type, model)
+
+
+def lookup_cached_bullets(bullets: List[str], job_description: str, structure_type: str,
+                          model: str) -> Tuple[list, List[Optional[str]], List[int]]:
+    """
+    Look up cached rewrites for every bullet
+
+    Args:
+        bullets (List[str]): Bullets in resume order
+        job_description (str): Target job description
+        structure_type (str): Format type ('star', 'xyz', 'standard')
+        model (str): Model the rewrites come from
+
+    Returns:
+        Tuple: (cache keys, results with None for misses, positions of the misses)
+    """
+    jd_hash = jd_fingerprint(job_description)
+    keys = [bullet_cache_key(bullet, jd_hash, structure_type, model) for bullet in bullets]
+    results = [bullet_cache.get(key) for key in keys]
+    miss_positions = [idx for idx, result in enumerate(results) if result is None]
+    return keys, results, miss_positions
+
+
+def merge_rewrites(results: List[Optional[str]], keys: list, miss_positions: List[int],
+                   originals: List[str], rewrites: List[str], cacheable: Optional[List[bool]] = None) -> List[str]:
+    """
+    Put fresh rewrites of the cache misses back in position and cache them
+
+    Bullets the LLM left unchanged (including fallbacks to the original text) and
+    rewrites flagged as not cacheable (local degraded-mode rewrites) are not cached,
+    so the next request retries them.
+    """
+    merged = list(results)
+    for idx, (position, rewrite) in enumerate(zip(miss_positions, rewrites)):
+        merged[position] = rewrite
+        if cacheable is not None and not cacheable[idx]:
+            continue
+        if rewrite and rewrite != originals[position]:
+            bullet_cache.set(keys[position], rewrite)
+
+    # Anything the LLM path did not return keeps its original text
+    return [originals[idx] if bullet is None else bullet for idx, bullet in enumerate(merged)]
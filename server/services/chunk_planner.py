@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional
+import math
+import os
+
+# Approximate context windows (in tokens) of the models we send resumes to
+MODEL_TOKEN_BUDGETS = {
+    "phi3:mini": 4096,
+    "llama2:7b": 4096,
+    "mistral": 8192,
+    "mistral:latest": 8192,
+    "gemini-1.5-flash": 32768,
+}
+
+# Cap on generated tokens per request, so a single chunk never waits on a huge completion
+MODEL_OUTPUT_BUDGETS = {
+    "phi3:mini": 600,
+    "llama2:7b": 600,
+    "mistral": 800,
+    "mistral:latest": 800,
+    "gemini-1.5-flash": 1200,
+}
+
+DEFAULT_TOKEN_BUDGET = 4096
+DEFAULT_OUTPUT_BUDGET = 600
+
+# Rough heuristic for English prose; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# A rewritten bullet is usually a bit longer than the original one
+OUTPUT_EXPANSION = 1.5
+MIN_OUTPUT_TOKENS_PER_BULLET = 40
+# Bullets are tagged with IDs and answered as JSON ("b12": "...",), which costs a few tokens each way
+ID_INPUT_TOKENS = 4
+ID_OUTPUT_TOKENS = 6
+
+MAX_CONCURRENT_CHUNKS = int(os.getenv("MAX_CONCURRENT_CHUNKS", "4"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text"""
+    if not text:
+        return 0
+    return int(math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def plan_chunks(bullets: List[str], model: str, prompt_overhead_tokens: int) -> List[Dict[str, Any]]:
+    """
+    Split bullets into contiguous chunks that fit the model's token budget
+
+    Args:
+        bullets (List[str]): Bullets to process, in resume order
+        model (str): Model name used to look up token budgets
+        prompt_overhead_tokens (int): Tokens used by the prompt without any bullets (instructions + JD)
+
+    Returns:
+        List[Dict]: Chunks with "start", "end", "bullets" and "num_predict" keys
+    """
+    context_budget = MODEL_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+    output_budget = MODEL_OUTPUT_BUDGETS.get(model, DEFAULT_OUTPUT_BUDGET)
+
+    chunks = []
+    start = 0
+    input_tokens = prompt_overhead_tokens
+    output_tokens = 0
+
+    for idx, bullet in enumerate(bullets):
+        bullet_input = estimate_tokens(bullet) + ID_INPUT_TOKENS
+        bullet_output = max(MIN_OUTPUT_TOKENS_PER_BULLET, int(bullet_input * OUTPUT_EXPANSION)) + ID_OUTPUT_TOKENS
+
+        over_budget = (
+            input_tokens + bullet_input + output_tokens + bullet_output > context_budget
+            or output_tokens + bullet_output > output_budget
+        )
+        if over_budget and idx > start:
+            chunks.append(_make_chunk(bullets, start, idx, output_tokens))
+            start = idx
+            input_tokens = prompt_overhead_tokens
+            output_tokens = 0
+
+        input_tokens += bullet_input
+        output_tokens += bullet_output
+
+    if start < len(bullets):
+        chunks.append(_make_chunk(bullets, start, len(bullets), output_tokens))
+
+    return chunks
+
+
+def run_chunks_concurrently(chunks: List[Dict[str, Any]], worker: Callable[[Dict[str, Any], int, int], List[str]],
+                            max_workers: int = None,
+                            on_progress: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """
+    Run a worker over every chunk in parallel and reassemble the results in order
+
+    Args:
+        chunks (List[Dict]): Chunks returned by plan_chunks
+        worker (Callable): Called as worker(chunk, chunk_number, total_chunks), returns improved bullets
+        max_workers (int): Maximum number of chunks in flight at once
+        on_progress (Callable): Called as on_progress(chunks_done, total_chunks) after each chunk
+
+    Returns:
+        List[str]: Improved bullets for all chunks, in the original bullet order
+    """
+    if not chunks:
+        return []
+
+    total = len(chunks)
+    if total == 1:
+        results = list(worker(chunks[0], 1, 1))
+        if on_progress:
+            on_progress(1, 1)
+        return results
+
+    workers = min(total, max_workers or MAX_CONCURRENT_CHUNKS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each chunk runs in a copy of the caller's context so request-scoped state (deadline,
+        # stage timings) is still visible from the pool threads
+        futures = [executor.submit(copy_context().run, worker, chunk, number, total)
+                   for number, chunk in enumerate(chunks, 1)]
+        if on_progress:
+            for done, _ in enumerate(as_completed(futures), 1):
+                on_progress(done, total)
+        results = []
+        for future in futures:
+            results.extend(future.result())
+
+    return results
+
+
+def _make_chunk(bullets, start, end, output_tokens):
+    return {
+        "start": start,
+        "end": end,
+        "bullets": bullets[start:end],
+        "num_predict": output_tokens
+    }
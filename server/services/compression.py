@@ -0,0 +1,41 @@
+import gzip
+import os
+
+from flask import request
+
+# Small bodies aren't worth the CPU: gzip saves little below a few hundred bytes
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+# 1 (fastest) to 9 (smallest); JSON compresses well even at low levels
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "5"))
+COMPRESS_MIMETYPES = {"application/json"}
+
+
+def accepts_gzip(req) -> bool:
+    # Parsed quality, so "gzip;q=0" (an explicit refusal) doesn't count
+    return req.accept_encodings["gzip"] > 0
+
+
+def init_compression(app) -> None:
+    """Gzip JSON responses of COMPRESS_MIN_BYTES or more for clients that accept it (COMPRESS_MIN_BYTES=0 disables)"""
+    if COMPRESS_MIN_BYTES <= 0:
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        if response.mimetype not in COMPRESS_MIMETYPES:
+            return response
+        # Caches must keep gzipped and plain copies apart
+        response.vary.add("Accept-Encoding")
+        if (response.direct_passthrough
+                or response.is_streamed
+                or "Content-Encoding" in response.headers
+                or not accepts_gzip(request)):
+            return response
+
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+
+        response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+        response.headers["Content-Encoding"] = "gzip"
+        return response
@@ -0,0 +1,75 @@
+from typing import Optional
+import os
+import time
+
+from flask import g, has_request_context, request
+
+# Vercel cuts serverless functions off at 60s, so by default stop a little before that
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "55"))
+MAX_DEADLINE_SECONDS = float(os.getenv("MAX_REQUEST_DEADLINE_SECONDS", "300"))
+
+# Don't start an LLM call that has less than this left; it would only be wasted work
+MIN_CALL_SECONDS = float(os.getenv("MIN_LLM_CALL_SECONDS", "1.0"))
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request has no time budget left for further upstream work"""
+
+
+class Deadline:
+    """Total time budget for one request, shared by every downstream call it makes"""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() < MIN_CALL_SECONDS
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if there isn't enough budget left to start another call"""
+        if self.expired():
+            raise DeadlineExceeded(f"Request deadline of {self.budget:.0f}s exceeded")
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Timeout for the next call: the remaining budget, optionally capped"""
+        self.check()
+        remaining = self.remaining()
+        return min(cap, remaining) if cap else remaining
+
+
+def deadline_from_request(req) -> Deadline:
+    """
+    Build the deadline for an incoming request
+
+    Clients can set the budget with X-Request-Timeout-Ms (milliseconds) or
+    X-Request-Timeout (seconds); otherwise REQUEST_DEADLINE_SECONDS applies.
+    """
+    seconds = DEFAULT_DEADLINE_SECONDS
+    try:
+        if req.headers.get("X-Request-Timeout-Ms"):
+            seconds = float(req.headers["X-Request-Timeout-Ms"]) / 1000.0
+        elif req.headers.get("X-Request-Timeout"):
+            seconds = float(req.headers["X-Request-Timeout"])
+    except ValueError:
+        pass
+
+    return Deadline(min(max(seconds, 0.0), MAX_DEADLINE_SECONDS))
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being handled, if any"""
+    if has_request_context():
+        return g.get("deadline")
+    return None
+
+
+def init_deadlines(app) -> None:
+    """Attach a deadline to every request handled by the app"""
+
+    @app.before_request
+    def _start_deadline():
+        g.deadline = deadline_from_request(request)
@@ -1,7 +1,20 @@
-import google.generativeai as genai
 import os
-from typing import List, Optional
+import time
+from typing import Optional
 import logging
+from services.chunk_planner import estimate_tokens
+from services.deadline import Deadline, DeadlineExceeded, current_deadline
+from services.llm_scheduler import current_priority, get_llm_scheduler
+from services.metrics import observe_llm_call, observe_llm_error
+from services.resilience import CircuitOpenError, RateLimitedError, get_fallback_provider, get_provider_guard
+from services.stage_timing import stage_timer
+
+# "rest" routes SDK calls through plain HTTP (needed under gevent); unset keeps the SDK's gRPC default
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
+# Send Gemini calls somewhere else, e.g. the load-test stub (scripts/stub_llm.py) at http://localhost:11500
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT") or None
+
+GEMINI_MODEL = 'gemini-1.5-flash'
 
 class GeminiService:
     def __init__(self):
@@ -10,8 +23,20 @@ class GeminiService:
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        # Imported on first use: the SDK takes ~0.4s to import and most cold starts never call Gemini
+        import google.generativeai as genai
+        transport = GEMINI_TRANSPORT
+        client_options = None
+        if GEMINI_API_ENDPOINT:
+            client_options = {"api_endpoint": GEMINI_API_ENDPOINT}
+            # gRPC can't reach a plain http:// endpoint
+            if GEMINI_API_ENDPOINT.startswith("http://"):
+                transport = transport or "rest"
+        genai.configure(api_key=self.api_key, transport=transport, client_options=client_options)
+        self.model_name = GEMINI_MODEL
+        self.model = genai.GenerativeModel(self.model_name)
+        self.guard = get_provider_guard("gemini")
+        self.scheduler = get_llm_scheduler("gemini")
         
         # Configure generation parameters for optimal performance
         self.generation_config = genai.types.GenerationConfig(
@@ -21,7 +46,9 @@ class GeminiService:
             max_output_tokens=1024,
         )
     
-    def generate_response(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024) -> str:
+    def generate_response(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1024,
+                          deadline: Optional[Deadline] = None, priority: Optional[str] = None,
+                          fallback: bool = True) -> str:
         """
         Generate a response using Gemini API
         
@@ -29,200 +56,75 @@ class GeminiService:
             prompt (str): The input prompt
             temperature (float): Controls randomness (0.0 to 1.0)
             max_tokens (int): Maximum number of tokens to generate
+            deadline (Deadline): Request deadline; defaults to the current request's deadline
+            priority (str): Scheduling class ('interactive', 'bulk'); defaults to the current request's
+            fallback (bool): Switch to LLM_FALLBACK_PROVIDER when the circuit is open
             
         Returns:
             str: Generated response
         """
-        try:
-            # Create custom generation config
-            config = genai.types.GenerationConfig(
-                temperature=temperature,
-                top_p=0.9,
-                top_k=40,
-                max_output_tokens=max_tokens,
-            )
+        # Create custom generation config
+        from google.generativeai.types import GenerationConfig
+        config = GenerationConfig(
+            temperature=temperature,
+            top_p=0.9,
+            top_k=40,
+            max_output_tokens=max_tokens,
+        )
+        
+        # Resolved here: chunk worker threads have no request to read it from
+        priority = priority or current_priority()
+        
+        def generate():
+            with self.scheduler.slot(priority, deadline):
+                started = time.perf_counter()
+                try:
+                    with stage_timer("llm"):
+                        response = self.model.generate_content(
+                            prompt,
+                            generation_config=config
+                        )
+                        text = response.text
+                except Exception as e:
+                    observe_llm_error("gemini", self.model_name, e)
+                    raise
             
-            # Generate response
-            response = self.model.generate_content(
-                prompt,
-                generation_config=config
+            # Older SDKs have no usage_metadata; fall back to the planner's estimate
+            usage = getattr(response, "usage_metadata", None)
+            observe_llm_call(
+                "gemini", self.model_name, time.perf_counter() - started,
+                getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt),
+                getattr(usage, "candidates_token_count", None) or estimate_tokens(text)
             )
             
-            if response.text:
-                return response.text.strip()
+            if text:
+                return text.strip()
             else:
                 return "No response generated"
-                
-        except Exception as e:
-            logging.error(f"Gemini API error: {str(e)}")
-            raise Exception(f"Error generating response: {str(e)}")
-    
-    def improve_bullet_points(self, bullets: List[str], job_description: str, 
-                            structure_type: str = "star", project_context: str = "") -> List[str]:
-        """
-        Improve resume bullet points to match job description
-        
-        Args:
-            bullets (List[str]): List of bullet points to improve
-            job_description (str): Target job description
-            structure_type (str): Format type ('star', 'xyz', 'standard')
-            project_context (str): Additional context for the bullets
-            
-        Returns:
-            List[str]: Improved bullet points
-        """
-        structure_guidance = {
-            "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
-            "star": "Rewrite these resume bullets using the STAR method (Situation, Task, Action, Result). Each bullet should clearly show the context, what you did, and the outcome.",
-            "xyz": "Rewrite these resume bullets using the XYZ format: 'Accomplished X by implementing Y, which resulted in Z.' Focus on achievements and quantifiable results."
-        }
         
-        project_context_text = f"\nProject Context: {project_context}" if project_context else ""
-        
-        prompt = (
-            f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n\n"
-            f"Job Description: {job_description}\n"
-            f"{project_context_text}\n\n"
-            f"Resume Bullets:\n"
-        )
-
-        for idx, bullet in enumerate(bullets, 1):
-            prompt += f"{idx}. {bullet}\n"
-
-        prompt += f"\nImproved bullets using {structure_type.upper()} format (return exactly {len(bullets)} bullets):"
+        if deadline is None:
+            deadline = current_deadline()
         
         try:
-            response = self.generate_response(prompt, temperature=0.7, max_tokens=800)
-            return self._parse_bullet_response(response, len(bullets))
-        except Exception as e:
-            logging.error(f"Error improving bullets: {str(e)}")
-            return bullets  # Return original bullets if error occurs
-    
-    def improve_entire_resume(self, all_bullets: List[str], job_description: str, 
-                            structure_type: str = "star") -> List[str]:
-        """
-        Improve all resume bullets in one request
-        
-        Args:
-            all_bullets (List[str]): All bullets from the resume
-            job_description (str): Target job description
-            structure_type (str): Format type ('star', 'xyz', 'standard')
-            
-        Returns:
-            List[str]: Improved bullet points
-        """
-        structure_guidance = {
-            "standard": "Rewrite these resume bullets to match the job description. Focus on relevance and impact.",
-            "star": "Rewrite using STAR method (Situation, Task, Action, Result). Show context, action, outcome.",
-            "xyz": "Rewrite using XYZ format: 'Accomplished X by implementing Y, which resulted in Z.'"
-        }
-        
-        # Truncate JD if too long to save tokens
-        jd_short = job_description[:300] + "..." if len(job_description) > 300 else job_description
-        
-        # Limit bullets if too many to avoid hitting token limits
-        bullets_to_process = all_bullets[:25] if len(all_bullets) > 25 else all_bullets
-        
-        prompt = (
-            f"Rewrite these resume bullets to match the job description using {structure_type.upper()} format.\n\n"
-            f"Job Description: {jd_short}\n\n"
-            f"{structure_guidance.get(structure_type, structure_guidance['standard'])}\n\n"
-            f"Resume Bullets:\n"
-        )
-        
-        for idx, bullet in enumerate(bullets_to_process, 1):
-            prompt += f"{idx}. {bullet}\n"
-        
-        prompt += f"\nImproved bullets using {structure_type.upper()} format (return exactly {len(bullets_to_process)} bullets):\n"
-        
-        try:
-            response = self.generate_response(prompt, temperature=0.5, max_tokens=1200)
-            improved = self._parse_bullet_response(response, len(bullets_to_process))
-            
-            # If we processed fewer bullets than original, add the remaining ones
-            if len(all_bullets) > len(bullets_to_process):
-                improved.extend(all_bullets[len(bullets_to_process):])
-            
-            return improved
-        except Exception as e:
-            logging.error(f"Error improving entire resume: {str(e)}")
-            return all_bullets  # Return original bullets if error occurs
-    
-    def create_project_narrative(self, project_name: str, bullets: List[str], 
-                               job_description: str, skills: List[str] = None) -> str:
-        """
-        Create a compelling narrative for a project
-        
-        Args:
-            project_name (str): Name of the project
-            bullets (List[str]): Project bullet points
-            job_description (str): Target job description
-            skills (List[str]): Skills used in the project
-            
-        Returns:
-            str: Project narrative
-        """
-        skills_text = f"Skills Used: {', '.join(skills)}\n" if skills else ""
-        
-        prompt = (
-            f"Create a compelling narrative for this project that would impress HR managers.\n"
-            f"Job Description: {job_description}\n\n"
-            f"Project: {project_name}\n"
-            f"{skills_text}"
-            f"Original Bullets:\n"
-        )
-        
-        for bullet in bullets:
-            prompt += f"• {bullet}\n"
-        
-        prompt += "\nCreate a 2-3 sentence narrative that tells the story of this project:"
-        
-        try:
-            return self.generate_response(prompt, temperature=0.7, max_tokens=400)
+            # Rate limited, retried on 429/5xx and circuit broken per provider.
+            # The SDK has no per-call timeout, so the deadline is enforced between attempts.
+            return self.guard.call(generate, deadline)
+        except CircuitOpenError:
+            if not fallback or get_fallback_provider("gemini") != "ollama":
+                raise
+            logging.warning("Gemini circuit open, falling back to Ollama")
+            from services.ollama_service import get_ollama_service
+            return get_ollama_service().generate(
+                prompt,
+                model=os.getenv("OLLAMA_FALLBACK_MODEL", "phi3:mini"),
+                options={"temperature": temperature, "num_predict": max_tokens},
+                deadline=deadline
+            )
+        except (RateLimitedError, DeadlineExceeded):
+            raise
         except Exception as e:
-            logging.error(f"Error creating narrative: {str(e)}")
-            return f"Worked on {project_name} project involving {', '.join(skills) if skills else 'various technologies'}."
-    
-    def _parse_bullet_response(self, response_text: str, expected_count: int) -> List[str]:
-        """
-        Parse the AI response and extract bullet points
-        
-        Args:
-            response_text (str): Raw response from AI
-            expected_count (int): Expected number of bullets
-            
-        Returns:
-            List[str]: Parsed bullet points
-        """
-        lines = response_text.split('\n')
-        improved_bullets = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('Improved') or line.startswith('Rewrite'):
-                continue
-                
-            # Remove numbering if present
-            if line and line[0].isdigit() and '. ' in line:
-                line = line.split('. ', 1)[1]
-            
-            # Remove bullet markers
-            if line.startswith('• ') or line.startswith('- '):
-                line = line[2:]
-            
-            if line:
-                improved_bullets.append(line)
-        
-        # If we don't get the expected number of bullets, pad with the last ones or truncate
-        if len(improved_bullets) < expected_count:
-            # Pad with original message if needed
-            while len(improved_bullets) < expected_count:
-                improved_bullets.append("Bullet point improvement in progress...")
-        elif len(improved_bullets) > expected_count:
-            # Truncate to expected count
-            improved_bullets = improved_bullets[:expected_count]
-        
-        return improved_bullets
+            logging.error(f"Gemini API error: {str(e)}")
+            raise Exception(f"Error generating response: {str(e)}") from e
 
 # Global instance for reuse
 gemini_service = None
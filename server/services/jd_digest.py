@@ -0,0 +1,180 @@
+from typing import Any, Dict, List
+import os
+import re
+from services.bullet_cache import jd_fingerprint
+from services.cache import LRUCache
+from services.metrics import register_cache
+from services.resume_parser import SKILLS_DATABASE
+
+# Digests keyed by JD fingerprint, so every route and every bullet chunk shares one
+jd_digest_cache = LRUCache(max_size=int(os.getenv("JD_DIGEST_CACHE_SIZE", "500")))
+register_cache("jd_digest", jd_digest_cache)
+
+MAX_REQUIREMENTS = 8
+MAX_REQUIREMENT_CHARS = 160
+
+# Phrases that usually introduce a hard requirement or a core responsibility
+REQUIREMENT_CUES = [
+    "must", "required", "requirement", "qualification", "experience with", "experience in",
+    "proficien", "knowledge of", "familiar", "ability to", "strong", "expertise", "degree",
+    "you will", "responsib", "hands-on", "background in", "understanding of"
+]
+
+# Lines that rarely carry information the rewrite needs
+BOILERPLATE_CUES = [
+    "equal opportunity", "benefits", "salary", "compensation", "apply now", "how to apply",
+    "about us", "our mission", "pto", "401k", "health insurance", "we are an"
+]
+
+SENIORITY_PATTERN = re.compile(
+    r'\b(intern(?:ship)?|junior|entry[- ]level|associate|mid[- ]level|senior|sr\.|lead|staff|principal|'
+    r'manager|director|head of|vp)\b',
+    re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?\+?\s*years?', re.IGNORECASE)
+
+
+def _compile_skill_patterns():
+    """Word-boundary patterns for every skill in the parser's taxonomy"""
+    patterns = []
+    for category, skills in SKILLS_DATABASE.items():
+        for skill in skills:
+            # Short names like "Go", "R" or "Less" are common words; only match them as written
+            flags = 0 if len(skill) <= 4 else re.IGNORECASE
+            pattern = re.compile(r'(?<![\w+#.])' + re.escape(skill) + r'(?![\w+#])', flags)
+            patterns.append((skill, category, pattern))
+    return patterns
+
+
+SKILL_PATTERNS = _compile_skill_patterns()
+SKILL_PATTERN_BY_NAME = {skill: pattern for skill, _, pattern in SKILL_PATTERNS}
+
+
+def get_jd_digest(job_description: str) -> Dict[str, Any]:
+    """Return the cached digest for a job description, building it on first use"""
+    fingerprint = jd_fingerprint(job_description)
+    digest = jd_digest_cache.get(fingerprint)
+    if digest is None:
+        digest = build_jd_digest(job_description)
+        digest["fingerprint"] = fingerprint
+        jd_digest_cache.set(fingerprint, digest)
+    return digest
+
+
+def build_jd_digest(job_description: str) -> Dict[str, Any]:
+    """
+    Reduce a job description to the parts the prompts need
+
+    Args:
+        job_description (str): Raw job description text
+
+    Returns:
+        Dict: Digest with "skills", "seniority", "years_experience" and "requirements"
+    """
+    skills = match_jd_skills(job_description)
+    skill_names = [skill["skill"] for skill in skills]
+
+    seniority = []
+    for match in SENIORITY_PATTERN.finditer(job_description):
+        level = match.group(1).lower().rstrip('.')
+        level = "senior" if level == "sr" else level
+        if level not in seniority:
+            seniority.append(level)
+
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(job_description)]
+
+    return {
+        "skills": skill_names,
+        "skill_categories": sorted({skill["category"] for skill in skills}),
+        "seniority": seniority,
+        "years_experience": max(years) if years else None,
+        "requirements": _extract_requirements(job_description, skill_names)
+    }
+
+
+def match_jd_skills(text: str) -> List[Dict[str, str]]:
+    """Find skills from the parser's taxonomy mentioned in a piece of text"""
+    found = []
+    seen = set()
+    for skill, category, pattern in SKILL_PATTERNS:
+        if skill not in seen and pattern.search(text):
+            seen.add(skill)
+            found.append({"skill": skill, "category": category.replace('_', ' ').title()})
+    return found
+
+
+def format_jd_digest(digest: Dict[str, Any]) -> str:
+    """Render a digest as compact prompt text"""
+    parts = []
+
+    level = ", ".join(level.title() for level in digest.get("seniority", []))
+    if digest.get("years_experience"):
+        level = f"{level}; {digest['years_experience']}+ years" if level else f"{digest['years_experience']}+ years"
+    if level:
+        parts.append(f"Level: {level}")
+
+    if digest.get("skills"):
+        parts.append(f"Key skills: {', '.join(digest['skills'])}")
+
+    if digest.get("requirements"):
+        parts.append("Key requirements:\n" + "\n".join(f"- {req}" for req in digest["requirements"]))
+
+    return "\n".join(parts)
+
+
+def jd_prompt_text(job_description: str) -> str:
+    """
+    Job description text to embed in prompts
+
+    Short JDs are used as-is; longer ones are replaced by their cached digest, which
+    keeps the requirements that blind truncation used to cut off.
+    """
+    job_description = (job_description or "").strip()
+    digest_text = format_jd_digest(get_jd_digest(job_description))
+    if not digest_text or len(job_description) <= len(digest_text):
+        return job_description
+    return digest_text
+
+
+def jd_prompt_prefix(job_description: str) -> str:
+    """
+    Leading prompt text shared by every rewrite against one job description
+
+    Ollama routes pass it as the prefix so it is evaluated once per model and JD;
+    it must not contain anything specific to a bullet, category or chunk.
+    """
+    return (
+        "You are an expert resume writer tailoring a candidate's resume to a job posting.\n\n"
+        f"Job Description: {jd_prompt_text(job_description)}"
+    )
+
+
+def _extract_requirements(job_description, skill_names):
+    """Pick the most requirement-like lines of the JD, kept in their original order"""
+    segments = []
+    for line in job_description.splitlines():
+        line = re.sub(r'^\s*(?:[•\-*·]|\d+[.)])\s*', '', line).strip()
+        if not line:
+            continue
+        # Long paragraphs are split into sentences so each one can be scored on its own
+        segments.extend(sentence.strip() for sentence in re.split(r'(?<=[.!?;])\s+', line) if sentence.strip())
+
+    skill_lookup = [skill.lower() for skill in skill_names]
+    scored = []
+    for position, segment in enumerate(segments):
+        lower = segment.lower()
+        if len(lower) < 15 or any(cue in lower for cue in BOILERPLATE_CUES):
+            continue
+
+        score = sum(2 for cue in REQUIREMENT_CUES if cue in lower)
+        score += sum(1 for skill in skill_lookup if skill in lower)
+        if YEARS_PATTERN.search(segment):
+            score += 2
+
+        if score > 0:
+            if len(segment) > MAX_REQUIREMENT_CHARS:
+                segment = segment[:MAX_REQUIREMENT_CHARS].rsplit(' ', 1)[0] + "..."
+            scored.append((score, position, segment))
+
+    top = sorted(scored, key=lambda item: (-item[0], item[1]))[:MAX_REQUIREMENTS]
+    return [segment for _, _, segment in sorted(top, key=lambda item: item[1])]
@@ -0,0 +1,479 @@
+from collections import Counter
+from itertools import chain
+from threading import Lock, local
+from typing import Any, Dict, Iterable, List, Optional, Union
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+from services.match_matrix import SKILL_NAMES, analyze_text
+from services.relevance import BM25_B, BM25_K1, STOPWORDS, tokenize
+
+DEFAULT_JD_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jds.db")
+# JDs written per transaction during bulk ingest; each batch adds one posting segment per term
+JD_INGEST_BATCH_SIZE = int(os.getenv("JD_INGEST_BATCH_SIZE", "2000"))
+# A term's segments are merged into one once it has more than this many
+JD_MAX_SEGMENTS = int(os.getenv("JD_MAX_SEGMENTS", "8"))
+# Free-text queries keep their most frequent terms
+JD_QUERY_MAX_TERMS = int(os.getenv("JD_QUERY_MAX_TERMS", "32"))
+# Ingest errors reported back per import; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+TERMS_FIELD = "terms"
+SKILLS_FIELD = "skills"
+
+# Postings are stored per (field, term) as packed arrays, one row per ingest batch ("segment"), so
+# adding JDs never rewrites an existing list. Deleted or replaced JDs leave stale postings behind;
+# AUTOINCREMENT keeps their rowids from being reused, queries drop them when joining back to jds,
+# and merges discard them.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jds (
+    rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    metadata TEXT,
+    term_count INTEGER NOT NULL,
+    skill_count INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    rowids BLOB NOT NULL,
+    freqs BLOB NOT NULL,
+    lengths BLOB NOT NULL,
+    PRIMARY KEY (field, term, segment)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS index_stats (
+    field TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO index_stats VALUES ('terms', 0, 0), ('skills', 0, 0);
+"""
+
+_SKILL_KEY_SEPARATORS = re.compile(r'[^a-z0-9+#.]+')
+
+
+def skill_key(name: str) -> str:
+    """One index term per skill, so "Spring Boot" can't match a JD that only says "boot\""""
+    return _SKILL_KEY_SEPARATORS.sub('_', name.lower()).strip('_')
+
+
+def resume_skill_names(skills: Union[str, List[Any]]) -> List[str]:
+    """
+    Skill names from a resume's "skills" field
+
+    Args:
+        skills: Output of ResumeParser._extract_enhanced_skills (categories of {"skill", ...}),
+            a list of skill names, or resume text to extract them from
+
+    Returns:
+        List[str]: Distinct skill names in input order
+    """
+    if isinstance(skills, str):
+        # Imported here: the parser pulls in file-format handling the index doesn't otherwise need
+        from services.resume_parser import ResumeParser
+        skills = ResumeParser()._extract_enhanced_skills(skills)
+
+    names = []
+    for item in skills or []:
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, dict) and "skills" in item:
+            names.extend(skill.get("skill", "") for skill in item["skills"] if isinstance(skill, dict))
+        elif isinstance(item, dict):
+            names.append(item.get("skill", ""))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class JDIndex:
+    """Job descriptions in a local SQLite database with a BM25-ranked inverted index"""
+
+    def __init__(self, path: str = DEFAULT_JD_INDEX_PATH):
+        """
+        Args:
+            path (str): SQLite database file; its directory is created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # One connection per thread; SQLite connections can't be shared across threads
+        self._local = local()
+        # Serializes writers in this process so concurrent ingests queue instead of failing on the lock
+        self._write_lock = Lock()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def add(self, jd: Union[str, Dict[str, Any]]) -> str:
+        """Add or replace one JD and return its ID"""
+        return self.add_many([jd])[0]
+
+    def add_many(self, jds: Iterable[Union[str, Dict[str, Any]]]) -> List[str]:
+        """Add or replace JDs (text, or {"id", "title", "text", ...metadata}); returns their IDs"""
+        ids = []
+        batch = []
+        for jd in jds:
+            batch.append(self._prepare(jd))
+            if len(batch) >= JD_INGEST_BATCH_SIZE:
+                ids.extend(self._write(batch))
+                batch = []
+        if batch:
+            ids.extend(self._write(batch))
+        return ids
+
+    def import_jsonl(self, lines: Iterable[Union[str, bytes]]) -> Dict[str, Any]:
+        """
+        Stream JDs from JSON Lines into the index, one batch in memory at a time
+
+        Args:
+            lines: Iterable of lines (an open file or a request stream), one JD object or string per line
+
+        Returns:
+            Dict: "added" count, "failed" count and the first few "errors" with their line numbers
+        """
+        added, failed, errors = 0, 0, []
+        batch = []
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            try:
+                batch.append(self._prepare(json.loads(line)))
+            except (ValueError, TypeError) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_number, "error": str(e)})
+                continue
+            if len(batch) >= JD_INGEST_BATCH_SIZE:
+                added += len(self._write(batch))
+                batch = []
+        if batch:
+            added += len(self._write(batch))
+        return {"added": added, "failed": failed, "errors": errors}
+
+    def delete(self, jd_id: str) -> bool:
+        """Remove a JD; False if it wasn't stored. Its postings go stale and are dropped on the next merge"""
+        with self._write_lock, self._connection() as conn:
+            return self._delete_row(conn, jd_id)
+
+    def get(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT * FROM jds WHERE id = ?", (jd_id,)).fetchone()
+        if row is None:
+            return None
+        record = self._record(row)
+        record["text"] = row["text"]
+        return record
+
+    def count(self) -> int:
+        return self._connection().execute(
+            "SELECT documents FROM index_stats WHERE field = ?", (TERMS_FIELD,)
+        ).fetchone()[0]
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        JDs ranked by BM25 relevance of their text to a free-text query
+
+        Args:
+            query (str): Search text; stopwords are dropped and the JD_QUERY_MAX_TERMS most frequent terms kept
+            top_k (int): Results to return
+
+        Returns:
+            List[Dict]: Best first, each with "id", "title", "score", "skills", "metadata" and "added_at"
+        """
+        counts = Counter(tokenize(query))
+        return self._ranked(TERMS_FIELD, dict(counts.most_common(JD_QUERY_MAX_TERMS)), top_k)
+
+    def match_skills(self, skills: Union[str, List[Any]], top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        JDs that ask for the resume's skills, rarer skills counting more (BM25 over the JDs' skill lists)
+
+        Args:
+            skills: The resume's skills as accepted by resume_skill_names
+            top_k (int): Results to return
+
+        Returns:
+            List[Dict]: Best first, as search(), plus "matched_skills" and "missing_skills" per JD
+        """
+        keys = {skill_key(name) for name in resume_skill_names(skills)}
+        results = self._ranked(SKILLS_FIELD, dict.fromkeys(keys, 1), top_k)
+        for result in results:
+            result["matched_skills"] = [name for name in result["skills"] if skill_key(name) in keys]
+            result["missing_skills"] = [name for name in result["skills"] if skill_key(name) not in keys]
+        return results
+
+    def _ranked(self, field: str, query_counts: Dict[str, int], top_k: int) -> List[Dict[str, Any]]:
+        # Imported here so app start-up doesn't pay for NumPy
+        import numpy as np
+
+        top_k = max(1, int(top_k))
+        if not query_counts:
+            return []
+
+        conn = self._connection()
+        documents, total_length = conn.execute(
+            "SELECT documents, total_length FROM index_stats WHERE field = ?", (field,)
+        ).fetchone()
+        if not documents:
+            return []
+        average_length = total_length / documents or 1.0
+
+        # Score every posting of every query term at once; only candidate JDs are ever loaded
+        all_rowids, all_scores = [], []
+        for term, query_count in query_counts.items():
+            rowids, freqs, lengths = self._postings(conn, field, term)
+            if not len(rowids):
+                continue
+            # Stale postings inflate df until the next merge; clamped so idf stays positive
+            df = min(len(rowids), documents)
+            idf = np.log1p((documents - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+            all_rowids.append(rowids)
+            all_scores.append(freqs * (BM25_K1 + 1) / (freqs + norm) * (idf * np.log1p(query_count)))
+        if not all_rowids:
+            return []
+
+        # Dense over rowids: one C pass sums each JD's terms, no sort needed
+        dense = np.bincount(np.concatenate(all_rowids), weights=np.concatenate(all_scores))
+        rowids = np.flatnonzero(dense)
+        scores = dense[rowids]
+
+        # Take a few more than asked for in case some candidates were deleted, and widen if that wasn't enough
+        wanted = top_k
+        while True:
+            take = min(len(rowids), wanted + 16)
+            if take < len(rowids):
+                candidates = np.argpartition(-scores, take - 1)[:take]
+            else:
+                candidates = np.arange(len(rowids))
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            candidate_rowids = rowids[candidates].tolist()
+            placeholders = ",".join("?" * len(candidate_rowids))
+            rows = {row["rowid"]: row for row in conn.execute(
+                f"SELECT * FROM jds WHERE rowid IN ({placeholders})", candidate_rowids
+            )}
+            if len(rows) >= top_k or take == len(rowids):
+                break
+            wanted *= 4
+
+        results = []
+        for rowid, score in zip(candidate_rowids, scores[candidates].tolist()):
+            row = rows.get(rowid)
+            if row is None:
+                continue
+            record = self._record(row)
+            record["score"] = round(score, 4)
+            results.append(record)
+            if len(results) == top_k:
+                break
+        return results
+
+    @staticmethod
+    def _postings(conn: sqlite3.Connection, field: str, term: str):
+        import numpy as np
+
+        segments = conn.execute(
+            "SELECT rowids, freqs, lengths FROM postings WHERE field = ? AND term = ?", (field, term)
+        ).fetchall()
+        if not segments:
+            empty = np.zeros(0, dtype=np.float32)
+            return np.zeros(0, dtype=np.int64), empty, empty
+        return (
+            np.concatenate([np.frombuffer(segment[0], dtype=np.int64) for segment in segments]),
+            np.concatenate([np.frombuffer(segment[1], dtype=np.float32) for segment in segments]),
+            np.concatenate([np.frombuffer(segment[2], dtype=np.float32) for segment in segments])
+        )
+
+    def _prepare(self, jd: Union[str, Dict[str, Any]]) -> tuple:
+        if isinstance(jd, str):
+            jd = {"text": jd}
+        if not isinstance(jd, dict):
+            raise TypeError("Each JD must be a string or an object")
+        text = jd.get("text") or jd.get("description") or ""
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("JD has no text")
+
+        # Same ID for the same text, so re-importing a file replaces rather than duplicates
+        jd_id = str(jd.get("id") or hashlib.sha1(text.encode("utf-8")).hexdigest()[:16])
+        tokens, skill_indices = analyze_text(text)
+        skills = [SKILL_NAMES[index] for index in sorted(skill_indices)]
+        metadata = {key: value for key, value in jd.items() if key not in ("id", "title", "text", "description")}
+        terms = Counter(tokens)
+        for stopword in STOPWORDS & terms.keys():
+            del terms[stopword]
+        return (
+            jd_id,
+            str(jd.get("title") or ""),
+            text,
+            skills,
+            json.dumps(metadata) if metadata else None,
+            terms,
+            Counter(skill_key(name) for name in skills)
+        )
+
+    def _write(self, batch: List[tuple]) -> List[str]:
+        import numpy as np
+
+        now = time.time()
+        with self._write_lock, self._connection() as conn:
+            rowids = []
+            for jd_id, title, text, skills, metadata, terms, skill_keys in batch:
+                self._delete_row(conn, jd_id)
+                cursor = conn.execute(
+                    "INSERT INTO jds (id, title, text, skills, metadata, term_count, skill_count, added_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (jd_id, title, text, json.dumps(skills), metadata,
+                     sum(terms.values()), sum(skill_keys.values()), now)
+                )
+                rowids.append(cursor.lastrowid)
+
+            rowids = np.array(rowids, dtype=np.int64)
+            touched = {}
+            for field, position in ((TERMS_FIELD, 5), (SKILLS_FIELD, 6)):
+                counters = [row[position] for row in batch]
+                touched[field] = self._write_segment(conn, field, rowids, counters)
+            self._merge_segments(conn, touched)
+        return [row[0] for row in batch]
+
+    def _write_segment(self, conn: sqlite3.Connection, field: str, rowids, counters: List[Counter]) -> List[str]:
+        """Add one posting segment per term for a batch of JDs; returns the terms written"""
+        import numpy as np
+
+        postings_per_jd = [len(counts) for counts in counters]
+        lengths = np.array([sum(counts.values()) for counts in counters], dtype=np.float32)
+        conn.execute(
+            "UPDATE index_stats SET documents = documents + ?, total_length = total_length + ? WHERE field = ?",
+            (len(counters), int(lengths.sum()), field)
+        )
+        total = sum(postings_per_jd)
+        if not total:
+            return []
+
+        # Group the batch's postings by term with one sort instead of a Python dict of lists
+        terms = list(chain.from_iterable(counters))
+        # Sorted so the segment rows go into the postings B-tree in key order
+        vocabulary = {term: index for index, term in enumerate(sorted(set(terms)))}
+        term_ids = np.fromiter(map(vocabulary.__getitem__, terms), dtype=np.int64, count=total)
+        freqs = np.fromiter(chain.from_iterable(counts.values() for counts in counters), dtype=np.float32, count=total)
+        order = np.argsort(term_ids, kind="stable")
+        posting_rowids = np.repeat(rowids, postings_per_jd)[order]
+        posting_freqs = freqs[order]
+        posting_lengths = np.repeat(lengths, postings_per_jd)[order]
+        bounds = np.searchsorted(term_ids[order], np.arange(len(vocabulary) + 1)).tolist()
+
+        segment = int(rowids[-1])
+        conn.executemany(
+            "INSERT INTO postings (field, term, segment, rowids, freqs, lengths) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (field, term, segment, posting_rowids[start:stop].tobytes(),
+                 posting_freqs[start:stop].tobytes(), posting_lengths[start:stop].tobytes())
+                for term, start, stop in zip(vocabulary, bounds, bounds[1:])
+            )
+        )
+        return list(vocabulary)
+
+    def _merge_segments(self, conn: sqlite3.Connection, touched: Dict[str, List[str]]) -> None:
+        """
+        Merge the newer segments of terms that have more than JD_MAX_SEGMENTS, dropping stale postings
+
+        A segment is left alone while it is at least as large as everything written after it, so each
+        posting is rewritten a logarithmic number of times rather than on every merge.
+        """
+        import numpy as np
+
+        crowded = []
+        for field, terms in touched.items():
+            if terms:
+                crowded.extend(
+                    (field, row[0]) for row in conn.execute(
+                        "SELECT term FROM postings WHERE field = ? AND term IN (SELECT value FROM json_each(?)) "
+                        "GROUP BY term HAVING count(*) > ?",
+                        (field, json.dumps(terms), JD_MAX_SEGMENTS)
+                    )
+                )
+        if not crowded:
+            return
+
+        live_rowids = np.fromiter((row[0] for row in conn.execute("SELECT rowid FROM jds")), dtype=np.int64)
+        live = np.zeros(int(live_rowids.max(initial=0)) + 1, dtype=bool)
+        live[live_rowids] = True
+        for field, term in crowded:
+            segments = conn.execute(
+                "SELECT segment, rowids, freqs, lengths FROM postings WHERE field = ? AND term = ? ORDER BY segment",
+                (field, term)
+            ).fetchall()
+            sizes = [len(segment["rowids"]) for segment in segments]
+            first = 0
+            while first < len(segments) - 1 and sizes[first] >= sum(sizes[first + 1:]):
+                first += 1
+            merging = segments[first:]
+
+            rowids = np.concatenate([np.frombuffer(segment["rowids"], dtype=np.int64) for segment in merging])
+            keep = live[np.minimum(rowids, len(live) - 1)] & (rowids < len(live))
+            conn.execute(
+                "DELETE FROM postings WHERE field = ? AND term = ? AND segment >= ?",
+                (field, term, merging[0]["segment"])
+            )
+            if keep.any():
+                freqs = np.concatenate([np.frombuffer(segment["freqs"], dtype=np.float32) for segment in merging])
+                lengths = np.concatenate([np.frombuffer(segment["lengths"], dtype=np.float32) for segment in merging])
+                conn.execute(
+                    "INSERT INTO postings (field, term, segment, rowids, freqs, lengths) VALUES (?, ?, ?, ?, ?, ?)",
+                    (field, term, merging[-1]["segment"], rowids[keep].tobytes(),
+                     freqs[keep].tobytes(), lengths[keep].tobytes())
+                )
+
+    @staticmethod
+    def _delete_row(conn: sqlite3.Connection, jd_id: str) -> bool:
+        row = conn.execute("SELECT term_count, skill_count FROM jds WHERE id = ?", (jd_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM jds WHERE id = ?", (jd_id,))
+        for field, length in ((TERMS_FIELD, row["term_count"]), (SKILLS_FIELD, row["skill_count"])):
+            conn.execute(
+                "UPDATE index_stats SET documents = documents - 1, total_length = total_length - ? WHERE field = ?",
+                (length, field)
+            )
+        return True
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "skills": json.loads(row["skills"]),
+            "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+            "added_at": row["added_at"]
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL lets searches run while an import is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL (a crash can lose the last commit, not corrupt the index) and much faster to ingest
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+# Global instance for reuse
+jd_index = None
+_jd_index_lock = Lock()
+
+def get_jd_index() -> JDIndex:
+    """The shared JD index, opened on first use so app start-up doesn't touch the database"""
+    global jd_index
+    with _jd_index_lock:
+        if jd_index is None:
+            jd_index = JDIndex(os.getenv("JD_INDEX_PATH", DEFAULT_JD_INDEX_PATH))
+    return jd_index
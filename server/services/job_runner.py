@@ -0,0 +1,131 @@
+from queue import Queue
+from threading import Thread
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+
+from flask import g, has_request_context
+
+from services.job_store import DEFAULT_JOB_STORE_PATH, JobStore
+from services.metrics import Gauge, registry
+
+# Long-running endpoints that can be submitted as jobs; both apps serve them at the same paths
+JOB_TYPES = {
+    "match_entire_resume": "/api/match_entire_resume",
+    "match_structured_resume": "/api/match_structured_resume",
+    "bundle_bullets_by_project": "/api/bundle_bullets_by_project",
+}
+
+# Jobs aren't bound by a client's HTTP timeout, so they get the longest allowed budget
+JOB_DEADLINE_SECONDS = float(os.getenv("JOB_DEADLINE_SECONDS", "300"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_HOURS", "24")) * 60 * 60
+
+
+class JobRunner:
+    """Worker pool that runs queued jobs from a JobStore"""
+
+    def __init__(self, app, store: JobStore, workers: int = 2):
+        """
+        Args:
+            app (Flask): App whose endpoints execute the jobs
+            store (JobStore): Durable job records
+            workers (int): Number of jobs processed at once
+        """
+        self.app = app
+        self.store = store
+        self.workers = workers
+        self._queue = Queue()
+        self._threads = []
+
+    def start(self) -> None:
+        """Resume jobs left over from the last run and start the workers"""
+        if self._threads:
+            return
+        purged = self.store.purge_finished(JOB_RETENTION_SECONDS)
+        resumed = self.store.requeue_interrupted()
+        for job_id in resumed:
+            self._queue.put(job_id)
+        if resumed or purged:
+            logging.info(f"Job store: resumed {len(resumed)} job(s), purged {purged} expired job(s)")
+
+        for number in range(self.workers):
+            thread = Thread(target=self._work, name=f"job-worker-{number + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a job and queue it for the workers
+
+        Args:
+            job_type (str): One of JOB_TYPES
+            payload (Dict): Request body for the job's endpoint
+
+        Returns:
+            Dict: The queued job record
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type '{job_type}'")
+        job = self.store.create(job_type, payload)
+        self._queue.put(job["job_id"])
+        return job
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception as e:
+                logging.exception(f"Job {job_id} failed")
+                self.store.fail(job_id, str(e))
+
+    def _run(self, job_id):
+        job = self.store.get(job_id, include_payload=True)
+        if job is None or not self.store.mark_running(job_id):
+            return
+
+        def progress(done, total, message=""):
+            self.store.update_progress(job_id, done, total, message)
+
+        # Replay the job as a request so it runs exactly what the synchronous endpoint runs
+        headers = {"X-Request-Timeout": str(JOB_DEADLINE_SECONDS)}
+        with self.app.test_request_context(JOB_TYPES[job["type"]], method="POST", json=job["payload"],
+                                           headers=headers):
+            g.job_id = job_id
+            g.job_progress = progress
+            response = self.app.full_dispatch_request()
+
+        self.store.finish(job_id, response.status_code, response.get_json(silent=True))
+
+
+def current_job_progress() -> Optional[Callable[..., None]]:
+    """Progress callback of the job being run, or None for ordinary requests"""
+    if has_request_context():
+        return g.get("job_progress")
+    return None
+
+
+# Global instance for reuse
+job_runner = None
+
+def get_job_runner() -> Optional[JobRunner]:
+    """The app's job runner, or None if job workers are disabled"""
+    return job_runner
+
+def start_job_workers(app, default_workers: int = 2) -> None:
+    """Start the job worker pool with JOB_WORKERS workers (default_workers if unset); none if 0"""
+    global job_runner
+    workers = int(os.getenv("JOB_WORKERS", str(default_workers)))
+    if workers <= 0 or job_runner is not None:
+        return
+    store = JobStore(os.getenv("JOB_STORE_PATH", DEFAULT_JOB_STORE_PATH))
+    job_runner = JobRunner(app, store, workers)
+    job_runner.start()
+
+registry.register(Gauge(
+    "jobpal_jobs_queued", "Jobs waiting for a worker",
+    collect=lambda: {(): job_runner.queue_depth()} if job_runner else {}
+))
@@ -0,0 +1,163 @@
+from threading import local
+from typing import Any, Dict, List, Optional
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+DEFAULT_JOB_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jobs.db")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    http_status INTEGER,
+    error TEXT,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    progress_message TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class JobStore:
+    """Durable job records in a local SQLite database, so queued work survives a restart"""
+
+    def __init__(self, path: str = DEFAULT_JOB_STORE_PATH):
+        """
+        Args:
+            path (str): SQLite database file; its directory is created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # One connection per thread; SQLite connections can't be shared across threads
+        self._local = local()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def create(self, job_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a queued job and return its public record"""
+        job_id = uuid.uuid4().hex
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, type, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, job_type, JOB_QUEUED, json.dumps(payload), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_payload: bool = False, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Load a job record
+
+        Args:
+            job_id (str): Job ID
+            include_payload (bool): Include the submitted request body
+            include_result (bool): Include the response body once the job has finished
+
+        Returns:
+            Dict: Job record, or None if the job doesn't exist
+        """
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            "job_id": row["id"],
+            "type": row["type"],
+            "status": row["status"],
+            "progress": {
+                "done": row["progress_done"],
+                "total": row["progress_total"],
+                "message": row["progress_message"]
+            },
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "http_status": row["http_status"],
+            "error": row["error"]
+        }
+        if include_payload:
+            job["payload"] = json.loads(row["payload"])
+        if include_result and row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    def mark_running(self, job_id: str) -> bool:
+        """Claim a queued job; False if it was already claimed or doesn't exist"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                (JOB_RUNNING, time.time(), job_id, JOB_QUEUED)
+            )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, done: int, total: int, message: str = "") -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress_done = ?, progress_total = ?, progress_message = ? WHERE id = ?",
+                (done, total, message, job_id)
+            )
+
+    def finish(self, job_id: str, http_status: int, result: Any) -> None:
+        """Store the response of a job; 4xx/5xx responses mark it failed but keep the body"""
+        status = JOB_SUCCEEDED if http_status < 400 else JOB_FAILED
+        error = result.get("error") if isinstance(result, dict) and status == JOB_FAILED else None
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, http_status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, http_status, json.dumps(result), error, time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, http_status = 500, error = ?, finished_at = ? WHERE id = ?",
+                (JOB_FAILED, error, time.time(), job_id)
+            )
+
+    def requeue_interrupted(self) -> List[str]:
+        """
+        Put jobs that were running when the process stopped back in the queue
+
+        Returns:
+            List[str]: IDs of every queued job, oldest first
+        """
+        with self._connection() as conn:
+            conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (JOB_QUEUED, JOB_RUNNING))
+            rows = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (JOB_QUEUED,)).fetchall()
+        return [row["id"] for row in rows]
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        """Delete finished jobs past the retention period, with their payloads and results; the resume store is untouched"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - older_than_seconds,)
+            )
+        return cursor.rowcount
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL lets the status endpoints read while a worker is writing progress
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
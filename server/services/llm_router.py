@@ -0,0 +1,283 @@
+from collections import deque
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import logging
+import os
+import statistics
+import time
+
+from flask import current_app, has_app_context, has_request_context, jsonify, request
+
+from services.deadline import Deadline, DeadlineExceeded, current_deadline
+from services.llm_scheduler import current_priority, get_llm_scheduler
+from services.resilience import CircuitOpenError, RateLimitedError, get_provider_guard, is_retryable_error
+
+PROVIDERS = ("ollama", "gemini")
+
+# latency: lowest recent p50; cost: LLM_COST_ORDER first; health: fewest recent errors
+ROUTING_POLICIES = ("latency", "cost", "health")
+LLM_ROUTING_POLICY = os.getenv("LLM_ROUTING_POLICY", "cost").strip().lower()
+# Cheapest first: local Ollama costs nothing per call
+LLM_COST_ORDER = [name.strip() for name in os.getenv("LLM_COST_ORDER", "ollama,gemini").split(",") if name.strip()]
+# Recent calls per provider the latency and error statistics are computed over
+LLM_ROUTER_WINDOW = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+# A provider with this many calls queued for a slot is saturated and traffic spills to the next one
+LLM_SPILLOVER_QUEUE_DEPTH = int(os.getenv("LLM_SPILLOVER_QUEUE_DEPTH", "4"))
+
+# Clients can pin a request to one provider (no spillover)
+PROVIDER_OVERRIDE_HEADER = "X-LLM-Provider"
+
+
+class ProviderStats:
+    """Latency and outcome of a provider's recent calls"""
+
+    def __init__(self, window: int = 50):
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = Lock()
+
+    def record(self, seconds: Optional[float], ok: bool) -> None:
+        with self._lock:
+            if ok and seconds is not None:
+                self._latencies.append(seconds)
+            self._outcomes.append(ok)
+
+    def p50(self) -> Optional[float]:
+        with self._lock:
+            return statistics.median(self._latencies) if self._latencies else None
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.p50()
+        with self._lock:
+            calls = len(self._outcomes)
+        return {
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "recent_calls": calls
+        }
+
+
+class LLMRouter:
+    """
+    Sends each LLM call to a provider chosen by policy, spilling over to the next one
+
+    A provider is skipped while its circuit is open or its scheduler queue is at
+    LLM_SPILLOVER_QUEUE_DEPTH, and a call that fails with an open circuit, a rate
+    limit or a retryable upstream error is retried on the next provider in order.
+    """
+
+    def __init__(self, providers: List[str], policy: str = "cost", cost_order: Optional[List[str]] = None,
+                 window: int = 50, spillover_queue_depth: int = 4):
+        """
+        Args:
+            providers (List[str]): Configured providers ('ollama', 'gemini')
+            policy (str): One of ROUTING_POLICIES
+            cost_order (List[str]): Providers from cheapest to most expensive
+            window (int): Recent calls kept per provider for latency and error statistics
+            spillover_queue_depth (int): Queued calls at which a provider counts as saturated
+        """
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy '{policy}'. Use one of: {', '.join(ROUTING_POLICIES)}")
+        self.providers = list(providers)
+        self.policy = policy
+        self.cost_order = [name for name in (cost_order or PROVIDERS) if name in self.providers]
+        self.cost_order += [name for name in self.providers if name not in self.cost_order]
+        self.spillover_queue_depth = spillover_queue_depth
+        self.stats = {name: ProviderStats(window) for name in self.providers}
+
+    def generate(self, prompt: str, model: str = "phi3:mini", options: Optional[Dict[str, Any]] = None,
+                 timeout: float = 30, stream: bool = False, deadline: Optional[Deadline] = None,
+                 prefix: Optional[str] = None, format: Optional[str] = None, priority: Optional[str] = None,
+                 provider: Optional[str] = None) -> str:
+        """
+        Generate a completion on the provider the policy picks
+
+        Takes the same arguments as OllamaService.generate; model, stream and format only
+        apply to Ollama, and Gemini gets the prefix prepended to the prompt.
+
+        Args:
+            provider (str): Use only this provider; defaults to the X-LLM-Provider request header
+
+        Returns:
+            str: Generated text
+
+        Raises:
+            ValueError: If the requested provider isn't configured
+            CircuitOpenError, RateLimitedError: If every candidate provider is unavailable
+            DeadlineExceeded: If the request deadline leaves no time for the call
+        """
+        if deadline is None:
+            deadline = current_deadline()
+        # Resolved once so a spilled-over call keeps its scheduling class
+        priority = priority or current_priority()
+        provider = provider or requested_provider()
+        candidates = self.route(provider)
+
+        last_error = None
+        for index, name in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                if name == "ollama":
+                    from services.ollama_service import get_ollama_service
+                    result = get_ollama_service().generate(
+                        prompt, model=model, options=options, timeout=timeout, stream=stream,
+                        deadline=deadline, prefix=prefix, format=format, priority=priority, fallback=False
+                    )
+                else:
+                    from services.gemini_service import get_gemini_service
+                    options = options or {}
+                    result = get_gemini_service().generate_response(
+                        f"{prefix}\n\n{prompt}" if prefix else prompt,
+                        temperature=options.get("temperature", 0.7),
+                        max_tokens=options.get("num_predict", 1024),
+                        deadline=deadline, priority=priority, fallback=False
+                    )
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                spillable = isinstance(e, (CircuitOpenError, RateLimitedError)) or _is_retryable(e)
+                # An open circuit or rate limit is a client-side refusal, not an upstream failure
+                if not isinstance(e, (CircuitOpenError, RateLimitedError)):
+                    self.stats[name].record(None, ok=not spillable)
+                if not spillable or index == len(candidates) - 1:
+                    raise
+                last_error = e
+                logging.warning(f"{name} unavailable ({e}), spilling over to {candidates[index + 1]}")
+                continue
+
+            self.stats[name].record(time.perf_counter() - started, ok=True)
+            return result
+
+        raise last_error
+
+    def pick(self, provider: Optional[str] = None) -> str:
+        """Provider the next call would go to first; defaults to the X-LLM-Provider request header"""
+        return self.route(provider or requested_provider())[0]
+
+    def route(self, provider: Optional[str] = None) -> List[str]:
+        """
+        Providers to try, in order
+
+        Args:
+            provider (str): Explicit override; only that provider is returned
+        """
+        if provider:
+            if provider not in self.providers:
+                raise ValueError(f"LLM provider '{provider}' is not configured. Use one of: {', '.join(self.providers)}")
+            return [provider]
+
+        ranked = sorted(self.providers, key=self._rank_key)
+        # Saturated or broken providers go last rather than away, so there's always something to try
+        available = [name for name in ranked if not self._unavailable(name)]
+        return available + [name for name in ranked if name not in available]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "order": self.route(),
+            "providers": {
+                name: dict(
+                    self.stats[name].snapshot(),
+                    circuit=get_provider_guard(name).breaker.state,
+                    queued=sum(get_llm_scheduler(name).stats()["queued"].values())
+                )
+                for name in self.providers
+            }
+        }
+
+    def _rank_key(self, name):
+        cost_rank = self.cost_order.index(name)
+        if self.policy == "latency":
+            # Providers without samples rank first so they get measured
+            p50 = self.stats[name].p50()
+            return (p50 if p50 is not None else 0.0, cost_rank)
+        if self.policy == "health":
+            return (self.stats[name].error_rate(), cost_rank)
+        return (cost_rank,)
+
+    def _unavailable(self, name):
+        if get_provider_guard(name).breaker.state == "open":
+            return True
+        queued = sum(get_llm_scheduler(name).stats()["queued"].values())
+        return queued >= self.spillover_queue_depth
+
+
+def _is_retryable(error):
+    # GeminiService wraps SDK errors, keeping the original as the cause
+    return is_retryable_error(error) or (error.__cause__ is not None and is_retryable_error(error.__cause__))
+
+
+def provider_model(provider: str, ollama_model: str) -> str:
+    """Model a call to provider runs on; ollama_model is what Ollama would be asked for"""
+    if provider == "gemini":
+        from services.gemini_service import GEMINI_MODEL
+        return GEMINI_MODEL
+    return ollama_model
+
+
+def requested_provider() -> Optional[str]:
+    """Provider pinned by the current request's X-LLM-Provider header, if any"""
+    if has_request_context():
+        provider = request.headers.get(PROVIDER_OVERRIDE_HEADER, "").strip().lower()
+        return provider or None
+    return None
+
+
+def configured_providers() -> List[str]:
+    """Providers enabled with LLM_PROVIDERS; Gemini needs an API key"""
+    names = [name.strip().lower() for name in os.getenv("LLM_PROVIDERS", ",".join(PROVIDERS)).split(",")]
+    providers = [name for name in names if name in PROVIDERS]
+    if "gemini" in providers and not os.getenv("GOOGLE_API_KEY"):
+        providers.remove("gemini")
+    return providers or ["ollama"]
+
+
+def init_llm_router(app, providers: Optional[List[str]] = None) -> None:
+    """
+    Reject requests pinned to a provider this server doesn't have
+
+    Args:
+        providers (List[str]): Providers this app's calls go to, in order of preference, instead of
+            LLM_PROVIDERS routed by LLM_ROUTING_POLICY; later ones are only spilled over to
+    """
+    if providers is not None:
+        app.extensions["llm_router"] = LLMRouter(
+            providers,
+            policy="cost",
+            cost_order=providers,
+            window=LLM_ROUTER_WINDOW,
+            spillover_queue_depth=LLM_SPILLOVER_QUEUE_DEPTH
+        )
+
+    @app.before_request
+    def _check_requested_provider():
+        provider = requested_provider()
+        providers = get_llm_router().providers
+        if provider and provider not in providers:
+            return jsonify({"error": f"LLM provider '{provider}' is not configured. Use one of: {', '.join(providers)}"}), 400
+
+
+# Global instance for reuse
+llm_router = None
+
+def get_llm_router() -> LLMRouter:
+    """The current app's router if init_llm_router gave it one, else one from environment configuration"""
+    global llm_router
+    # Chunk threads run in a copy of the request's context, so they see the app too
+    if has_app_context() and "llm_router" in current_app.extensions:
+        return current_app.extensions["llm_router"]
+    if llm_router is None:
+        llm_router = LLMRouter(
+            configured_providers(),
+            policy=LLM_ROUTING_POLICY,
+            cost_order=LLM_COST_ORDER,
+            window=LLM_ROUTER_WINDOW,
+            spillover_queue_depth=LLM_SPILLOVER_QUEUE_DEPTH
+        )
+    return llm_router
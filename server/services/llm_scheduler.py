@@ -0,0 +1,239 @@
+from contextlib import contextmanager
+from itertools import count
+from threading import Condition, Lock
+from typing import Any, Dict, Optional
+import os
+import time
+
+from flask import g, has_request_context, request
+
+from services.deadline import MIN_CALL_SECONDS, Deadline, DeadlineExceeded
+from services.metrics import Gauge, registry
+from services.stage_timing import current_stage_timings
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+
+# Endpoints a user is actively waiting on (matched by view name, so both apps share the list)
+INTERACTIVE_ENDPOINTS = {"improve_bullet", "match_bullet_to_jd"}
+
+# Share of LLM slots each class gets while both have work queued
+DEFAULT_PRIORITY_WEIGHTS = "interactive=4,bulk=1"
+
+# Default concurrent calls per provider: a local Ollama serves few requests at once, Gemini many
+DEFAULT_MAX_CONCURRENT = {"ollama": 2, "gemini": 8}
+
+# Concurrent LLM calls across every provider (0 leaves only the per-provider limits)
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "8"))
+GLOBAL_SCHEDULER = "all"
+
+# Flow tags kept per (class, client) before those no longer ahead of virtual time are dropped
+MAX_FLOW_TAGS = 1024
+
+
+class _Waiter:
+    __slots__ = ("priority", "tag", "enqueued_at", "seq")
+
+    def __init__(self, priority, tag, seq):
+        self.priority = priority
+        self.tag = tag
+        self.enqueued_at = time.monotonic()
+        self.seq = seq
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls to a provider by priority class with weighted fair queuing
+
+    Each waiting call gets a virtual finish tag that advances by 1/weight of its class,
+    and free slots go to the lowest tag, so classes share the provider in proportion to
+    their weights. Tags advance per (class, client) flow, so within a class each client
+    gets an equal share however many calls it queues. Calls that have waited longer than
+    aging_seconds are served first, oldest first, so no class starves.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, weights: Dict[str, float], aging_seconds: float = 10.0,
+                 parent: Optional["LLMScheduler"] = None):
+        """
+        Args:
+            name (str): Provider name, for error messages and stats
+            max_concurrent (int): Calls allowed in flight at once
+            weights (Dict[str, float]): Relative share per priority class
+            aging_seconds (float): Queue wait after which a call jumps ahead of weighted order
+            parent (LLMScheduler): Scheduler shared by every provider, whose slot is also held per call
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.weights = weights
+        self.aging_seconds = aging_seconds
+        self.parent = parent
+        self._cond = Condition(Lock())
+        self._active = 0
+        self._waiting = []
+        self._virtual_time = 0.0
+        self._last_tag = {}
+        self._seq = count()
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, deadline: Optional[Deadline] = None):
+        """Hold one of the provider's slots (and the global one, if capped) for the duration of a call"""
+        queued_at = time.monotonic()
+        self.acquire(priority, deadline)
+        try:
+            # Always provider first, then global, so two calls can never wait on each other's slot
+            if self.parent is not None:
+                self.parent.acquire(priority, deadline)
+            # One queue entry per call, covering the wait at both levels
+            timings = current_stage_timings()
+            if timings is not None:
+                timings.add("queue", time.monotonic() - queued_at)
+            try:
+                yield
+            finally:
+                if self.parent is not None:
+                    self.parent.release()
+        finally:
+            self.release()
+
+    def acquire(self, priority: Optional[str] = None, deadline: Optional[Deadline] = None) -> None:
+        """
+        Wait for a slot; slot() also records the wait as the request's queue time
+
+        Args:
+            priority (str): Priority class; defaults to the current request's class
+            deadline (Deadline): Stop waiting when the request runs out of time
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while queued
+        """
+        priority = priority or current_priority()
+        weight = self.weights.get(priority, 1.0)
+        flow = (priority, current_client())
+
+        with self._cond:
+            tag = max(self._virtual_time, self._last_tag.get(flow, 0.0)) + 1.0 / weight
+            self._last_tag[flow] = tag
+            waiter = _Waiter(priority, tag, next(self._seq))
+            self._waiting.append(waiter)
+
+            while not (self._active < self.max_concurrent and self._next_waiter() is waiter):
+                if deadline and deadline.expired():
+                    self._waiting.remove(waiter)
+                    self._cond.notify_all()
+                    raise DeadlineExceeded(f"Request deadline reached while queued for {self.name}")
+                # Wake up when the deadline would leave too little time to start the call
+                self._cond.wait(deadline.remaining() - MIN_CALL_SECONDS + 0.01 if deadline else None)
+
+            self._waiting.remove(waiter)
+            self._active += 1
+            self._virtual_time = max(self._virtual_time, waiter.tag)
+            if len(self._last_tag) > MAX_FLOW_TAGS:
+                # Flows at or behind virtual time would start from it anyway
+                self._last_tag = {key: tag for key, tag in self._last_tag.items() if tag > self._virtual_time}
+            # Another slot may still be free for the next waiter in line
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """In-flight calls and queue depth per priority class"""
+        with self._cond:
+            queued = {priority: 0 for priority in self.weights}
+            for waiter in self._waiting:
+                queued[waiter.priority] = queued.get(waiter.priority, 0) + 1
+            return {"active": self._active, "max_concurrent": self.max_concurrent, "queued": queued}
+
+    def _next_waiter(self):
+        if not self._waiting:
+            return None
+        now = time.monotonic()
+        aged = [waiter for waiter in self._waiting if now - waiter.enqueued_at >= self.aging_seconds]
+        if aged:
+            return min(aged, key=lambda waiter: waiter.seq)
+        return min(self._waiting, key=lambda waiter: (waiter.tag, waiter.seq))
+
+
+def parse_priority_weights(spec: str) -> Dict[str, float]:
+    """Parse "interactive=4,bulk=1" into a weight per class"""
+    weights = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            weights[name.strip()] = max(float(value), 0.01)
+    return weights
+
+
+def current_priority() -> str:
+    """Priority class of the current request; work outside a request (chunk threads, jobs) is bulk"""
+    if has_request_context():
+        return g.get("llm_priority", PRIORITY_BULK)
+    return PRIORITY_BULK
+
+
+def current_client() -> Optional[str]:
+    """Client the current request was admitted for (see services.admission), or None"""
+    if has_request_context():
+        return g.get("llm_client")
+    return None
+
+
+def priority_from_request(req) -> str:
+    """Interactive for single-bullet endpoints; clients can lower theirs with X-Request-Priority: bulk"""
+    endpoint = (req.endpoint or "").rsplit(".", 1)[-1]
+    priority = PRIORITY_INTERACTIVE if endpoint in INTERACTIVE_ENDPOINTS else PRIORITY_BULK
+    if req.headers.get("X-Request-Priority", "").lower() == PRIORITY_BULK:
+        priority = PRIORITY_BULK
+    return priority
+
+
+def init_llm_priorities(app) -> None:
+    """Tag every request with the priority class its LLM calls are scheduled under"""
+
+    @app.before_request
+    def _set_llm_priority():
+        g.llm_priority = priority_from_request(request)
+
+
+# Global instances for reuse, one per provider
+llm_schedulers = {}
+_schedulers_lock = Lock()
+
+def get_llm_scheduler(name: str) -> LLMScheduler:
+    """Get or create the scheduler for a provider from environment configuration"""
+    with _schedulers_lock:
+        if name not in llm_schedulers:
+            prefix = name.upper()
+            parent = None
+            if name != GLOBAL_SCHEDULER and LLM_MAX_CONCURRENT > 0:
+                parent = llm_schedulers.get(GLOBAL_SCHEDULER) or _create_scheduler(GLOBAL_SCHEDULER, LLM_MAX_CONCURRENT)
+                llm_schedulers[GLOBAL_SCHEDULER] = parent
+            max_concurrent = int(os.getenv(f"{prefix}_MAX_CONCURRENT", str(DEFAULT_MAX_CONCURRENT.get(name, 4))))
+            llm_schedulers[name] = _create_scheduler(name, max_concurrent, parent)
+        return llm_schedulers[name]
+
+def _create_scheduler(name: str, max_concurrent: int, parent: Optional[LLMScheduler] = None) -> LLMScheduler:
+    return LLMScheduler(
+        name=name,
+        max_concurrent=max_concurrent,
+        weights=parse_priority_weights(os.getenv("LLM_PRIORITY_WEIGHTS", DEFAULT_PRIORITY_WEIGHTS)),
+        aging_seconds=float(os.getenv("LLM_AGING_SECONDS", "10")),
+        parent=parent
+    )
+
+def _collect_queued():
+    queued = {}
+    for name, scheduler in list(llm_schedulers.items()):
+        for priority, depth in scheduler.stats()["queued"].items():
+            queued[(name, priority)] = depth
+    return queued
+
+registry.register(Gauge(
+    "jobpal_llm_in_flight", "LLM calls holding a scheduler slot", ["provider"],
+    collect=lambda: {(name,): scheduler.stats()["active"] for name, scheduler in list(llm_schedulers.items())}
+))
+registry.register(Gauge(
+    "jobpal_llm_queued", "LLM calls waiting for a scheduler slot", ["provider", "priority"], collect=_collect_queued
+))
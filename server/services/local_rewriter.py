@@ -0,0 +1,119 @@
+from typing import List, Optional
+import re
+from services.jd_digest import SKILL_PATTERN_BY_NAME, get_jd_digest
+
+# Weak openings and the stronger action verb that replaces them
+WEAK_OPENINGS = [
+    ("was responsible for", "Owned"),
+    ("responsible for", "Owned"),
+    ("in charge of", "Led"),
+    ("was part of", "Collaborated on"),
+    ("participated in", "Contributed to"),
+    ("took part in", "Contributed to"),
+    ("tasked with", "Drove"),
+    ("worked on", "Delivered"),
+    ("worked with", "Partnered with"),
+    ("helped with", "Supported"),
+    ("assisted with", "Supported"),
+    ("assisted in", "Supported"),
+    ("handled", "Managed"),
+    ("did", "Executed"),
+    ("made", "Built"),
+    ("used", "Leveraged"),
+    ("wrote", "Authored"),
+    ("fixed", "Resolved"),
+    ("ran", "Operated"),
+    ("looked after", "Maintained"),
+    ("dealt with", "Resolved"),
+]
+_WEAK_OPENING_PATTERNS = [
+    (re.compile(r'^' + re.escape(phrase) + r'\b\s*', re.IGNORECASE), verb) for phrase, verb in WEAK_OPENINGS
+]
+
+# Quantified outcomes: percentages, money, multipliers, counts of users/requests/etc.
+_METRIC_PATTERN = re.compile(
+    r'(\d[\d,.]*\s*%|\$\s*\d[\d,.]*\s*[kmb]?|\d[\d,.]*\s*x\b|\d[\d,.]*\+?\s*[kmb]?\s*'
+    r'(?:users|customers|clients|requests|transactions|hours|days|weeks|ms|seconds|engineers|people|members|teams))',
+    re.IGNORECASE
+)
+# Connectors that usually introduce the outcome part of a bullet
+_RESULT_SPLIT_PATTERN = re.compile(
+    r',?\s+(?:resulting in|which resulted in|leading to|which led to|that led to|and achieved|achieving)\s+',
+    re.IGNORECASE
+)
+_MARKER_PATTERN = re.compile(r'^\s*(?:[•\-*·]|\d+[.)])\s*')
+
+RESULT_CONNECTORS = {
+    "star": "resulting in",
+    "xyz": "as measured by",
+}
+
+
+def rewrite_bullet(bullet: str, structure_type: str = "standard", jd_skills: Optional[List[str]] = None) -> str:
+    """
+    Rule-based bullet rewrite used when the LLM path is unavailable or out of time
+
+    Upgrades weak opening verbs, fills a STAR/XYZ-style "action, result" template when
+    the bullet contains a quantified outcome, and surfaces JD skills the bullet already
+    mentions. It never adds skills or numbers the bullet doesn't contain.
+
+    Args:
+        bullet (str): Original bullet
+        structure_type (str): Format type ('star', 'xyz', 'standard')
+        jd_skills (List[str]): Skills the job description asks for
+
+    Returns:
+        str: Rewritten bullet
+    """
+    text = _MARKER_PATTERN.sub('', bullet or "").strip().rstrip('.;')
+    if not text:
+        return bullet
+
+    text = _upgrade_opening_verb(text)
+
+    # Use the taxonomy's casing for JD skills the bullet mentions ("python" -> "Python")
+    mentioned = []
+    for skill in jd_skills or []:
+        pattern = SKILL_PATTERN_BY_NAME.get(skill)
+        if pattern is not None and pattern.search(text):
+            text = pattern.sub(skill, text)
+            mentioned.append(skill)
+
+    if structure_type in RESULT_CONNECTORS:
+        text = _fill_result_template(text, structure_type, mentioned)
+
+    return text[0].upper() + text[1:]
+
+
+def rewrite_bullets(bullets: List[str], job_description: str = "", structure_type: str = "standard") -> List[str]:
+    """Rewrite a list of bullets against a job description with the local rules"""
+    jd_skills = get_jd_digest(job_description)["skills"] if job_description else []
+    return [rewrite_bullet(bullet, structure_type, jd_skills) for bullet in bullets]
+
+
+def _upgrade_opening_verb(text):
+    for pattern, verb in _WEAK_OPENING_PATTERNS:
+        if pattern.match(text):
+            return pattern.sub(verb + ' ', text, count=1)
+    return text
+
+
+def _fill_result_template(text, structure_type, mentioned_skills):
+    """Restructure "action ... metric" bullets into action, (skills,) result order"""
+    metric = _METRIC_PATTERN.search(text)
+    if not metric:
+        return text
+
+    # Without an outcome connector before the metric ("... by 40%") the sentence is already in order
+    split = _RESULT_SPLIT_PATTERN.search(text)
+    if not split or split.start() > metric.start():
+        return text
+    action, result = text[:split.start()], text[split.end():]
+
+    # Skills only named in the outcome move next to the action they were used for
+    skills_clause = ""
+    moved = [skill for skill in mentioned_skills if skill not in action]
+    if moved:
+        skills_clause = f" using {', '.join(moved)}"
+
+    return f"{action.rstrip(', ')}{skills_clause}, {RESULT_CONNECTORS[structure_type]} {result.strip()}"
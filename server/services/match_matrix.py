@@ -0,0 +1,244 @@
+from itertools import chain, repeat
+from typing import Any, Dict, List, Tuple, Union
+import os
+import re
+
+from services.relevance import STOPWORDS
+from services.resume_parser import SKILLS_DATABASE
+
+# Share of the match score from taxonomy skills; the rest comes from TF-IDF term similarity
+MATCH_SKILL_WEIGHT = float(os.getenv("MATCH_SKILL_WEIGHT", "0.6"))
+# Largest resumes x JDs matrix one request may ask for
+MATCH_MATRIX_MAX_CELLS = int(os.getenv("MATCH_MATRIX_MAX_CELLS", "1000000"))
+
+# Same token shape as services.relevance, but case is kept for short skill names
+RAW_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9+#]*(?:\.[A-Za-z0-9]+)*')
+# Short names like "Go", "R" or "Less" are common words; only match them as written (as jd_digest does)
+CASE_SENSITIVE_MAX_CHARS = 4
+
+
+def _build_skill_index():
+    names, categories = [], []
+    single, exact, phrases = {}, {}, {}
+    for category, skills in SKILLS_DATABASE.items():
+        for skill in skills:
+            if skill in names:
+                continue
+            index = len(names)
+            names.append(skill)
+            categories.append(category.replace('_', ' ').title())
+            tokens = RAW_TOKEN_PATTERN.findall(skill)
+            if len(tokens) == 1 and len(skill) <= CASE_SENSITIVE_MAX_CHARS:
+                exact[tokens[0]] = index
+            elif len(tokens) == 1:
+                single[tokens[0].lower()] = index
+            elif tokens:
+                phrases.setdefault(tokens[0].lower(), []).append((" ".join(tokens).lower(), index))
+    return names, categories, single, exact, phrases
+
+
+SKILL_NAMES, SKILL_CATEGORIES, _SINGLE_SKILLS, _EXACT_SKILLS, _PHRASE_SKILLS = _build_skill_index()
+# Literal-first patterns are found with a fast substring scan; the character before is checked separately
+_EXACT_SKILL_PATTERNS = {
+    name.lower(): (index, re.compile(re.escape(name) + r'(?![\w+#])'))
+    for name, index in _EXACT_SKILLS.items()
+}
+
+
+def _is_token_char(char):
+    return char.isalnum() or char in "_+#."
+
+
+def analyze_text(text: str) -> Tuple[List[str], set]:
+    """
+    Tokenize once for both vectors
+
+    Returns:
+        Tuple: (lowercased tokens, indices into SKILL_NAMES found in the text)
+    """
+    text = text or ""
+    lowered = RAW_TOKEN_PATTERN.findall(text.lower())
+    distinct = set(lowered)
+    # Set and substring operations keep the per-token work in C
+    skills = {_SINGLE_SKILLS[token] for token in distinct & _SINGLE_SKILLS.keys()}
+    # Short names only count as written; check the few whose lowercase form appears
+    for token in distinct & _EXACT_SKILL_PATTERNS.keys():
+        index, pattern = _EXACT_SKILL_PATTERNS[token]
+        if any(match.start() == 0 or not _is_token_char(text[match.start() - 1]) for match in pattern.finditer(text)):
+            skills.add(index)
+    first_words = distinct & _PHRASE_SKILLS.keys()
+    if first_words:
+        # Multi-word skills ("Spring Boot", "Ruby on Rails") are only looked for where their first word appears
+        joined = f" {' '.join(lowered)} "
+        for word in first_words:
+            skills.update(index for phrase, index in _PHRASE_SKILLS[word] if f" {phrase} " in joined)
+    return lowered, skills
+
+
+def resume_text(resume: Union[str, Dict[str, Any]]) -> str:
+    """Flatten a parsed resume (as returned by /api/upload_resume) into plain text"""
+    if isinstance(resume, str):
+        return resume
+    parts = [resume.get("summary", "")]
+    for category in resume.get("skills", []):
+        parts.extend(skill.get("skill", "") for skill in category.get("skills", []))
+    for exp in resume.get("experience", []):
+        parts.append(exp.get("title", ""))
+        parts.extend(exp.get("bullets", []))
+    for project in resume.get("projects", []):
+        parts.append(project.get("name", ""))
+        parts.append(project.get("description", ""))
+        parts.extend(project.get("tech_stack", []))
+        parts.extend(project.get("bullets", []))
+    for edu in resume.get("education", []):
+        parts.append(edu.get("text", ""))
+    return "\n".join(part for part in parts if isinstance(part, str) and part)
+
+
+def score_matrix(resume_texts: List[str], jd_texts: List[str], skill_weight: float = MATCH_SKILL_WEIGHT):
+    """
+    Score every resume against every job description
+
+    The term part is cosine similarity of log-TF-IDF vectors over the JDs' vocabulary (resume
+    words no JD uses can't raise any score); the skill part is the share of each JD's taxonomy
+    skills the resume mentions. Both are dense NumPy matrices multiplied once.
+
+    Args:
+        resume_texts (List[str]): N resumes as plain text
+        jd_texts (List[str]): M job descriptions
+        skill_weight (float): Weight of the skill part, 0 to 1
+
+    Returns:
+        Tuple: (scores N x M, skill scores N x M, term scores N x M,
+                resume skills N x S, JD skills M x S), all NumPy arrays
+    """
+    # Imported here so app start-up doesn't pay for NumPy
+    import numpy as np
+
+    resumes = [analyze_text(text) for text in resume_texts]
+    jds = [analyze_text(text) for text in jd_texts]
+    n_resumes, n_jds, n_skills = len(resumes), len(jds), len(SKILL_NAMES)
+
+    # Stopwords never enter the vocabulary, so they drop out of both sides
+    vocabulary = {}
+    for tokens, _ in jds:
+        for term in set(tokens) - STOPWORDS:
+            vocabulary.setdefault(term, len(vocabulary))
+    n_terms = max(len(vocabulary), 1)
+
+    def term_counts(documents):
+        lengths = [len(tokens) for tokens, _ in documents]
+        all_tokens = chain.from_iterable(tokens for tokens, _ in documents)
+        columns = np.fromiter(map(vocabulary.get, all_tokens, repeat(-1)), dtype=np.intp, count=sum(lengths))
+        rows = np.repeat(np.arange(len(documents), dtype=np.intp), lengths)
+        known = columns >= 0
+        flat = np.bincount(rows[known] * n_terms + columns[known], minlength=len(documents) * n_terms)
+        return flat.reshape(len(documents), n_terms).astype(np.float32)
+
+    def skill_matrix(documents):
+        rows = [row for row, (_, skills) in enumerate(documents) for _ in skills]
+        cols = [skill for _, skills in documents for skill in skills]
+        matrix = np.zeros((len(documents), n_skills), dtype=np.float32)
+        matrix[np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)] = 1.0
+        return matrix
+
+    resume_counts = term_counts(resumes)
+    jd_counts = term_counts(jds)
+    document_frequency = np.count_nonzero(resume_counts, axis=0) + np.count_nonzero(jd_counts, axis=0)
+    idf = np.log((n_resumes + n_jds + 1) / (document_frequency + 1)).astype(np.float32) + 1.0
+
+    def normalized(counts):
+        weights = np.log1p(counts) * idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        return weights / np.maximum(norms, 1e-9)
+
+    term_scores = normalized(resume_counts) @ normalized(jd_counts).T
+
+    resume_skills = skill_matrix(resumes)
+    jd_skills = skill_matrix(jds)
+    jd_skill_counts = jd_skills.sum(axis=1)
+    skill_scores = (resume_skills @ jd_skills.T) / np.maximum(jd_skill_counts, 1.0)
+
+    # JDs that name no taxonomy skill are scored on terms alone
+    weights = np.where(jd_skill_counts > 0, skill_weight, 0.0).astype(np.float32)
+    scores = weights * skill_scores + (1.0 - weights) * term_scores
+    return scores, skill_scores, term_scores, resume_skills, jd_skills
+
+
+def top_matches(resume_texts: List[str], jd_texts: List[str], top_k: int = 5,
+                include_matrix: bool = False) -> Dict[str, Any]:
+    """
+    Best job descriptions for every resume, with matched and missing skills
+
+    Args:
+        resume_texts (List[str]): N resumes as plain text
+        jd_texts (List[str]): M job descriptions
+        top_k (int): Matches returned per resume
+        include_matrix (bool): Also return the full N x M score matrix
+
+    Returns:
+        Dict: "matches" (one list per resume, best first), "common_gaps" (skills most often
+            missing from top matches) and optionally "matrix"
+    """
+    import numpy as np
+
+    scores, skill_scores, term_scores, resume_skills, jd_skills = score_matrix(resume_texts, jd_texts)
+    n_resumes, n_jds = scores.shape
+    top_k = max(1, min(top_k, n_jds))
+
+    # argpartition finds each row's top k in linear time; only those k get sorted
+    if top_k < n_jds:
+        candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    else:
+        candidates = np.tile(np.arange(n_jds), (n_resumes, 1))
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    best = np.take_along_axis(candidates, order, axis=1)
+
+    # Skill overlap of every (resume, top match) pair at once: N x k x S
+    wanted = jd_skills[best] > 0
+    has_skill = (resume_skills > 0)[:, None, :]
+    missing = wanted & ~has_skill
+    gap_counts = missing.sum(axis=(0, 1))
+    matched_names = _names_per_pair(wanted & has_skill)
+    missing_names = _names_per_pair(missing)
+
+    best_scores = np.round(np.take_along_axis(scores, best, axis=1).astype(float), 4).tolist()
+    best_skill_scores = np.round(np.take_along_axis(skill_scores, best, axis=1).astype(float), 4).tolist()
+    best_term_scores = np.round(np.take_along_axis(term_scores, best, axis=1).astype(float), 4).tolist()
+    matches = []
+    for row, columns in enumerate(best.tolist()):
+        matches.append([
+            {
+                "jd_index": col,
+                "score": best_scores[row][rank],
+                "skill_score": best_skill_scores[row][rank],
+                "term_score": best_term_scores[row][rank],
+                "matched_skills": matched_names[row * top_k + rank],
+                "missing_skills": missing_names[row * top_k + rank]
+            }
+            for rank, col in enumerate(columns)
+        ])
+
+    common = np.argsort(-gap_counts, kind="stable")[:10]
+    result = {
+        "matches": matches,
+        "common_gaps": [
+            {"skill": SKILL_NAMES[i], "category": SKILL_CATEGORIES[i], "missing_in_matches": int(gap_counts[i])}
+            for i in common if gap_counts[i] > 0
+        ]
+    }
+    if include_matrix:
+        result["matrix"] = np.round(scores.astype(float), 4).tolist()
+    return result
+
+
+def _names_per_pair(mask):
+    """Skill names set in each N x k x S mask row, flattened to one list per (resume, match) pair"""
+    import numpy as np
+
+    pairs = mask.reshape(-1, mask.shape[-1])
+    pair_index, skill_index = np.nonzero(pairs)
+    names = [[] for _ in range(pairs.shape[0])]
+    for pair, skill in zip(pair_index.tolist(), skill_index.tolist()):
+        names[pair].append(SKILL_NAMES[skill])
+    return names
@@ -0,0 +1,238 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import math
+import time
+
+from flask import g, request
+
+# Seconds; spans single-bullet calls through minute-long resume rewrites
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    """Base for metrics: a value per label combination, guarded by one short-lived lock"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[tuple, float]]] = None):
+        """
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            label_names (Iterable[str]): Label names, in order
+            collect (Callable): Optional function returning {label values tuple: value}, read at scrape
+                time; for state that already lives elsewhere (queues, caches) and shouldn't be mirrored
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._collect = collect
+        self._lock = Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        if self._collect is not None:
+            try:
+                items = list(self._collect().items())
+            except Exception:
+                return []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [(self.name, dict(zip(self.label_names, key)), value) for key, value in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+
+        samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                samples.append((f"{self.name}_bucket", dict(labels, le=le), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Metrics shared by every blueprint, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "jobpal_http_request_duration_seconds", "Request latency by route", ["route", "method", "status"]
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "jobpal_http_requests_in_flight", "Requests currently being handled"
+))
+LLM_REQUEST_SECONDS = registry.register(Histogram(
+    "jobpal_llm_request_duration_seconds", "Upstream LLM call latency", ["provider", "model"]
+))
+LLM_ERRORS = registry.register(Counter(
+    "jobpal_llm_errors_total", "Failed upstream LLM calls", ["provider", "model", "error"]
+))
+LLM_TOKENS = registry.register(Counter(
+    "jobpal_llm_tokens_total", "Prompt and response tokens", ["provider", "model", "kind"]
+))
+PARSE_SECONDS = registry.register(Histogram(
+    "jobpal_parse_duration_seconds", "Time spent parsing resumes and LLM responses",
+    ["parser", "format"], buckets=PARSE_BUCKETS
+))
+
+
+def observe_llm_call(provider: str, model: str, seconds: float, prompt_tokens: Optional[int] = None,
+                     response_tokens: Optional[int] = None) -> None:
+    """Record one successful upstream call"""
+    LLM_REQUEST_SECONDS.observe(seconds, provider=provider, model=model)
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, model=model, kind="prompt")
+    if response_tokens:
+        LLM_TOKENS.inc(response_tokens, provider=provider, model=model, kind="response")
+
+
+def observe_llm_error(provider: str, model: str, error: Exception) -> None:
+    LLM_ERRORS.inc(provider=provider, model=model, error=type(error).__name__)
+
+
+def observe_parse(parser: str, format: str, seconds: float) -> None:
+    PARSE_SECONDS.observe(seconds, parser=parser, format=format)
+
+
+# LRU caches exposed on /metrics; their own counters are read at scrape time
+_caches = {}
+
+def _collect_cache_stat(field):
+    return lambda: {(name,): cache.stats()[field] for name, cache in list(_caches.items())}
+
+registry.register(Counter("jobpal_cache_hits_total", "Cache hits", ["cache"], collect=_collect_cache_stat("hits")))
+registry.register(Counter("jobpal_cache_misses_total", "Cache misses", ["cache"], collect=_collect_cache_stat("misses")))
+registry.register(Gauge("jobpal_cache_hit_ratio", "Cache hit ratio since start", ["cache"],
+                        collect=_collect_cache_stat("hit_ratio")))
+registry.register(Gauge("jobpal_cache_entries", "Entries currently cached", ["cache"],
+                        collect=_collect_cache_stat("size")))
+
+def register_cache(name: str, cache) -> None:
+    """Expose an LRUCache's hit/miss counters, hit ratio and size"""
+    _caches[name] = cache
+
+
+def init_metrics(app) -> None:
+    """Time every request and count the ones in flight"""
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started_at = time.perf_counter()
+        g.metrics_in_flight = True
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def _observe_request(response):
+        started_at = g.get("metrics_started_at")
+        if started_at is not None:
+            # The URL rule keeps label cardinality bounded (/api/jobs/<job_id>, not every ID)
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started_at, route=route, method=request.method,
+                                         status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def _finish_request(exc):
+        if g.pop("metrics_in_flight", False):
+            HTTP_REQUESTS_IN_FLIGHT.dec()
@@ -0,0 +1,91 @@
+from typing import List, Tuple
+import os
+import re
+import zlib
+
+# Texts at least this similar (Jaccard over character shingles) are rewritten once; 1 collapses only exact repeats
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.7"))
+SHINGLE_CHARS = 5
+# 16 bands of 4 rows: pairs at the threshold share a band ~99% of the time, pairs below 0.3 rarely do
+LSH_BANDS = 16
+LSH_ROWS = 4
+
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+
+
+def _shingles(text: str) -> set:
+    normalized = _NON_WORD.sub(' ', text.lower()).strip()
+    if len(normalized) <= SHINGLE_CHARS:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_CHARS] for i in range(len(normalized) - SHINGLE_CHARS + 1)}
+
+
+def _minhash_signatures(shingle_sets: List[set]):
+    """One row of LSH_BANDS * LSH_ROWS min-hashes per text, all computed in NumPy"""
+    # Imported here so app start-up doesn't pay for NumPy
+    import numpy as np
+
+    # Fixed seed: the same text always gets the same signature
+    rng = np.random.default_rng(0x5EED)
+    permutations = LSH_BANDS * LSH_ROWS
+    # Multiply-shift hashing: (a * x + b) wraps at 64 bits and the top 32 bits are the hash, no modulo needed
+    a = rng.integers(0, 1 << 63, size=(permutations, 1), dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=(permutations, 1), dtype=np.uint64)
+
+    signatures = np.full((len(shingle_sets), permutations), 1 << 32, dtype=np.uint64)
+    sizes = np.array([len(shingles) for shingles in shingle_sets])
+    filled = np.flatnonzero(sizes)
+    if not len(filled):
+        return signatures
+    # Every text's shingles hashed and permuted in one pass, then reduced per text
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingles in shingle_sets for shingle in shingles),
+                         dtype=np.uint64, count=int(sizes.sum()))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))[filled]
+    signatures[filled] = np.minimum.reduceat((a * hashes + b) >> np.uint64(32), starts, axis=1).T
+    return signatures
+
+
+def collapse_near_duplicates(texts: List[str], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> Tuple[List[int], List[int]]:
+    """
+    Group texts that say nearly the same thing, so each group is sent to the LLM once
+
+    MinHash signatures are bucketed by band (LSH) to find candidate pairs without comparing every
+    pair; candidates are then confirmed with their exact Jaccard similarity. Each text joins the
+    first earlier representative it matches, so groups never chain through intermediate texts.
+
+    Args:
+        texts (List[str]): Bullets in resume order
+        threshold (float): Minimum Jaccard similarity to count as a duplicate
+
+    Returns:
+        Tuple: (positions of the representative of each group, in order;
+                group number of every text, indexing the first list)
+    """
+    if len(texts) < 2 or threshold > 1:
+        return list(range(len(texts))), list(range(len(texts)))
+
+    shingle_sets = [_shingles(text or "") for text in texts]
+    signatures = _minhash_signatures(shingle_sets)
+
+    representatives, groups = [], []
+    buckets = {}
+    for position, shingles in enumerate(shingle_sets):
+        bands = [(band, signatures[position, band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+                 for band in range(LSH_BANDS)]
+        candidates = sorted({group for key in bands for group in buckets.get(key, ())})
+
+        match = None
+        for group in candidates:
+            other = shingle_sets[representatives[group]]
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= threshold:
+                match = group
+                break
+        # Texts with no shingles (empty or punctuation only) are never merged
+        if match is None or not shingles:
+            match = len(representatives)
+            representatives.append(position)
+            for key in bands:
+                buckets.setdefault(key, []).append(match)
+        groups.append(match)
+    return representatives, groups
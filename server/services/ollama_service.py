@@ -0,0 +1,179 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import time
+
+import requests
+
+from services.cache import LRUCache
+from services.metrics import observe_llm_call, observe_llm_error, register_cache
+from services.deadline import Deadline, current_deadline
+from services.llm_scheduler import current_priority, get_llm_scheduler
+from services.ollama_warmup import OLLAMA_KEEP_ALIVE
+from services.resilience import CircuitOpenError, get_fallback_provider, get_provider_guard
+from services.stage_timing import stage_timer
+
+# Evaluated prompt prefixes keyed by (model, prefix hash); each value is Ollama's context array
+ollama_context_cache = LRUCache(max_size=int(os.getenv("OLLAMA_CONTEXT_CACHE_SIZE", "256")))
+register_cache("ollama_context", ollama_context_cache)
+OLLAMA_CONTEXT_REUSE = os.getenv("OLLAMA_CONTEXT_REUSE", "1") != "0"
+PREFIX_LOCK_STRIPES = 16
+
+
+class OllamaService:
+    def __init__(self):
+        """Initialize the Ollama client from environment configuration"""
+        self.base_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+        self.guard = get_provider_guard("ollama")
+        self.scheduler = get_llm_scheduler("ollama")
+        # Pooled connections avoid a TCP handshake per bullet chunk
+        self.session = requests.Session()
+        # Striped locks so concurrent chunks sharing a prefix evaluate it once
+        self._prefix_locks = [Lock() for _ in range(PREFIX_LOCK_STRIPES)]
+
+    def generate(self, prompt: str, model: str = "phi3:mini", options: Optional[Dict[str, Any]] = None,
+                 timeout: float = 30, stream: bool = False, deadline: Optional[Deadline] = None,
+                 prefix: Optional[str] = None, format: Optional[str] = None,
+                 priority: Optional[str] = None, fallback: bool = True) -> str:
+        """
+        Generate a completion with Ollama's /api/generate endpoint
+
+        Args:
+            prompt (str): The input prompt
+            model (str): Ollama model name
+            options (Dict): Ollama generation options (temperature, top_p, num_predict, ...)
+            timeout (float): Per-attempt request timeout in seconds, capped by the deadline
+            stream (bool): Read the response as a stream of JSON lines
+            deadline (Deadline): Request deadline; defaults to the current request's deadline
+            prefix (str): Shared leading prompt text (instructions and JD). It is evaluated once
+                per model and the prompt runs as a continuation of the cached context
+            format (str): Ollama output format; "json" constrains the answer to valid JSON
+            priority (str): Scheduling class ('interactive', 'bulk'); defaults to the current request's
+            fallback (bool): Switch to LLM_FALLBACK_PROVIDER when the circuit is open; the router
+                passes False because it does its own spillover
+
+        Returns:
+            str: Generated text
+
+        Raises:
+            CircuitOpenError: If Ollama is failing and no fallback provider is configured
+            DeadlineExceeded: If the request deadline leaves no time for the call
+            requests.exceptions.RequestException: If the request fails after retries
+        """
+        # keep_alive stops Ollama from unloading the model between requests
+        payload = {"model": model, "prompt": prompt, "stream": stream, "keep_alive": OLLAMA_KEEP_ALIVE}
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        if deadline is None:
+            deadline = current_deadline()
+        full_prompt = f"{prefix}\n\n{prompt}" if prefix else prompt
+        # Resolved here: chunk worker threads have no request to read it from
+        priority = priority or current_priority()
+
+        def attempt():
+            # Queue behind higher-priority work; the slot is held only for the HTTP call, not retry backoff
+            with self.scheduler.slot(priority, deadline):
+                # Each retry only gets what is left of the request's budget
+                attempt_timeout = deadline.timeout(timeout) if deadline else timeout
+                context = None
+                if prefix and OLLAMA_CONTEXT_REUSE:
+                    context = self._prefix_context(prefix, model, attempt_timeout)
+                if context:
+                    result = self._post_generate(dict(payload, context=context), attempt_timeout, stream)
+                else:
+                    result = self._post_generate(dict(payload, prompt=full_prompt), attempt_timeout, stream)
+                return result.get("response", "").strip()
+
+        try:
+            return self.guard.call(attempt, deadline)
+        except CircuitOpenError:
+            if not fallback or get_fallback_provider("ollama") != "gemini":
+                raise
+            logging.warning("Ollama circuit open, falling back to Gemini")
+            from services.gemini_service import get_gemini_service
+            options = options or {}
+            return get_gemini_service().generate_response(
+                full_prompt,
+                temperature=options.get("temperature", 0.7),
+                max_tokens=options.get("num_predict", 1024),
+                deadline=deadline
+            )
+
+    def _prefix_context(self, prefix: str, model: str, timeout: float) -> Optional[List[int]]:
+        """
+        Ollama context for a prompt prefix, evaluating the prefix on first use
+
+        Returns:
+            List[int]: Context to continue from, or None if Ollama didn't return one
+        """
+        key = (model, hashlib.sha256(prefix.encode('utf-8')).hexdigest())
+        context = ollama_context_cache.get(key)
+        if context is not None:
+            return context
+
+        with self._prefix_locks[hash(key) % PREFIX_LOCK_STRIPES]:
+            context = ollama_context_cache.get(key)
+            if context is not None:
+                return context
+            # num_predict 0: we only want the evaluated prompt, not an answer to it
+            result = self._post_generate(
+                {"model": model, "prompt": prefix, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE,
+                 "options": {"num_predict": 0}},
+                timeout, stream=False
+            )
+            context = result.get("context")
+            # The context ends with whatever was generated; any such token would start every reused prompt
+            generated = result.get("eval_count") or 0
+            if context and generated:
+                context = context[:-generated] if generated < len(context) else None
+            if context:
+                ollama_context_cache.set(key, context)
+            return context
+
+    def _post_generate(self, payload: Dict[str, Any], timeout: float, stream: bool) -> Dict[str, Any]:
+        """POST to /api/generate and return the final response object with the full "response" text"""
+        model = payload["model"]
+        started = time.perf_counter()
+        with stage_timer("llm"):
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    stream=stream,
+                    timeout=timeout
+                )
+                response.raise_for_status()
+
+                if not stream:
+                    result = response.json()
+                else:
+                    # The last streamed object carries the token counts and context
+                    text = ""
+                    result = {}
+                    for line in response.iter_lines():
+                        if line:
+                            result = json.loads(line.decode('utf-8'))
+                            text += result.get("response", "")
+                    result["response"] = text
+            except Exception as e:
+                observe_llm_error("ollama", model, e)
+                raise
+
+        observe_llm_call("ollama", model, time.perf_counter() - started,
+                         result.get("prompt_eval_count"), result.get("eval_count"))
+        return result
+
+# Global instance for reuse
+ollama_service = None
+
+def get_ollama_service() -> OllamaService:
+    """Get or create an Ollama service instance"""
+    global ollama_service
+    if ollama_service is None:
+        ollama_service = OllamaService()
+    return ollama_service
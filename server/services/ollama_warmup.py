@@ -0,0 +1,155 @@
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List
+import logging
+import os
+import time
+
+import requests
+
+# Models every route uses; loading them before the first request hides Ollama's cold start
+DEFAULT_WARM_MODELS = "phi3:mini,mistral"
+
+# How long Ollama keeps a model resident after a request, sent with every call
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+
+class OllamaWarmupManager:
+    """Background thread that preloads Ollama models and keeps them resident"""
+
+    def __init__(self, base_url: str, models: List[str], keep_alive: str = OLLAMA_KEEP_ALIVE,
+                 interval_seconds: float = 240.0, load_timeout: float = 120.0):
+        """
+        Args:
+            base_url (str): Ollama server URL
+            models (List[str]): Models to preload and keep warm
+            keep_alive (str): Ollama keep_alive duration requested on each ping
+            interval_seconds (float): Seconds between checks; should be well under keep_alive
+            load_timeout (float): Timeout for a ping that has to load a model from disk
+        """
+        self.base_url = base_url.rstrip("/")
+        self.models = models
+        self.keep_alive = keep_alive
+        self.interval_seconds = interval_seconds
+        self.load_timeout = load_timeout
+        self._status = {
+            model: {"loaded": False, "last_warmed": None, "load_seconds": None, "error": None}
+            for model in models
+        }
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        # Passes over every model finished so far; the first one decides whether warm-up is done
+        self._rounds = 0
+
+    def start(self) -> None:
+        """Start the warm-up thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="ollama-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def is_loaded(self, model: str) -> bool:
+        with self._lock:
+            return bool(self._status.get(model, {}).get("loaded"))
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Loaded state of each managed model, for the health endpoint
+
+        "state" is "disabled" if warm-up never started, "warming_up" until the first pass over
+        the models finishes, then "ready" if every model loaded or "degraded" if any failed
+        (a model that isn't installed, say); "errors" has the last error per failed model.
+        """
+        with self._lock:
+            models = {model: dict(state) for model, state in self._status.items()}
+            rounds = self._rounds
+        errors = {model: state["error"] for model, state in models.items() if state["error"]}
+        if self._thread is None:
+            state = "disabled"
+        elif rounds == 0:
+            state = "warming_up"
+        else:
+            state = "degraded" if errors or not all(model["loaded"] for model in models.values()) else "ready"
+        return {
+            "state": state,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "keep_alive": self.keep_alive,
+            "models": models,
+            "errors": errors
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            loaded = self._fetch_loaded_models()
+            for model in self.models:
+                if self._stop.is_set():
+                    break
+                # Ping everything each round: a ping also refreshes keep_alive for resident models
+                name = model if ":" in model else f"{model}:latest"
+                self._warm(model, already_loaded=name in loaded or model in loaded)
+            with self._lock:
+                self._rounds += 1
+            self._stop.wait(self.interval_seconds)
+
+    def _fetch_loaded_models(self):
+        """Names of models Ollama currently has in memory (empty if /api/ps is unavailable)"""
+        try:
+            response = requests.get(f"{self.base_url}/api/ps", timeout=5)
+            response.raise_for_status()
+            entries = response.json().get("models", [])
+            return {entry.get("name") for entry in entries} | {entry.get("model") for entry in entries}
+        except Exception:
+            return set()
+
+    def _warm(self, model, already_loaded):
+        started = time.monotonic()
+        try:
+            # An empty prompt makes Ollama load the model and reset its keep_alive without generating
+            response = requests.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model, "prompt": "", "stream": False, "keep_alive": self.keep_alive},
+                timeout=5 if already_loaded else self.load_timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logging.warning(f"Ollama warm-up failed for {model}: {e}")
+            with self._lock:
+                self._status[model].update({"loaded": False, "error": str(e)})
+            return
+
+        elapsed = round(time.monotonic() - started, 3)
+        with self._lock:
+            self._status[model].update({
+                "loaded": True,
+                "last_warmed": time.time(),
+                "load_seconds": None if already_loaded else elapsed,
+                "error": None
+            })
+        if not already_loaded:
+            logging.info(f"Ollama model {model} loaded in {elapsed}s")
+
+
+# Global instance for reuse
+ollama_warmup_manager = None
+
+def get_ollama_warmup_manager() -> OllamaWarmupManager:
+    """Get or create the warm-up manager from environment configuration"""
+    global ollama_warmup_manager
+    if ollama_warmup_manager is None:
+        models = [model.strip() for model in os.getenv("OLLAMA_WARM_MODELS", DEFAULT_WARM_MODELS).split(",")
+                  if model.strip()]
+        ollama_warmup_manager = OllamaWarmupManager(
+            base_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+            models=models,
+            interval_seconds=float(os.getenv("OLLAMA_WARMUP_INTERVAL_SECONDS", "240"))
+        )
+    return ollama_warmup_manager
+
+def start_ollama_warmup() -> None:
+    """Start preloading models unless disabled with OLLAMA_WARMUP=0"""
+    if os.getenv("OLLAMA_WARMUP", "1") != "0":
+        get_ollama_warmup_manager().start()
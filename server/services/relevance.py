@@ -0,0 +1,98 @@
+from typing import List, Optional
+import os
+import re
+
+# Bullets sent to the LLM per resume; the rest are returned unchanged. 0 sends every bullet
+RELEVANCE_TOP_K = int(os.getenv("RELEVANCE_TOP_K", "20"))
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+# Words that match everything in resumes and job postings alike
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to
+was were will with we you your who what which within across over using used use work working
+team teams role experience years year ability strong including etc
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms without stopwords; keeps tech names like c++, c# and node.js intact"""
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+def bm25_scores(documents: List[str], query: str, k1: float = BM25_K1, b: float = BM25_B):
+    """
+    BM25 relevance of each document to the query
+
+    Only query terms can contribute to a score, so the term matrix has one column per
+    distinct query term rather than the whole vocabulary.
+
+    Args:
+        documents (List[str]): Texts to score (resume bullets)
+        query (str): Query text (the job description)
+
+    Returns:
+        numpy.ndarray: One score per document, 0 for documents sharing no term with the query
+    """
+    # Imported here so app start-up doesn't pay for NumPy
+    import numpy as np
+
+    query_terms = {}
+    query_counts = []
+    for token in tokenize(query):
+        if token not in query_terms:
+            query_terms[token] = len(query_terms)
+            query_counts.append(0)
+        query_counts[query_terms[token]] += 1
+
+    doc_tokens = [tokenize(doc) for doc in documents]
+    n_docs = len(documents)
+    if not n_docs or not query_terms:
+        return np.zeros(n_docs)
+
+    doc_lengths = np.array([len(tokens) for tokens in doc_tokens], dtype=float)
+    rows, cols = [], []
+    for row, tokens in enumerate(doc_tokens):
+        for token in tokens:
+            col = query_terms.get(token)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+
+    tf = np.zeros((n_docs, len(query_terms)))
+    np.add.at(tf, (np.array(rows, dtype=int), np.array(cols, dtype=int)), 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    avg_length = doc_lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * doc_lengths / avg_length)
+    # Terms the JD repeats weigh more, with diminishing returns
+    query_weight = np.log1p(np.array(query_counts, dtype=float))
+    saturated = tf * (k1 + 1) / (tf + norm[:, None])
+    return saturated @ (idf * query_weight)
+
+
+def select_relevant(bullets: List[str], job_description: str, top_k: Optional[int] = None) -> List[int]:
+    """
+    Positions of the bullets most relevant to the job description
+
+    Args:
+        bullets (List[str]): Bullets in resume order
+        job_description (str): Target job description
+        top_k (int): Bullets to keep; defaults to RELEVANCE_TOP_K, 0 or less keeps all
+
+    Returns:
+        List[int]: Positions of the kept bullets, in resume order
+    """
+    top_k = RELEVANCE_TOP_K if top_k is None else int(top_k)
+    if top_k <= 0 or len(bullets) <= top_k:
+        return list(range(len(bullets)))
+
+    import numpy as np
+
+    scores = bm25_scores(bullets, job_description)
+    # Stable sort: equally relevant bullets keep resume order
+    ranked = np.argsort(-scores, kind="stable")[:top_k]
+    return sorted(int(position) for position in ranked)
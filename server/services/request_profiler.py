@@ -0,0 +1,104 @@
+from threading import Lock
+import cProfile
+import glob
+import hmac
+import logging
+import os
+import random
+import re
+import time
+
+from flask import g, request
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles")
+
+# Fraction of requests to profile (0.01 = 1 in 100); 0 turns sampling off
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Requests sending this value in the X-Profile header are always profiled; empty turns the header off
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_HEADER = "X-Profile"
+PROFILE_DIR = os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+# Oldest profiles are deleted once the directory holds more than this
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# cProfile can't run two profilers at once, so overlapping requests are skipped rather than queued
+_profiler_lock = Lock()
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+
+def should_profile(req) -> bool:
+    """Profile requests carrying the profiling token, plus a random sample of the rest"""
+    token = req.headers.get(PROFILE_HEADER)
+    if token and PROFILE_TOKEN and hmac.compare_digest(token, PROFILE_TOKEN):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profile_filename(route: str, method: str, duration_ms: float, status: int) -> str:
+    """e.g. 20240501T120000.123_POST_api-upload_resume_1834ms_200.prof, sortable by time"""
+    slug = re.sub(r"[^A-Za-z0-9_]+", "-", route).strip("-") or "root"
+    now = time.time()
+    timestamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+    return f"{timestamp}_{method}_{slug}_{int(duration_ms)}ms_{status}.prof"
+
+
+def _rotate(directory, max_files):
+    profiles = sorted(glob.glob(os.path.join(directory, "*.prof")), key=os.path.getmtime)
+    for path in profiles[:max(0, len(profiles) - max_files)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def init_request_profiler(app) -> None:
+    """
+    Write cProfile stats for sampled requests to PROFILE_DIR
+
+    Registers no hooks unless PROFILE_SAMPLE_RATE or PROFILE_TOKEN is set, so it costs
+    nothing when off. Only the request thread is profiled; time spent in chunk worker
+    threads shows up as waiting on their futures.
+    """
+    if not profiling_enabled():
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    logging.info(f"Request profiling on (sample rate {PROFILE_SAMPLE_RATE}, "
+                 f"header {'on' if PROFILE_TOKEN else 'off'}), writing to {PROFILE_DIR}")
+
+    @app.before_request
+    def _start_profiler():
+        if not should_profile(request) or not _profiler_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        g.profiler = profiler
+        g.profiler_started_at = time.perf_counter()
+        profiler.enable()
+
+    @app.after_request
+    def _record_profile_status(response):
+        if g.get("profiler") is not None:
+            g.profiler_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _write_profile(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        try:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - g.profiler_started_at) * 1000
+            route = request.url_rule.rule if request.url_rule else request.path
+            status = g.get("profiler_status", 500)
+            path = os.path.join(PROFILE_DIR, profile_filename(route, request.method, duration_ms, status))
+            profiler.dump_stats(path)
+            _rotate(PROFILE_DIR, PROFILE_MAX_FILES)
+            logging.info(f"Wrote request profile {path}")
+        except Exception as e:
+            logging.warning(f"Could not write request profile: {e}")
+        finally:
+            _profiler_lock.release()
@@ -0,0 +1,254 @@
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, Optional
+import logging
+import os
+import random
+import time
+
+import requests
+
+from services.deadline import Deadline, DeadlineExceeded
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open and calls fail fast"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} is temporarily unavailable (circuit open), retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class RateLimitedError(Exception):
+    """Raised when the client-side token bucket has no capacity within the wait budget"""
+
+    def __init__(self, provider: str):
+        super().__init__(f"{provider} rate limit reached, try again shortly")
+        self.provider = provider
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outbound calls"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Take one token, waiting up to timeout seconds. Returns False if none became available."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of recent calls
+
+    closed -> open when the failure ratio crosses the threshold, open -> half-open after
+    reset_timeout, half-open -> closed on a successful probe (or back to open on failure).
+    """
+
+    def __init__(self, failure_threshold: float = 0.5, window_size: int = 20,
+                 min_calls: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._results = deque(maxlen=window_size)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Whether a call may proceed right now"""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._current_state() == "half_open":
+                self._state = "closed"
+                self._results.clear()
+            self._probe_in_flight = False
+            self._results.append(True)
+
+    def release(self) -> None:
+        """Record nothing about a call that said nothing about provider health, freeing a half-open probe"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._probe_in_flight = False
+            self._results.append(False)
+            failures = self._results.count(False)
+            if state == "half_open" or (
+                len(self._results) >= self.min_calls
+                and failures / len(self._results) >= self.failure_threshold
+            ):
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def _current_state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+        return self._state
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether an upstream error is worth retrying (timeouts, overload, rate limits)"""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in (429, 500, 502, 503, 504)
+
+    # google.api_core exceptions, matched by module and name so this module doesn't import the Gemini SDK
+    return type(error).__module__.startswith("google.api_core") and type(error).__name__ in (
+        "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+        "DeadlineExceeded", "InternalServerError", "GatewayTimeout"
+    )
+
+
+class ProviderGuard:
+    """Rate limiting, jittered exponential retries and circuit breaking for one LLM provider"""
+
+    def __init__(self, name: str, rate: float, burst: float, max_attempts: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 4.0, max_queue_wait: float = 5.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_queue_wait = max_queue_wait
+
+    def call(self, fn: Callable[[], str], deadline: Optional[Deadline] = None) -> str:
+        """
+        Run fn under the provider's rate limit, retrying retryable errors
+
+        Raises:
+            CircuitOpenError: If the provider is failing and calls should fail fast
+            RateLimitedError: If no rate-limit token became available in time
+            DeadlineExceeded: If the request's deadline leaves no time for another attempt
+            Exception: The last upstream error once retries are exhausted
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            if deadline is not None:
+                deadline.check()
+
+            # Check the breaker before queueing on the bucket so an open circuit fails fast
+            if self.breaker.state == "open":
+                raise CircuitOpenError(self.name, self.breaker.retry_after())
+            queue_wait = self.max_queue_wait if deadline is None else min(self.max_queue_wait, deadline.remaining())
+            if not self.bucket.acquire(timeout=queue_wait):
+                raise RateLimitedError(self.name)
+            if not self.breaker.allow():
+                raise CircuitOpenError(self.name, self.breaker.retry_after())
+
+            try:
+                result = fn()
+            except DeadlineExceeded:
+                # Our own budget ran out (in the scheduler queue or before the call): not the provider's fault
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not is_retryable_error(e):
+                    # Bad requests say nothing about provider health
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts:
+                    raise
+
+                # Full jitter keeps concurrent retries from hitting the provider in lockstep
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+                if deadline is not None and delay >= deadline.remaining():
+                    raise
+                logging.warning(f"{self.name} call failed ({e}), retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def status(self) -> Dict[str, object]:
+        return {"provider": self.name, "circuit": self.breaker.state}
+
+
+_guards = {}
+_guards_lock = Lock()
+
+# Per-provider defaults, overridable with <PROVIDER>_RATE_PER_SEC / <PROVIDER>_BURST env vars
+_GUARD_DEFAULTS = {
+    "ollama": {"rate": 4.0, "burst": 8.0},
+    "gemini": {"rate": 5.0, "burst": 10.0},
+}
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """Get or create the shared guard for a provider"""
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            defaults = _GUARD_DEFAULTS.get(name, {"rate": 5.0, "burst": 10.0})
+            prefix = name.upper()
+            guard = ProviderGuard(
+                name,
+                rate=float(os.getenv(f"{prefix}_RATE_PER_SEC", defaults["rate"])),
+                burst=float(os.getenv(f"{prefix}_BURST", defaults["burst"])),
+                max_attempts=int(os.getenv(f"{prefix}_MAX_ATTEMPTS", "3")),
+                breaker=CircuitBreaker(
+                    failure_threshold=float(os.getenv(f"{prefix}_BREAKER_THRESHOLD", "0.5")),
+                    reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET_SECONDS", "30"))
+                )
+            )
+            _guards[name] = guard
+        return guard
+
+
+def get_fallback_provider(name: str) -> Optional[str]:
+    """Provider to switch to when name is unavailable, configured with LLM_FALLBACK_PROVIDER"""
+    fallback = os.getenv("LLM_FALLBACK_PROVIDER", "").strip().lower()
+    if not fallback or fallback == name:
+        return None
+    if fallback == "gemini" and not os.getenv("GOOGLE_API_KEY"):
+        return None
+    return fallback
@@ -0,0 +1,57 @@
+from typing import Any, Dict, List
+
+# Value of "response_mode" in a request body that asks for only the changed bullets
+DELTA_RESPONSE_MODE = "delta"
+
+
+def wants_delta(data: Dict[str, Any]) -> bool:
+    return str(data.get("response_mode", "")).lower() == DELTA_RESPONSE_MODE
+
+
+def bullet_paths(resume_data: Dict[str, Any]) -> List[str]:
+    """
+    Location of every bullet in the resume, in the order the bulk routes extract them
+
+    Returns:
+        List[str]: Dotted paths such as "experience.0.bullets.2" or "skills.1.skills.0.context"
+    """
+    paths = []
+    for entry_index, exp in enumerate(resume_data.get("experience", [])):
+        paths.extend(f"experience.{entry_index}.bullets.{i}" for i in range(len(exp.get("bullets", []))))
+    for entry_index, project in enumerate(resume_data.get("projects", [])):
+        paths.extend(f"projects.{entry_index}.bullets.{i}" for i in range(len(project.get("bullets", []))))
+    for category_index, skill_category in enumerate(resume_data.get("skills", [])):
+        for skill_index, skill in enumerate(skill_category.get("skills", [])):
+            if skill.get("context"):
+                paths.append(f"skills.{category_index}.skills.{skill_index}.context")
+    for entry_index, edu in enumerate(resume_data.get("education", [])):
+        if edu.get("text"):
+            paths.append(f"education.{entry_index}.text")
+    return paths
+
+
+def resume_delta(original_bullets: List[str], improved_bullets: List[str],
+                 resume_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Only the bullets the rewrite changed
+
+    Args:
+        original_bullets (List[str]): Bullets as extracted from resume_data
+        improved_bullets (List[str]): Rewrites, one per original bullet
+        resume_data (Dict): The resume the bullets came from
+
+    Returns:
+        List[Dict]: {"path", "position", "improved"} per changed bullet. "path" locates the
+            bullet in resume_data and is the key to apply changes by; "position" is its index
+            among the extracted bullets
+    """
+    paths = bullet_paths(resume_data)
+    changes = []
+    for position, (original, improved) in enumerate(zip(original_bullets, improved_bullets)):
+        if improved and improved.strip() != (original or "").strip():
+            changes.append({
+                "path": paths[position] if position < len(paths) else None,
+                "position": position,
+                "improved": improved
+            })
+    return changes
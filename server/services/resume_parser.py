@@ -1,58 +1,61 @@
 # Resume parsing logic will go here
-import pdfplumber
 import json
 import re
 import os
+import time
 from typing import Dict, List, Any, Optional
+from services.metrics import observe_parse
+
+# Comprehensive skills database with categories
+SKILLS_DATABASE = {
+    "programming_languages": [
+        "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin",
+        "PHP", "Ruby", "Scala", "R", "MATLAB", "Julia", "Dart", "Elixir", "Clojure", "Haskell"
+    ],
+    "web_technologies": [
+        "HTML", "CSS", "Sass", "Less", "React", "Vue.js", "Angular", "Node.js", "Express.js",
+        "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET", "Laravel", "Ruby on Rails",
+        "GraphQL", "REST API", "WebSocket", "JWT", "OAuth", "Redux", "MobX", "Next.js", "Nuxt.js"
+    ],
+    "databases": [
+        "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra", "DynamoDB",
+        "SQLite", "Oracle", "SQL Server", "MariaDB", "Neo4j", "InfluxDB", "CouchDB"
+    ],
+    "cloud_platforms": [
+        "AWS", "Azure", "Google Cloud", "DigitalOcean", "Heroku", "Vercel", "Netlify",
+        "Firebase", "Supabase", "Cloudflare", "Linode", "Vultr"
+    ],
+    "devops_tools": [
+        "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions", "CircleCI",
+        "Terraform", "Ansible", "Chef", "Puppet", "Prometheus", "Grafana", "ELK Stack",
+        "Istio", "Helm", "ArgoCD", "Spinnaker"
+    ],
+    "data_science": [
+        "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "Jupyter",
+        "Matplotlib", "Seaborn", "Plotly", "Tableau", "Power BI", "Apache Spark", "Hadoop",
+        "Dask", "Vaex", "Streamlit", "Gradio"
+    ],
+    "mobile_development": [
+        "React Native", "Flutter", "Xamarin", "Ionic", "Cordova", "PhoneGap",
+        "Android Studio", "Xcode", "Kotlin Multiplatform", "SwiftUI", "Jetpack Compose"
+    ],
+    "ai_ml_tools": [
+        "OpenAI API", "Hugging Face", "LangChain", "LlamaIndex", "Ollama", "Claude API",
+        "Anthropic", "Cohere", "Replicate", "Gradio", "Streamlit", "MLflow", "Weights & Biases"
+    ],
+    "testing_frameworks": [
+        "Jest", "Mocha", "Chai", "Cypress", "Selenium", "Playwright", "Puppeteer",
+        "JUnit", "TestNG", "PyTest", "Robot Framework", "Cucumber", "SpecFlow"
+    ],
+    "version_control": [
+        "Git", "GitHub", "GitLab", "Bitbucket", "SVN", "Mercurial", "GitHub Desktop",
+        "SourceTree", "GitKraken", "VS Code Git"
+    ]
+}
 
 class ResumeParser:
     def __init__(self):
-        # Comprehensive skills database with categories
-        self.skills_database = {
-            "programming_languages": [
-                "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin",
-                "PHP", "Ruby", "Scala", "R", "MATLAB", "Julia", "Dart", "Elixir", "Clojure", "Haskell"
-            ],
-            "web_technologies": [
-                "HTML", "CSS", "Sass", "Less", "React", "Vue.js", "Angular", "Node.js", "Express.js",
-                "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET", "Laravel", "Ruby on Rails",
-                "GraphQL", "REST API", "WebSocket", "JWT", "OAuth", "Redux", "MobX", "Next.js", "Nuxt.js"
-            ],
-            "databases": [
-                "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra", "DynamoDB",
-                "SQLite", "Oracle", "SQL Server", "MariaDB", "Neo4j", "InfluxDB", "CouchDB"
-            ],
-            "cloud_platforms": [
-                "AWS", "Azure", "Google Cloud", "DigitalOcean", "Heroku", "Vercel", "Netlify",
-                "Firebase", "Supabase", "Cloudflare", "Linode", "Vultr"
-            ],
-            "devops_tools": [
-                "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions", "CircleCI",
-                "Terraform", "Ansible", "Chef", "Puppet", "Prometheus", "Grafana", "ELK Stack",
-                "Istio", "Helm", "ArgoCD", "Spinnaker"
-            ],
-            "data_science": [
-                "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "Jupyter",
-                "Matplotlib", "Seaborn", "Plotly", "Tableau", "Power BI", "Apache Spark", "Hadoop",
-                "Dask", "Vaex", "Streamlit", "Gradio"
-            ],
-            "mobile_development": [
-                "React Native", "Flutter", "Xamarin", "Ionic", "Cordova", "PhoneGap",
-                "Android Studio", "Xcode", "Kotlin Multiplatform", "SwiftUI", "Jetpack Compose"
-            ],
-            "ai_ml_tools": [
-                "OpenAI API", "Hugging Face", "LangChain", "LlamaIndex", "Ollama", "Claude API",
-                "Anthropic", "Cohere", "Replicate", "Gradio", "Streamlit", "MLflow", "Weights & Biases"
-            ],
-            "testing_frameworks": [
-                "Jest", "Mocha", "Chai", "Cypress", "Selenium", "Playwright", "Puppeteer",
-                "JUnit", "TestNG", "PyTest", "Robot Framework", "Cucumber", "SpecFlow"
-            ],
-            "version_control": [
-                "Git", "GitHub", "GitLab", "Bitbucket", "SVN", "Mercurial", "GitHub Desktop",
-                "SourceTree", "GitKraken", "VS Code Git"
-            ]
-        }
+        self.skills_database = SKILLS_DATABASE
         
         # Experience structure patterns
         self.experience_patterns = {
@@ -87,6 +90,8 @@ class ResumeParser:
             "summary": ""
         }
         
+        # Imported here so servers that never parse a PDF don't pay for pdfplumber at startup
+        import pdfplumber
         with pdfplumber.open(file_path) as pdf:
             full_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
         
@@ -621,4 +626,9 @@ class ResumeParser:
 def extract_resume_data(file_path: str) -> Dict[str, Any]:
     """Main function to extract resume data"""
     parser = ResumeParser()
-    return parser.parse_resume(file_path)
+    started = time.perf_counter()
+    try:
+        return parser.parse_resume(file_path)
+    finally:
+        file_format = os.path.splitext(file_path)[1].lower().lstrip('.') or "unknown"
+        observe_parse("resume", file_format, time.perf_counter() - started)
@@ -0,0 +1,292 @@
+from threading import Lock, local
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from services.match_matrix import SKILL_NAMES, analyze_text, resume_text
+from services.near_duplicates import NEAR_DUPLICATE_THRESHOLD, collapse_near_duplicates
+from services.resume_delta import bullet_paths
+
+DEFAULT_RESUME_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "resumes.db")
+# Bump when derive_artifacts changes; artifacts from older code are recomputed on first use
+ARTIFACTS_VERSION = 1
+# Upload metadata that doesn't change what the resume says, so it doesn't change its hash
+UNHASHED_KEYS = ("file_info",)
+
+# Artifacts are keyed by content hash: identical versions (of any resume) share them
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id TEXT PRIMARY KEY,
+    latest_version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_versions (
+    resume_id TEXT NOT NULL REFERENCES resumes (id),
+    version INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    resume_data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (resume_id, version)
+);
+CREATE INDEX IF NOT EXISTS resume_versions_hash ON resume_versions (content_hash);
+CREATE TABLE IF NOT EXISTS resume_artifacts (
+    content_hash TEXT PRIMARY KEY,
+    artifacts_version INTEGER NOT NULL,
+    artifacts TEXT NOT NULL
+);
+"""
+
+
+def content_hash(resume_data: Dict[str, Any]) -> str:
+    """SHA-256 of the resume's canonical JSON, ignoring upload metadata"""
+    content = {key: value for key, value in resume_data.items() if key not in UNHASHED_KEYS}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def derive_artifacts(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Everything the match endpoints would otherwise recompute from resume_data on every request
+
+    Returns:
+        Dict: "bullets" and "bullet_paths" (in the bulk routes' extraction order), "duplicate_groups"
+            (near-duplicate grouping of the bullets), "text" (flattened resume) and "skills"
+            (taxonomy skills found in the text)
+    """
+    paths = bullet_paths(resume_data)
+    bullets = [_value_at(resume_data, path) for path in paths]
+    representatives, groups = collapse_near_duplicates(bullets)
+    text = resume_text(resume_data)
+    _, skill_indices = analyze_text(text)
+    return {
+        "bullets": bullets,
+        "bullet_paths": paths,
+        "duplicate_groups": {
+            "threshold": NEAR_DUPLICATE_THRESHOLD,
+            "representatives": representatives,
+            "groups": groups
+        },
+        "text": text,
+        "skills": [SKILL_NAMES[index] for index in sorted(skill_indices)]
+    }
+
+
+def _value_at(resume_data: Dict[str, Any], path: str) -> Any:
+    value = resume_data
+    for part in path.split("."):
+        value = value[int(part)] if isinstance(value, list) else value[part]
+    return value
+
+
+class ResumeStore:
+    """Parsed resumes in a local SQLite database, versioned and addressed by content hash"""
+
+    def __init__(self, path: str = DEFAULT_RESUME_STORE_PATH):
+        """
+        Args:
+            path (str): SQLite database file; its directory is created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # One connection per thread; SQLite connections can't be shared across threads
+        self._local = local()
+        # Serializes version numbering within this process
+        self._write_lock = Lock()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def save(self, resume_data: Dict[str, Any], resume_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store a resume, or a new version of one
+
+        Saving content that is already stored is a no-op that returns the existing version, so
+        clients can save on every upload without piling up copies.
+
+        Args:
+            resume_data (Dict): Parsed resume (as returned by /api/upload_resume)
+            resume_id (str): Resume to add a version to; a new resume, whose ID is derived from
+                its content hash, if None
+
+        Returns:
+            Dict: "resume_id", "version", "content_hash" and "created" (False if nothing was written)
+
+        Raises:
+            KeyError: resume_id was given but isn't stored
+        """
+        digest = content_hash(resume_data)
+        now = time.time()
+        with self._write_lock, self._connection() as conn:
+            if resume_id is None:
+                row = conn.execute(
+                    "SELECT resume_id, version FROM resume_versions WHERE content_hash = ? "
+                    "ORDER BY created_at LIMIT 1", (digest,)
+                ).fetchone()
+                if row is not None:
+                    return self._saved(row["resume_id"], row["version"], digest, False)
+                resume_id, version = digest[:16], 1
+                conn.execute(
+                    "INSERT INTO resumes (id, latest_version, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (resume_id, version, now, now)
+                )
+            else:
+                row = conn.execute(
+                    "SELECT v.version, v.content_hash FROM resumes r JOIN resume_versions v "
+                    "ON v.resume_id = r.id AND v.version = r.latest_version WHERE r.id = ?", (resume_id,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(f"Resume '{resume_id}' not found")
+                if row["content_hash"] == digest:
+                    return self._saved(resume_id, row["version"], digest, False)
+                version = row["version"] + 1
+                conn.execute("UPDATE resumes SET latest_version = ?, updated_at = ? WHERE id = ?",
+                             (version, now, resume_id))
+
+            conn.execute(
+                "INSERT INTO resume_versions (resume_id, version, content_hash, resume_data, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (resume_id, version, digest, json.dumps(resume_data), now)
+            )
+        # Derived once per distinct content, outside the write lock
+        self.artifacts(digest, resume_data)
+        return self._saved(resume_id, version, digest, True)
+
+    def get(self, resume_id: str, version: Optional[int] = None,
+            include_artifacts: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored resume
+
+        Args:
+            resume_id (str): Resume ID
+            version (int): Version to load; the latest if None
+            include_artifacts (bool): Include the derived artifacts
+
+        Returns:
+            Dict: "resume_id", "version", "latest_version", "content_hash", "created_at",
+                "resume_data" and optionally "artifacts", or None if not stored
+        """
+        row = self._connection().execute(
+            "SELECT v.*, r.latest_version FROM resumes r JOIN resume_versions v ON v.resume_id = r.id "
+            "WHERE r.id = ? AND v.version = COALESCE(?, r.latest_version)", (resume_id, version)
+        ).fetchone()
+        if row is None:
+            return None
+
+        resume_data = json.loads(row["resume_data"])
+        record = {
+            "resume_id": row["resume_id"],
+            "version": row["version"],
+            "latest_version": row["latest_version"],
+            "content_hash": row["content_hash"],
+            "created_at": row["created_at"],
+            "resume_data": resume_data
+        }
+        if include_artifacts:
+            record["artifacts"] = self.artifacts(row["content_hash"], resume_data)
+        return record
+
+    def versions(self, resume_id: str) -> List[Dict[str, Any]]:
+        """Every version of a resume, oldest first; empty if the resume isn't stored"""
+        rows = self._connection().execute(
+            "SELECT version, content_hash, created_at FROM resume_versions WHERE resume_id = ? ORDER BY version",
+            (resume_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, resume_id: str) -> bool:
+        """Remove a resume and all its versions; artifacts no other version uses go with them"""
+        with self._write_lock, self._connection() as conn:
+            cursor = conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            if cursor.rowcount == 0:
+                return False
+            conn.execute("DELETE FROM resume_versions WHERE resume_id = ?", (resume_id,))
+            conn.execute(
+                "DELETE FROM resume_artifacts WHERE content_hash NOT IN (SELECT content_hash FROM resume_versions)"
+            )
+        return True
+
+    def artifacts(self, digest: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Derived artifacts of a resume's content, computed and stored on first use"""
+        row = self._connection().execute(
+            "SELECT artifacts FROM resume_artifacts WHERE content_hash = ? AND artifacts_version = ?",
+            (digest, ARTIFACTS_VERSION)
+        ).fetchone()
+        if row is not None:
+            return json.loads(row["artifacts"])
+
+        artifacts = derive_artifacts(resume_data)
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_artifacts (content_hash, artifacts_version, artifacts) VALUES (?, ?, ?)",
+                (digest, ARTIFACTS_VERSION, json.dumps(artifacts))
+            )
+        return artifacts
+
+    @staticmethod
+    def _saved(resume_id: str, version: int, digest: str, created: bool) -> Dict[str, Any]:
+        return {"resume_id": resume_id, "version": version, "content_hash": digest, "created": created}
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+
+# Global instance for reuse
+resume_store = None
+_resume_store_lock = Lock()
+
+def get_resume_store() -> ResumeStore:
+    """The shared resume store, opened on first use so app start-up doesn't touch the database"""
+    global resume_store
+    with _resume_store_lock:
+        if resume_store is None:
+            resume_store = ResumeStore(os.getenv("RESUME_STORE_PATH", DEFAULT_RESUME_STORE_PATH))
+    return resume_store
+
+
+def resume_from_request(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    The resume a match request is about: inline "resume_data", or a stored one named by "resume_id"
+
+    Args:
+        data (Dict): Request body; "resume_version" picks an older version of a stored resume
+
+    Returns:
+        Tuple: (resume_data, artifacts); artifacts is None for inline resumes and resume_data is
+            {} when the body names neither
+
+    Raises:
+        LookupError: resume_id (or that version of it) isn't stored
+        ValueError: resume_version isn't a number
+    """
+    resume_id = data.get("resume_id")
+    if not resume_id:
+        return data.get("resume_data") or {}, None
+
+    version = data.get("resume_version")
+    try:
+        version_number = int(version) if version else None
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid resume_version: {version!r}") from None
+    record = get_resume_store().get(str(resume_id), version_number, include_artifacts=True)
+    if record is None:
+        suffix = f" version {version}" if version else ""
+        raise LookupError(f"Resume '{resume_id}'{suffix} not found")
+    return record["resume_data"], record["artifacts"]
+
+
+def stored_duplicate_groups(artifacts: Optional[Dict[str, Any]]) -> Optional[Tuple[List[int], List[int]]]:
+    """Stored near-duplicate grouping, if there is one and it used the current threshold"""
+    grouping = (artifacts or {}).get("duplicate_groups")
+    if not grouping or grouping.get("threshold") != NEAR_DUPLICATE_THRESHOLD:
+        return None
+    return grouping["representatives"], grouping["groups"]
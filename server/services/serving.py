@@ -0,0 +1,22 @@
+import os
+
+from flask.helpers import get_debug_flag
+
+
+def is_serving_process(run_as_main: bool) -> bool:
+    """
+    Whether this process serves requests, rather than being the debug reloader's watcher
+
+    With the reloader on (`python app.py` runs app.run(debug=True); `flask run --debug`), the app
+    module is imported once by a watcher process that only restarts the server on changes, and again
+    by the child it spawns to serve. Background threads belong in the child: started in both, they
+    would ping Ollama twice and run two worker pools against the same job database.
+
+    Args:
+        run_as_main (bool): The app module is running as __main__, i.e. it calls app.run(debug=True)
+
+    Returns:
+        bool: False only in the reloader's watcher process
+    """
+    reloader = run_as_main or get_debug_flag()
+    return not reloader or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
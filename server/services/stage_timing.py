@@ -0,0 +1,98 @@
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Optional
+import json
+import logging
+import os
+import time
+
+from flask import g, has_request_context, request
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "1") != "0"
+# Browsers only show Server-Timing to a cross-origin page (the React dev server) with this header
+SERVER_TIMING_ALLOW_ORIGIN = os.getenv("SERVER_TIMING_ALLOW_ORIGIN", "*")
+# Structured timing log: off, or on for requests slower than the threshold
+STAGE_TIMING_LOG = os.getenv("STAGE_TIMING_LOG", "0") != "0"
+STAGE_TIMING_LOG_MIN_MS = float(os.getenv("STAGE_TIMING_LOG_MIN_MS", "0"))
+
+
+class StageTimings:
+    """Time spent per stage of one request; stages run by concurrent chunks are summed"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._stages = {}
+        self._lock = Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            total, count = self._stages.get(name, (0.0, 0))
+            self._stages[name] = (total + seconds, count + 1)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stages = dict(self._stages)
+        return {name: {"ms": round(total * 1000, 1), "count": count} for name, (total, count) in stages.items()}
+
+    def header_value(self) -> str:
+        """Server-Timing header: one entry per stage plus the request total"""
+        entries = []
+        for name, stage in self.as_dict().items():
+            entry = f"{name};dur={stage['ms']}"
+            if stage["count"] > 1:
+                entry += f';desc="{stage["count"]} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={round((time.perf_counter() - self.started_at) * 1000, 1)}")
+        return ", ".join(entries)
+
+
+def current_stage_timings() -> Optional[StageTimings]:
+    if has_request_context():
+        return g.get("stage_timings")
+    return None
+
+
+@contextmanager
+def stage_timer(name: str):
+    """Add the time spent in the block to the current request's stage timings (no-op outside a request)"""
+    timings = current_stage_timings()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def init_stage_timing(app) -> None:
+    """Report per-stage timings of every request in a Server-Timing header and, optionally, a log line"""
+    if not SERVER_TIMING_ENABLED:
+        return
+
+    @app.before_request
+    def _start_stage_timings():
+        g.stage_timings = StageTimings()
+
+    @app.after_request
+    def _add_server_timing(response):
+        timings = g.get("stage_timings")
+        if timings is None:
+            return response
+
+        response.headers["Server-Timing"] = timings.header_value()
+        if SERVER_TIMING_ALLOW_ORIGIN:
+            response.headers["Timing-Allow-Origin"] = SERVER_TIMING_ALLOW_ORIGIN
+
+        total_ms = round((time.perf_counter() - timings.started_at) * 1000, 1)
+        if STAGE_TIMING_LOG and total_ms >= STAGE_TIMING_LOG_MIN_MS:
+            logging.info(json.dumps({
+                "event": "request_timing",
+                "route": request.url_rule.rule if request.url_rule else request.path,
+                "method": request.method,
+                "status": response.status_code,
+                "total_ms": total_ms,
+                "stages": timings.as_dict()
+            }))
+        return response
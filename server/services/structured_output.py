@@ -0,0 +1,269 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import time
+from services.local_rewriter import rewrite_bullets
+from services.metrics import observe_parse
+from services.stage_timing import stage_timer
+
+# Rounds per batch: the first call covers every bullet, later ones only the IDs it left out
+STRUCTURED_OUTPUT_MAX_ATTEMPTS = int(os.getenv("STRUCTURED_OUTPUT_MAX_ATTEMPTS", "2"))
+
+BULLET_ID_PREFIX = "b"
+
+# Keys models use for the rewritten text when they answer with objects instead of plain strings
+_TEXT_KEYS = ("text", "bullet", "rewrite", "rewritten", "improved", "improved_bullet", "value")
+_LIST_KEYS = ("bullets", "rewrites", "results", "improved_bullets", "items")
+
+_ID_PATTERN = re.compile(r'^\s*\[?\s*(' + BULLET_ID_PREFIX + r')?\s*(\d+)\s*\]?\s*$', re.IGNORECASE)
+# "[b3] text", "b3: text", "\"b3\": \"text\"," -- an explicit ID tag
+_ID_LINE_PATTERN = re.compile(
+    r'^\s*[{\[(]?\s*"?' + BULLET_ID_PREFIX + r'(\d+)"?\s*[\])]?\s*[:=.)\-]?\s*(.+)$', re.IGNORECASE
+)
+# "3. text" / "3) text" -- numbered lists address a bullet by its position in the call's ID list
+_NUMBERED_LINE_PATTERN = re.compile(r'^\s*(\d+)[.)]\s+(.+)$')
+_MARKER_PATTERN = re.compile(r'^\s*(?:[•\-*·])\s*')
+_TRAILING_COMMA_PATTERN = re.compile(r',\s*([}\]])')
+
+STRUCTURE_LABEL_PATTERNS = {
+    "star": re.compile(r'^(Situation|Task|Action|Result):\s*', re.IGNORECASE),
+    "xyz": re.compile(
+        r'^(Accomplished|Delivered|Improved|Achieved|Developed|Implemented|Managed|Led|Created|Built):\s*',
+        re.IGNORECASE
+    ),
+}
+
+
+def bullet_ids(count: int) -> List[str]:
+    """Stable IDs for a batch of bullets ("b1", "b2", ...), in resume order"""
+    return [f"{BULLET_ID_PREFIX}{idx}" for idx in range(1, count + 1)]
+
+
+def format_id_bullets(items: List[Tuple[str, str]]) -> str:
+    """Render (id, bullet) pairs as prompt lines tagged with their IDs"""
+    return "".join(f"[{bullet_id}] {bullet}\n" for bullet_id, bullet in items)
+
+
+def json_output_instructions(ids: List[str]) -> str:
+    """Prompt text asking for one JSON object keyed by bullet ID"""
+    example = ", ".join(f'"{bullet_id}": "..."' for bullet_id in ids[:2])
+    return (
+        "Return ONLY a JSON object that maps each bullet id to its rewritten bullet, "
+        f"for example {{{example}}}. Include every id exactly once: {', '.join(ids)}."
+    )
+
+
+def parse_id_outputs(response_text: str, ids: List[str], structure_type: str = "standard") -> Dict[str, str]:
+    """
+    Map a model response back to bullet IDs
+
+    Accepts a JSON object keyed by ID, a list of {"id", "text"} objects, JSON wrapped in
+    code fences or cut off mid-way, and plain "[b1] text" or "1. text" lines. Bare numbers
+    count positions in ids, not bullet numbers, so a follow-up call for only the missing IDs
+    maps its "1." to the first of them. Bullets the response doesn't clearly address are left
+    out rather than guessed.
+
+    Args:
+        response_text (str): Raw response from the model
+        ids (List[str]): IDs that were sent
+        structure_type (str): Format type ('star', 'xyz', 'standard'), for label cleanup
+
+    Returns:
+        Dict[str, str]: Rewritten bullet per ID found in the response
+    """
+    started = time.perf_counter()
+    wanted = set(ids)
+    outputs = {}
+
+    payload = _load_json_payload(response_text or "")
+    if payload is not None:
+        for bullet_id, text in _outputs_from_json(payload, ids):
+            if bullet_id in wanted and bullet_id not in outputs:
+                outputs[bullet_id] = text
+
+    # Truncated or non-JSON answers: recover whatever complete lines still carry an ID
+    if len(outputs) < len(wanted):
+        for bullet_id, text in _outputs_from_lines(response_text or "", ids):
+            if bullet_id in wanted and bullet_id not in outputs:
+                outputs[bullet_id] = text
+
+    cleaned = {}
+    for bullet_id, text in outputs.items():
+        text = _clean_output(text, structure_type)
+        if text:
+            cleaned[bullet_id] = text
+
+    observe_parse("llm_response", structure_type, time.perf_counter() - started)
+    return cleaned
+
+
+def rewrite_by_id(bullets: List[str], build_prompt: Callable[[List[Tuple[str, str]]], str],
+                  generate: Callable[[str], str], structure_type: str = "standard",
+                  max_attempts: int = STRUCTURED_OUTPUT_MAX_ATTEMPTS) -> List[Optional[str]]:
+    """
+    Rewrite bullets with ID-addressed prompts, re-asking only for the IDs that came back missing
+
+    Args:
+        bullets (List[str]): Bullets to rewrite, in order
+        build_prompt (Callable): Builds a prompt from (id, bullet) pairs
+        generate (Callable): Sends a prompt to the model and returns its text
+        structure_type (str): Format type ('star', 'xyz', 'standard')
+        max_attempts (int): Calls to make at most, including the first
+
+    Returns:
+        List[Optional[str]]: Rewrite per bullet, None where the model never returned one
+
+    Raises:
+        Exception: Whatever the first generate call raises; failed follow-ups keep partial results
+    """
+    ids = bullet_ids(len(bullets))
+    outputs = {}
+    pending = list(zip(ids, bullets))
+
+    for attempt in range(max(1, max_attempts)):
+        with stage_timer("prompt"):
+            prompt = build_prompt(pending)
+        try:
+            response = generate(prompt)
+        except Exception as e:
+            if attempt == 0:
+                raise
+            logging.warning(f"Follow-up for {len(pending)} missing bullet(s) failed: {e}")
+            break
+
+        with stage_timer("parse"):
+            outputs.update(parse_id_outputs(response, [bullet_id for bullet_id, _ in pending], structure_type))
+        pending = [(bullet_id, bullet) for bullet_id, bullet in pending if bullet_id not in outputs]
+        if not pending:
+            break
+        logging.info(f"Model left out {len(pending)} of {len(bullets)} bullet(s), re-asking for those only")
+
+    return [outputs.get(bullet_id) for bullet_id in ids]
+
+
+def fill_missing_rewrites(rewrites: List[Optional[str]], bullets: List[str], job_description: str = "",
+                          structure_type: str = "standard") -> Tuple[List[str], List[int]]:
+    """
+    Fill bullets the model never returned with local rewrites
+
+    Returns:
+        Tuple: (rewrites in bullet order, positions that were rewritten locally)
+    """
+    missing = [idx for idx, rewrite in enumerate(rewrites) if not rewrite]
+    filled = list(rewrites)
+    if missing:
+        local = rewrite_bullets([bullets[idx] for idx in missing], job_description, structure_type)
+        for idx, rewrite in zip(missing, local):
+            filled[idx] = rewrite
+    return filled, missing
+
+
+def _normalize_id(key, ids):
+    """ID a key refers to: "b3"/"[b3]" as written, a bare number by position among the IDs sent"""
+    match = _ID_PATTERN.match(str(key))
+    if not match:
+        return None
+    if match.group(1):
+        return f"{BULLET_ID_PREFIX}{int(match.group(2))}"
+    return _positional_id(int(match.group(2)), ids)
+
+
+def _positional_id(number, ids):
+    # A follow-up call sends only the missing IDs (say b2, b5), so its "1." means b2, not b1
+    return ids[number - 1] if 1 <= number <= len(ids) else None
+
+
+def _load_json_payload(text):
+    """Parse the first JSON object or array in the text, tolerating fences and trailing commas"""
+    text = re.sub(r'```(?:json)?', '', text)
+    starts = [pos for pos in (text.find('{'), text.find('[')) if pos != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = max(text.rfind('}'), text.rfind(']'))
+    if end <= start:
+        return None
+
+    candidate = text[start:end + 1]
+    for attempt in (candidate, _TRAILING_COMMA_PATTERN.sub(r'\1', candidate)):
+        try:
+            return json.loads(attempt)
+        except ValueError:
+            continue
+    return None
+
+
+def _outputs_from_json(payload, ids):
+    if isinstance(payload, dict):
+        for key in _LIST_KEYS:
+            if isinstance(payload.get(key), (list, dict)):
+                return _outputs_from_json(payload[key], ids)
+        pairs = []
+        for key, value in payload.items():
+            bullet_id = _normalize_id(key, ids)
+            text = _text_from_value(value)
+            if bullet_id and text:
+                pairs.append((bullet_id, text))
+        return pairs
+
+    if isinstance(payload, list):
+        pairs = []
+        for item in payload:
+            if isinstance(item, dict) and "id" in item:
+                bullet_id = _normalize_id(item["id"], ids)
+                text = _text_from_value(item)
+                if bullet_id and text:
+                    pairs.append((bullet_id, text))
+        # A bare list of strings is only trusted when its length leaves no doubt about alignment
+        if not pairs and len(payload) == len(ids) and all(isinstance(item, str) for item in payload):
+            pairs = list(zip(ids, payload))
+        return pairs
+
+    return []
+
+
+def _text_from_value(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        for key in _TEXT_KEYS:
+            if isinstance(value.get(key), str):
+                return value[key]
+    return None
+
+
+def _outputs_from_lines(text, ids):
+    pairs = []
+    for line in text.split('\n'):
+        match = _ID_LINE_PATTERN.match(line)
+        if match:
+            bullet_id = f"{BULLET_ID_PREFIX}{int(match.group(1))}"
+        else:
+            match = _NUMBERED_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            bullet_id = _positional_id(int(match.group(1)), ids)
+            if bullet_id is None:
+                continue
+        value = match.group(2).strip().rstrip(',').strip()
+        # A value that opens a JSON string but never closes it was cut off by the token limit
+        if value.startswith('"') and (len(value) < 2 or not value.endswith('"')):
+            continue
+        pairs.append((bullet_id, value))
+    return pairs
+
+
+def _clean_output(text, structure_type):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        try:
+            text = json.loads(text)
+        except ValueError:
+            text = text[1:-1]
+    text = _MARKER_PATTERN.sub('', text).strip()
+    label_pattern = STRUCTURE_LABEL_PATTERNS.get(structure_type)
+    if label_pattern:
+        text = label_pattern.sub('', text)
+    return text.strip()
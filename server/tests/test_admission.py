@@ -0,0 +1,122 @@
+from threading import Thread
+import time
+
+import pytest
+from flask import Flask
+
+from services import admission
+from services.admission import AdmissionController, AdmissionRejected
+
+
+def _wait_queued(controller, queued):
+    while controller.stats()["queued"] < queued:
+        time.sleep(0.001)
+
+
+def test_request_waits_for_a_slot_and_is_rejected_at_its_wait_limit():
+    controller = AdmissionController(1, max_wait=0.05, max_queue=4)
+    controller.acquire("a")
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire("b")
+    assert time.monotonic() - started >= 0.05
+    assert exc.value.reason == "wait limit reached"
+    assert exc.value.retry_after >= 1
+    assert controller.stats()["queued"] == 0
+
+
+def test_full_queue_rejects_immediately():
+    controller = AdmissionController(1, max_wait=5, max_queue=0)
+    controller.acquire("a")
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire("b")
+    assert time.monotonic() - started < 1
+    assert exc.value.reason == "queue full"
+
+
+def test_freed_slot_goes_to_the_client_under_its_share():
+    controller = AdmissionController(2, max_wait=5, max_queue=8)
+    controller.acquire("a")
+    controller.acquire("a")
+    order = []
+
+    def wait(client):
+        controller.acquire(client)
+        order.append(client)
+
+    threads = [Thread(target=wait, args=("a",))]
+    threads[0].start()
+    _wait_queued(controller, 1)
+    threads.append(Thread(target=wait, args=("b",)))
+    threads[1].start()
+    _wait_queued(controller, 2)
+
+    controller.release("a")
+    threads[1].join(5)
+    assert order == ["b"]
+    controller.release("a")
+    threads[0].join(5)
+    assert order == ["b", "a"]
+
+
+def test_interactive_request_goes_first_among_equals():
+    controller = AdmissionController(1, max_wait=5, max_queue=8)
+    controller.acquire("a")
+    order = []
+
+    def wait(client, interactive):
+        controller.acquire(client, interactive)
+        order.append(client)
+        controller.release(client)
+
+    threads = []
+    for queued, (client, interactive) in enumerate([("bulk", False), ("user", True)], 1):
+        threads.append(Thread(target=wait, args=(client, interactive)))
+        threads[-1].start()
+        _wait_queued(controller, queued)
+
+    controller.release("a")
+    for thread in threads:
+        thread.join(5)
+    assert order == ["user", "bulk"]
+
+
+def test_client_id_prefers_the_proxy_header(monkeypatch):
+    app = Flask(__name__)
+    monkeypatch.setattr(admission, "ADMISSION_CLIENT_HEADER", "X-Forwarded-For")
+
+    with app.test_request_context(headers={"X-Forwarded-For": "10.0.0.1, 10.0.0.2"},
+                                  environ_base={"REMOTE_ADDR": "127.0.0.1"}):
+        assert admission.client_id(admission.request) == "10.0.0.1"
+    with app.test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"}):
+        assert admission.client_id(admission.request) == "127.0.0.1"
+
+
+def test_llm_endpoint_answers_429_with_retry_after_when_full(monkeypatch):
+    controller = AdmissionController(1, max_wait=0.01, max_queue=4)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    app = Flask(__name__)
+    admission.init_admission_control(app)
+
+    @app.route("/improve", methods=["POST"])
+    def improve_bullet():
+        return {"ok": True}
+
+    @app.route("/health")
+    def health():
+        return {"ok": True}
+
+    client = app.test_client()
+    assert client.post("/improve").status_code == 200
+    # The slot was released at teardown
+    assert controller.stats()["active"] == 0
+
+    controller.acquire("someone else")
+    response = client.post("/improve")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    # Endpoints that make no LLM calls are never held back
+    assert client.get("/health").status_code == 200
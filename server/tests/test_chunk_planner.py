@@ -0,0 +1,107 @@
+import re
+import threading
+
+from flask import Flask, g, jsonify
+
+from routes.bulk_match_routes import bulk_match_routes
+from services.chunk_planner import (
+    MODEL_OUTPUT_BUDGETS, MODEL_TOKEN_BUDGETS, estimate_tokens, plan_chunks, run_chunks_concurrently
+)
+from services.deadline import DeadlineExceeded, init_deadlines
+
+_VERBS = ["Migrated", "Deployed", "Designed", "Automated", "Reduced", "Scaled", "Mentored", "Refactored", "Audited",
+          "Profiled"]
+_THINGS = ["billing ledger", "search indexer", "onboarding flow", "payment gateway", "analytics pipeline", "auth service"]
+_HOW = ["on Kubernetes", "with Terraform", "using Kafka streams", "behind Nginx", "in Go", "with Celery workers",
+        "on AWS Lambda"]
+# Distinct enough that none are collapsed as near-duplicates
+BULLETS = [f"{_VERBS[idx % 10]} the {_THINGS[idx % 6]} {_HOW[idx % 7]}, saving {idx * 7 + 3} engineer hours per quarter"
+           for idx in range(30)]
+
+
+def test_chunks_cover_every_bullet_in_order_within_budget():
+    overhead = 1500
+    chunks = plan_chunks(BULLETS, "phi3:mini", overhead)
+
+    assert len(chunks) > 1
+    assert [bullet for chunk in chunks for bullet in chunk["bullets"]] == BULLETS
+    assert chunks[0]["start"] == 0 and chunks[-1]["end"] == len(BULLETS)
+    for chunk in chunks:
+        assert chunk["num_predict"] <= MODEL_OUTPUT_BUDGETS["phi3:mini"]
+        prompt_tokens = overhead + sum(estimate_tokens(bullet) for bullet in chunk["bullets"])
+        assert prompt_tokens + chunk["num_predict"] <= MODEL_TOKEN_BUDGETS["phi3:mini"]
+
+
+def test_larger_model_budget_needs_fewer_chunks():
+    assert len(plan_chunks(BULLETS, "gemini-1.5-flash", 500)) < len(plan_chunks(BULLETS, "phi3:mini", 500))
+
+
+def test_oversized_bullet_gets_a_chunk_of_its_own():
+    huge = "word " * 5000
+    chunks = plan_chunks(["short one", huge, "short two"], "phi3:mini", 200)
+    assert [chunk["bullets"] for chunk in chunks] == [["short one"], [huge], ["short two"]]
+
+
+def test_no_bullets_no_chunks():
+    assert plan_chunks([], "phi3:mini", 200) == []
+    assert run_chunks_concurrently([], lambda *args: []) == []
+
+
+def test_concurrent_results_keep_bullet_order_and_request_context():
+    chunks = plan_chunks(BULLETS, "phi3:mini", 1500)
+    progress = []
+    seen_request = []
+
+    def worker(chunk, number, total):
+        seen_request.append(g.get("marker"))
+        # Later chunks finish first
+        threading.Event().wait(0.01 * (total - number))
+        return [bullet.upper() for bullet in chunk["bullets"]]
+
+    with Flask(__name__).test_request_context():
+        g.marker = "request"
+        results = run_chunks_concurrently(chunks, worker, on_progress=lambda done, total: progress.append(done))
+
+    assert results == [bullet.upper() for bullet in BULLETS]
+    assert progress == list(range(1, len(chunks) + 1))
+    assert seen_request == ["request"] * len(chunks)
+
+
+class _ChunkRouter:
+    """Answers chunk prompts as JSON keyed by ID, except the chunk told to run out of time"""
+
+    providers = ["ollama"]
+
+    def __init__(self, expired_chunk):
+        self.expired_chunk = expired_chunk
+
+    def pick(self, provider=None):
+        return "ollama"
+
+    def generate(self, prompt, **kwargs):
+        if f"This is chunk {self.expired_chunk} of" in prompt:
+            raise DeadlineExceeded("Request deadline reached")
+        items = re.findall(r'^\[(b\d+)\] (.+)$', prompt, re.MULTILINE)
+        return jsonify({bullet_id: f"Rewrote: {bullet}" for bullet_id, bullet in items}).get_data(as_text=True)
+
+
+def test_chunk_cut_off_by_deadline_makes_a_partial_result():
+    app = Flask(__name__)
+    app.register_blueprint(bulk_match_routes)
+    init_deadlines(app)
+    app.extensions["llm_router"] = _ChunkRouter(expired_chunk=2)
+    resume = {"experience": [{"title": "Engineer", "company": "Acme", "bullets": BULLETS}]}
+
+    response = app.test_client().post("/api/match_entire_resume", json={
+        "resume_data": resume, "jd": "Partial-result test: Python engineer for Redis-backed services", "top_k": 0
+    })
+
+    body = response.get_json()
+    improved = body["improved_results"]["experience"][0]["improved_bullets"]
+    assert response.status_code == 200
+    assert body["partial"] is True
+    assert body["summary"]["skipped_bullets"] > 0
+    assert body["summary"]["locally_rewritten_bullets"] == body["summary"]["skipped_bullets"]
+    assert len(improved) == len(BULLETS)
+    rewritten = [bullet.startswith("Rewrote: ") for bullet in improved]
+    assert rewritten.count(False) == body["summary"]["skipped_bullets"]
@@ -0,0 +1,18 @@
+import pytest
+from flask import Flask
+
+from services.compression import accepts_gzip
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, GZIP;q=0.5", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip_respects_quality(header, expected):
+    with Flask(__name__).test_request_context(headers={"Accept-Encoding": header}) as ctx:
+        assert accepts_gzip(ctx.request) is expected
@@ -0,0 +1,107 @@
+import json
+
+from services import jd_index
+from services.jd_index import JDIndex, resume_skill_names
+
+JDS = [
+    {"id": "frontend", "title": "Frontend engineer", "text": "React and TypeScript engineer building design systems"},
+    {"id": "backend", "title": "Backend engineer", "text": "Python engineer: Flask APIs, PostgreSQL, Kubernetes"},
+    {"id": "data", "title": "Data engineer", "text": "Python data pipelines with Spark and Airflow", "team": "data"},
+]
+
+
+def test_search_ranks_jds_by_bm25(tmp_path):
+    index = JDIndex(str(tmp_path / "jds.db"))
+    index.add_many(JDS)
+
+    results = index.search("Flask APIs in Python")
+    assert [result["id"] for result in results] == ["backend", "data"]
+    assert results[0]["score"] > results[1]["score"] > 0
+    assert set(results[0]["skills"]) == {"Python", "Kubernetes", "PostgreSQL", "Flask"}
+    assert index.search("Python", top_k=1)[0]["id"] in {"backend", "data"}
+    assert index.search("the and of") == []
+
+
+def test_metadata_and_generated_ids(tmp_path):
+    index = JDIndex(str(tmp_path / "jds.db"))
+    index.add_many(JDS)
+    text_id = index.add("Go developer for payment systems")
+
+    assert index.get("data")["metadata"] == {"team": "data"}
+    # The same text gets the same ID, so adding it again replaces it
+    assert index.add("Go developer for payment systems") == text_id
+    assert index.count() == 4
+
+
+def test_replaced_and_deleted_jds_leave_results(tmp_path):
+    index = JDIndex(str(tmp_path / "jds.db"))
+    index.add_many(JDS)
+
+    index.add({"id": "backend", "title": "Backend engineer", "text": "Go engineer for payment systems"})
+    assert [result["id"] for result in index.search("Flask")] == []
+    assert [result["id"] for result in index.search("payment")] == ["backend"]
+
+    assert index.delete("data")
+    assert not index.delete("data")
+    assert index.get("data") is None
+    assert [result["id"] for result in index.search("Spark Python")] == []
+    assert index.count() == 2
+
+
+def test_segments_are_merged_without_stale_postings(tmp_path, monkeypatch):
+    monkeypatch.setattr(jd_index, "JD_INGEST_BATCH_SIZE", 1)
+    monkeypatch.setattr(jd_index, "JD_MAX_SEGMENTS", 2)
+    index = JDIndex(str(tmp_path / "jds.db"))
+    for number in range(10):
+        index.add({"id": f"jd{number}", "text": f"Python engineer number{number}"})
+    index.delete("jd3")
+    index.add({"id": "jd4", "text": "Rust engineer"})
+    index.add({"id": "jd10", "text": "Python engineer number10"})
+
+    # Eleven batches wrote eleven "python" segments; merges keep far fewer
+    segments = index._connection().execute(
+        "SELECT count(*) FROM postings WHERE field = 'terms' AND term = 'python'"
+    ).fetchone()[0]
+    assert segments <= 4
+    # Postings left behind by the deleted and replaced JDs never surface
+    assert {result["id"] for result in index.search("python", top_k=20)} == \
+        {f"jd{number}" for number in range(11)} - {"jd3", "jd4"}
+
+
+def test_index_persists_across_instances(tmp_path):
+    path = str(tmp_path / "jds.db")
+    JDIndex(path).add_many(JDS)
+
+    reopened = JDIndex(path)
+    assert reopened.count() == 3
+    assert reopened.search("React")[0]["id"] == "frontend"
+
+
+def test_import_jsonl_reports_bad_lines(tmp_path):
+    index = JDIndex(str(tmp_path / "jds.db"))
+    lines = [json.dumps(JDS[0]), "", "{not json", json.dumps({"id": "empty", "text": " "}),
+             json.dumps("Python engineer").encode("utf-8"), "42"]
+
+    result = index.import_jsonl(lines)
+    assert result["added"] == 2
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [3, 4, 6]
+
+
+def test_match_skills_reports_matched_and_missing(tmp_path):
+    index = JDIndex(str(tmp_path / "jds.db"))
+    index.add_many(JDS)
+    skills = [{"category": "Backend", "skills": [{"skill": "Python"}, {"skill": "Flask"}]}]
+
+    results = index.match_skills(skills)
+    assert results[0]["id"] == "backend"
+    assert set(results[0]["matched_skills"]) == {"Python", "Flask"}
+    assert set(results[0]["missing_skills"]) == {"PostgreSQL", "Kubernetes"}
+    assert [result["id"] for result in results] == ["backend", "data"]
+
+
+def test_resume_skill_names_accepts_every_shape():
+    categories = [{"category": "Languages", "skills": [{"skill": "Python"}, {"skill": "Go"}]}]
+    assert resume_skill_names(categories) == ["Python", "Go"]
+    assert resume_skill_names(["Python", "Python", "Go"]) == ["Python", "Go"]
+    assert resume_skill_names([{"skill": "Rust"}, {"skill": ""}]) == ["Rust"]
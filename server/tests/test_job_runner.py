@@ -0,0 +1,46 @@
+from flask import Flask
+
+from services import job_runner
+from services.job_store import JOB_QUEUED, JOB_RUNNING, JobStore
+from services.serving import is_serving_process
+
+
+def _start(monkeypatch, tmp_path):
+    monkeypatch.setenv("JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("JOB_WORKERS", "1")
+    job_runner.start_job_workers(Flask(__name__))
+    return job_runner.get_job_runner()
+
+
+def test_second_start_leaves_claimed_job_running(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_runner, "job_runner", None)
+    runner = _start(monkeypatch, tmp_path)
+    job = runner.store.create("match_entire_resume", {"resume_data": {}, "jd": "Python"})
+    assert runner.store.mark_running(job["job_id"])
+
+    assert _start(monkeypatch, tmp_path) is runner
+    assert runner.store.get(job["job_id"])["status"] == JOB_RUNNING
+
+
+def test_restart_requeues_jobs_left_running(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.create("match_entire_resume", {"resume_data": {}, "jd": "Python"})
+    store.mark_running(job["job_id"])
+
+    assert JobStore(store.path).requeue_interrupted() == [job["job_id"]]
+    assert store.get(job["job_id"])["status"] == JOB_QUEUED
+
+
+def test_reloader_watcher_is_not_a_serving_process(monkeypatch):
+    monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    monkeypatch.delenv("FLASK_DEBUG", raising=False)
+    assert not is_serving_process(run_as_main=True)
+    assert is_serving_process(run_as_main=False)
+
+    monkeypatch.setenv("FLASK_DEBUG", "1")
+    assert not is_serving_process(run_as_main=False)
+
+    # The child the reloader spawns
+    monkeypatch.setenv("WERKZEUG_RUN_MAIN", "true")
+    assert is_serving_process(run_as_main=True)
+    assert is_serving_process(run_as_main=False)
@@ -0,0 +1,24 @@
+from flask import Flask
+
+from services import llm_router
+from services.llm_router import LLMRouter, get_llm_router, init_llm_router
+
+
+def test_app_router_pins_its_providers(monkeypatch):
+    monkeypatch.setattr(llm_router, "llm_router", LLMRouter(["ollama", "gemini"]))
+    app = Flask(__name__)
+    init_llm_router(app, providers=["gemini", "ollama"])
+
+    with app.app_context():
+        assert get_llm_router().route() == ["gemini", "ollama"]
+    assert get_llm_router().route() == ["ollama", "gemini"]
+
+
+def test_request_pinned_to_missing_provider_is_rejected():
+    app = Flask(__name__)
+    init_llm_router(app, providers=["gemini"])
+    app.add_url_rule("/ping", "ping", lambda: "ok")
+
+    client = app.test_client()
+    assert client.get("/ping", headers={"X-LLM-Provider": "ollama"}).status_code == 400
+    assert client.get("/ping", headers={"X-LLM-Provider": "gemini"}).status_code == 200
@@ -0,0 +1,115 @@
+from threading import Thread
+import time
+
+import pytest
+from flask import Flask, g
+
+from services.deadline import MIN_CALL_SECONDS, Deadline, DeadlineExceeded
+from services.llm_scheduler import LLMScheduler
+from services.stage_timing import StageTimings
+
+WEIGHTS = {"interactive": 4.0, "bulk": 1.0}
+
+
+def test_queue_time_recorded_once_per_call_with_global_parent():
+    parent = LLMScheduler("all", 4, WEIGHTS)
+    scheduler = LLMScheduler("ollama", 2, WEIGHTS, parent=parent)
+
+    with Flask(__name__).test_request_context():
+        g.stage_timings = StageTimings()
+        for _ in range(3):
+            with scheduler.slot("interactive"):
+                pass
+        assert g.stage_timings.as_dict()["queue"]["count"] == 3
+
+
+class _Queue:
+    """Calls queued one at a time behind a held slot, recording the order they are admitted in"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.app = Flask(__name__)
+        self.order = []
+        self.threads = []
+
+    def add(self, label, priority, client=None):
+        queued = self._queued()
+
+        def run():
+            with self.app.test_request_context():
+                g.llm_client = client
+                self.scheduler.acquire(priority)
+                self.order.append(label)
+                self.scheduler.release()
+
+        thread = Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        while self._queued() == queued:
+            time.sleep(0.001)
+
+    def drain(self):
+        self.scheduler.release()
+        for thread in self.threads:
+            thread.join(5)
+        return self.order
+
+    def _queued(self):
+        return sum(self.scheduler.stats()["queued"].values())
+
+
+def test_weighted_fair_queuing_serves_interactive_ahead_of_earlier_bulk():
+    scheduler = LLMScheduler("ollama", 1, WEIGHTS, aging_seconds=60)
+    scheduler.acquire("interactive")
+    queue = _Queue(scheduler)
+    for number in range(3):
+        queue.add(f"bulk{number}", "bulk")
+    for number in range(3):
+        queue.add(f"interactive{number}", "interactive")
+
+    order = queue.drain()
+    assert order[:3] == ["interactive0", "interactive1", "interactive2"]
+    assert order[3:] == ["bulk0", "bulk1", "bulk2"]
+
+
+def test_bulk_is_not_starved_by_a_stream_of_interactive_calls():
+    scheduler = LLMScheduler("ollama", 1, WEIGHTS, aging_seconds=60)
+    scheduler.acquire("interactive")
+    queue = _Queue(scheduler)
+    queue.add("bulk", "bulk")
+    for number in range(8):
+        queue.add(f"interactive{number}", "interactive")
+
+    # Weights 4:1 — the bulk call finishes its virtual turn as the fourth interactive call does, and wins the tie
+    assert queue.drain().index("bulk") == 3
+
+
+def test_aged_calls_are_served_oldest_first():
+    scheduler = LLMScheduler("ollama", 1, WEIGHTS, aging_seconds=0)
+    scheduler.acquire("interactive")
+    queue = _Queue(scheduler)
+    queue.add("bulk", "bulk")
+    queue.add("interactive", "interactive")
+
+    assert queue.drain() == ["bulk", "interactive"]
+
+
+def test_clients_share_a_class_equally():
+    scheduler = LLMScheduler("ollama", 1, WEIGHTS, aging_seconds=60)
+    scheduler.acquire("bulk")
+    queue = _Queue(scheduler)
+    for number in range(3):
+        queue.add(f"a{number}", "bulk", client="a")
+    queue.add("b0", "bulk", client="b")
+
+    assert queue.drain() == ["a0", "b0", "a1", "a2"]
+
+
+def test_queued_call_gives_up_at_its_deadline():
+    scheduler = LLMScheduler("ollama", 1, WEIGHTS)
+    scheduler.acquire("bulk")
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire("bulk", Deadline(MIN_CALL_SECONDS + 0.05))
+    assert scheduler.stats()["queued"] == {"interactive": 0, "bulk": 0}
+    assert scheduler.stats()["active"] == 1
@@ -0,0 +1,50 @@
+from services.match_matrix import resume_text, top_matches
+
+JDS = [
+    "Frontend engineer: React and TypeScript, building design systems",
+    "Backend engineer: Python, Flask and PostgreSQL on Kubernetes",
+    "Data engineer: Python, Spark and Airflow pipelines",
+]
+
+
+def test_each_resume_is_matched_to_its_closest_jd_first():
+    resumes = [
+        "Built Flask services in Python with PostgreSQL, deployed on Kubernetes",
+        "Shipped React and TypeScript component libraries",
+    ]
+    result = top_matches(resumes, JDS, top_k=2)
+
+    assert [match["jd_index"] for match in result["matches"][0]] == [1, 2]
+    assert result["matches"][1][0]["jd_index"] == 0
+    best = result["matches"][0][0]
+    assert best["score"] >= result["matches"][0][1]["score"]
+    assert set(best["matched_skills"]) == {"Python", "Flask", "PostgreSQL", "Kubernetes"}
+    assert best["missing_skills"] == []
+
+
+def test_missing_skills_and_common_gaps():
+    result = top_matches(["Python scripting"], JDS, top_k=3, include_matrix=True)
+
+    backend = next(match for match in result["matches"][0] if match["jd_index"] == 1)
+    assert backend["matched_skills"] == ["Python"]
+    assert set(backend["missing_skills"]) == {"Flask", "PostgreSQL", "Kubernetes"}
+    assert {gap["skill"] for gap in result["common_gaps"]} == {"TypeScript", "React", "Flask", "PostgreSQL", "Kubernetes"}
+    assert len(result["matrix"]) == 1 and len(result["matrix"][0]) == 3
+
+
+def test_top_k_is_clamped_to_the_number_of_jds():
+    result = top_matches(["Python"], JDS[:1], top_k=5)
+    assert len(result["matches"][0]) == 1
+
+
+def test_resume_text_flattens_a_parsed_resume():
+    resume = {
+        "summary": "Backend developer",
+        "skills": [{"category": "Languages", "skills": [{"skill": "Python", "confidence": 0.9, "context": ""}]}],
+        "experience": [{"title": "Engineer", "bullets": ["Built Flask APIs"]}],
+        "projects": [{"name": "Tracker", "description": "", "tech_stack": ["Redis"], "bullets": []}],
+        "education": [{"text": "BSc Computer Science"}],
+    }
+    assert resume_text(resume).split("\n") == [
+        "Backend developer", "Python", "Engineer", "Built Flask APIs", "Tracker", "Redis", "BSc Computer Science"
+    ]
@@ -0,0 +1,44 @@
+from services.near_duplicates import collapse_near_duplicates
+
+
+def test_near_identical_bullets_share_a_representative():
+    texts = [
+        "Built a REST API in Flask serving 10k requests per day",
+        "Led migration of the billing system to PostgreSQL",
+        "Built a REST API in Flask, serving 10k requests per day.",
+        "Mentored four junior engineers on code review practices",
+    ]
+    representatives, groups = collapse_near_duplicates(texts)
+
+    assert representatives == [0, 1, 3]
+    assert groups == [0, 1, 0, 2]
+
+
+def test_distinct_bullets_are_all_kept():
+    texts = [
+        "Designed a caching layer that cut page load time in half",
+        "Automated nightly reporting with Airflow and BigQuery",
+        "Negotiated vendor contracts worth $2M annually",
+    ]
+    assert collapse_near_duplicates(texts) == ([0, 1, 2], [0, 1, 2])
+
+
+def test_groups_do_not_chain_through_intermediate_texts():
+    # Each text is within the threshold of its neighbour, but the first and last are not
+    texts = ["alpha beta gamma delta", "alpha beta gamma delta epsilon", "beta gamma delta epsilon zeta"]
+    representatives, groups = collapse_near_duplicates(texts, threshold=0.6)
+
+    assert representatives == [0, 2]
+    assert groups == [0, 0, 1]
+
+
+def test_empty_texts_are_never_merged():
+    representatives, groups = collapse_near_duplicates(["", "...", "", "Shipped v2"])
+    assert representatives == [0, 1, 2, 3]
+    assert groups == [0, 1, 2, 3]
+
+
+def test_threshold_above_one_disables_collapsing():
+    texts = ["Same bullet", "Same bullet"]
+    assert collapse_near_duplicates(texts, threshold=1.01) == ([0, 1], [0, 1])
+    assert collapse_near_duplicates(texts, threshold=1) == ([0], [0, 0])
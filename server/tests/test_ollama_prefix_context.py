@@ -0,0 +1,63 @@
+import pytest
+
+from services import ollama_service
+from services.ollama_service import OllamaService, ollama_context_cache
+
+PREFIX = "Rewrite bullets for this job description: Python engineer"
+
+
+class FakeOllama:
+    """Stands in for /api/generate: prefix evaluations return a context, prompts an answer"""
+
+    def __init__(self, context, eval_count):
+        self.context = context
+        self.eval_count = eval_count
+        self.payloads = []
+
+    def __call__(self, payload, timeout, stream):
+        self.payloads.append(payload)
+        if payload.get("options", {}).get("num_predict") == 0:
+            return {"context": list(self.context), "eval_count": self.eval_count}
+        return {"response": "rewritten"}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    ollama_context_cache.clear()
+    monkeypatch.setattr(ollama_service, "OLLAMA_CONTEXT_REUSE", True)
+    yield OllamaService()
+    ollama_context_cache.clear()
+
+
+def test_generated_tokens_are_trimmed_from_the_cached_context(service, monkeypatch):
+    fake = FakeOllama(context=[1, 2, 3, 4, 5, 6], eval_count=2)
+    monkeypatch.setattr(service, "_post_generate", fake)
+
+    assert service.generate("Bullet one", prefix=PREFIX) == "rewritten"
+    assert service.generate("Bullet two", prefix=PREFIX) == "rewritten"
+
+    # The prefix is evaluated once and both prompts continue from it, minus the 2 generated tokens
+    evaluations = [payload for payload in fake.payloads if "context" not in payload and payload["prompt"] == PREFIX]
+    assert len(evaluations) == 1
+    calls = [payload for payload in fake.payloads if "context" in payload]
+    assert [payload["context"] for payload in calls] == [[1, 2, 3, 4], [1, 2, 3, 4]]
+    assert [payload["prompt"] for payload in calls] == ["Bullet one", "Bullet two"]
+
+
+def test_context_without_generated_tokens_is_kept_whole(service, monkeypatch):
+    fake = FakeOllama(context=[1, 2, 3], eval_count=0)
+    monkeypatch.setattr(service, "_post_generate", fake)
+
+    service.generate("Bullet", prefix=PREFIX)
+    assert fake.payloads[-1]["context"] == [1, 2, 3]
+
+
+def test_context_that_is_all_generated_falls_back_to_the_full_prompt(service, monkeypatch):
+    fake = FakeOllama(context=[1, 2], eval_count=2)
+    monkeypatch.setattr(service, "_post_generate", fake)
+
+    service.generate("Bullet", prefix=PREFIX)
+    assert "context" not in fake.payloads[-1]
+    assert fake.payloads[-1]["prompt"] == f"{PREFIX}\n\nBullet"
+    # Nothing usable was cached, so the next call evaluates the prefix again
+    assert len(ollama_context_cache) == 0
@@ -0,0 +1,45 @@
+from services.relevance import bm25_scores, select_relevant, tokenize
+
+JD = "Senior Python engineer: Flask APIs, PostgreSQL, Kubernetes. Python and Flask required."
+
+
+def test_tokenize_keeps_tech_names_and_drops_stopwords():
+    assert tokenize("Used C++, C# and Node.js with the team") == ["c++", "c#", "node.js"]
+
+
+def test_bm25_ranks_bullets_sharing_jd_terms_highest():
+    bullets = [
+        "Organised the office holiday party",
+        "Built Flask APIs in Python backed by PostgreSQL",
+        "Deployed services to Kubernetes",
+    ]
+    scores = bm25_scores(bullets, JD)
+
+    assert scores[0] == 0
+    assert scores[1] > scores[2] > 0
+
+
+def test_bm25_without_query_terms_scores_zero():
+    assert list(bm25_scores(["Built Flask APIs"], "the and of")) == [0]
+    assert len(bm25_scores([], JD)) == 0
+
+
+def test_select_relevant_keeps_top_k_in_resume_order():
+    bullets = [
+        "Deployed services to Kubernetes",
+        "Organised the office holiday party",
+        "Built Flask APIs in Python backed by PostgreSQL",
+        "Ran the book club",
+    ]
+    assert select_relevant(bullets, JD, top_k=2) == [0, 2]
+
+
+def test_select_relevant_keeps_everything_when_disabled_or_short():
+    bullets = ["Ran the book club", "Deployed services to Kubernetes"]
+    assert select_relevant(bullets, JD, top_k=0) == [0, 1]
+    assert select_relevant(bullets, JD, top_k=5) == [0, 1]
+
+
+def test_equally_relevant_bullets_keep_resume_order():
+    bullets = ["Ran the book club", "Painted the fence", "Watered the plants"]
+    assert select_relevant(bullets, JD, top_k=2) == [0, 1]
@@ -0,0 +1,145 @@
+import pytest
+import requests
+
+from services import resilience
+from services.deadline import DeadlineExceeded
+from services.resilience import CircuitBreaker, CircuitOpenError, ProviderGuard
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    return fake
+
+
+def _open(breaker, calls=5):
+    for _ in range(calls):
+        breaker.record_failure()
+
+
+def test_breaker_opens_once_failure_ratio_crosses_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=0.5, window_size=10, min_calls=4, reset_timeout=30)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"  # 1 of 3, and fewer than min_calls
+
+    breaker.record_failure()
+    assert breaker.state == "open"  # 2 of 4
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+
+def test_half_open_admits_one_probe_and_closes_on_success(clock):
+    breaker = CircuitBreaker(min_calls=5, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_for_another_reset_timeout(clock):
+    breaker = CircuitBreaker(min_calls=5, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 29
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half_open"
+
+
+def test_released_probe_lets_the_next_call_probe(clock):
+    breaker = CircuitBreaker(min_calls=5, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.release()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def _guard(attempts=3):
+    return ProviderGuard("test", rate=1000, burst=1000, max_attempts=attempts,
+                         breaker=CircuitBreaker(min_calls=5, reset_timeout=30))
+
+
+def test_retryable_errors_are_retried_then_raised(clock):
+    guard = _guard()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise requests.exceptions.Timeout("slow")
+
+    with pytest.raises(requests.exceptions.Timeout):
+        guard.call(fail)
+    assert len(calls) == 3
+
+
+def test_retry_succeeds_after_a_transient_error(clock):
+    guard = _guard()
+    answers = iter([requests.exceptions.ConnectionError("reset"), "ok"])
+
+    def flaky():
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert guard.call(flaky) == "ok"
+
+
+def test_open_circuit_fails_fast_without_calling(clock):
+    guard = _guard(attempts=1)
+    _open(guard.breaker)
+
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: pytest.fail("called through an open circuit"))
+
+
+def test_deadline_and_bad_requests_leave_the_breaker_closed(clock):
+    guard = _guard()
+
+    def out_of_time():
+        raise DeadlineExceeded("Request deadline reached while queued")
+
+    def bad_request():
+        raise ValueError("prompt too long")
+
+    for _ in range(6):
+        with pytest.raises(DeadlineExceeded):
+            guard.call(out_of_time)
+        with pytest.raises(ValueError):
+            guard.call(bad_request)
+    assert guard.breaker.state == "closed"
+
+
+def test_deadline_during_half_open_probe_frees_the_probe(clock):
+    guard = _guard()
+    _open(guard.breaker)
+    clock.now += 30
+
+    with pytest.raises(DeadlineExceeded):
+        guard.call(lambda: (_ for _ in ()).throw(DeadlineExceeded("out of time")))
+    assert guard.call(lambda: "ok") == "ok"
+    assert guard.breaker.state == "closed"
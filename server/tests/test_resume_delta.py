@@ -0,0 +1,23 @@
+from services.resume_delta import bullet_paths, resume_delta
+
+RESUME = {
+    "experience": [{"bullets": ["Built APIs", "Wrote tests"]}],
+    "projects": [{"bullets": ["Shipped a CLI"]}],
+    "skills": [{"category": "Languages", "skills": [{"skill": "Python", "context": "Python services"},
+                                                   {"skill": "Go"}]}],
+}
+
+
+def test_paths_follow_extraction_order():
+    assert bullet_paths(RESUME) == [
+        "experience.0.bullets.0", "experience.0.bullets.1", "projects.0.bullets.0", "skills.0.skills.0.context"
+    ]
+
+
+def test_only_changed_bullets_keyed_by_path():
+    original = ["Built APIs", "Wrote tests", "Shipped a CLI", "Python services"]
+    improved = ["Built REST APIs serving 2M requests/day", "Wrote tests ", "", "Python services"]
+
+    assert resume_delta(original, improved, RESUME) == [
+        {"path": "experience.0.bullets.0", "position": 0, "improved": "Built REST APIs serving 2M requests/day"}
+    ]
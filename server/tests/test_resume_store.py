@@ -0,0 +1,107 @@
+import pytest
+from flask import Flask
+
+from routes.bulk_match_routes import bulk_match_routes
+from routes.resume_routes import resume_routes
+from services import resume_store
+from services.resume_store import ResumeStore, resume_from_request, stored_duplicate_groups
+
+RESUME = {
+    "summary": "Backend developer",
+    "experience": [{"title": "Engineer", "bullets": [
+        "Built Flask APIs in Python serving 10k requests per day",
+        "Built Flask APIs in Python, serving 10k requests per day.",
+        "Moved the billing database to PostgreSQL",
+    ]}],
+    "file_info": {"filename": "resume.pdf"},
+}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResumeStore(str(tmp_path / "resumes.db"))
+    monkeypatch.setattr(resume_store, "resume_store", store)
+    return store
+
+
+def test_same_content_is_stored_once(store):
+    first = store.save(RESUME)
+    # Upload metadata doesn't count as content
+    again = store.save(dict(RESUME, file_info={"filename": "copy.pdf"}))
+
+    assert first["created"] and first["version"] == 1
+    assert again == dict(first, created=False)
+    assert store.save(RESUME, first["resume_id"])["created"] is False
+    assert len(store.versions(first["resume_id"])) == 1
+
+
+def test_new_content_adds_a_version(store):
+    resume_id = store.save(RESUME)["resume_id"]
+    edited = dict(RESUME, summary="Senior backend developer")
+    saved = store.save(edited, resume_id)
+
+    assert saved["version"] == 2 and saved["created"]
+    assert store.get(resume_id)["resume_data"]["summary"] == "Senior backend developer"
+    assert store.get(resume_id, 1)["resume_data"]["summary"] == "Backend developer"
+    assert store.get(resume_id)["latest_version"] == 2
+    assert [version["version"] for version in store.versions(resume_id)] == [1, 2]
+    assert store.get(resume_id, 3) is None
+    with pytest.raises(KeyError):
+        store.save(RESUME, "missing")
+
+
+def test_artifacts_are_derived_and_shared_by_content(store):
+    resume_id = store.save(RESUME)["resume_id"]
+    artifacts = store.get(resume_id, include_artifacts=True)["artifacts"]
+
+    assert artifacts["bullet_paths"] == ["experience.0.bullets.0", "experience.0.bullets.1", "experience.0.bullets.2"]
+    assert artifacts["bullets"] == RESUME["experience"][0]["bullets"]
+    assert stored_duplicate_groups(artifacts) == ([0, 2], [0, 0, 1])
+    assert set(artifacts["skills"]) >= {"Python", "Flask", "PostgreSQL"}
+
+
+def test_delete_removes_every_version(store):
+    resume_id = store.save(RESUME)["resume_id"]
+    store.save(dict(RESUME, summary="Edited"), resume_id)
+
+    assert store.delete(resume_id)
+    assert not store.delete(resume_id)
+    assert store.get(resume_id) is None
+    assert store.versions(resume_id) == []
+
+
+def test_resume_from_request(store):
+    resume_id = store.save(RESUME)["resume_id"]
+
+    assert resume_from_request({"resume_data": {"summary": "Inline"}}) == ({"summary": "Inline"}, None)
+    assert resume_from_request({}) == ({}, None)
+    resume_data, artifacts = resume_from_request({"resume_id": resume_id, "resume_version": "1"})
+    assert resume_data == RESUME and artifacts["bullets"]
+    with pytest.raises(LookupError):
+        resume_from_request({"resume_id": resume_id, "resume_version": 2})
+    with pytest.raises(ValueError):
+        resume_from_request({"resume_id": resume_id, "resume_version": "latest"})
+
+
+def test_routes_answer_400_for_bad_version_and_top_k(store):
+    app = Flask(__name__)
+    app.register_blueprint(resume_routes)
+    app.register_blueprint(bulk_match_routes)
+    client = app.test_client()
+
+    response = client.post("/api/resumes", json={"resume_data": RESUME})
+    assert response.status_code == 201
+    resume_id = response.get_json()["resume_id"]
+    assert client.post("/api/resumes", json={"resume_data": RESUME}).status_code == 200
+
+    assert client.get(f"/api/resumes/{resume_id}?version=one").status_code == 400
+    assert client.get(f"/api/resumes/{resume_id}?version=9").status_code == 404
+
+    body = {"resume_id": resume_id, "jd": "Python engineer"}
+    response = client.post("/api/match_entire_resume", json=dict(body, resume_version="one"))
+    assert response.status_code == 400
+    assert "resume_version" in response.get_json()["error"]
+    response = client.post("/api/match_entire_resume", json=dict(body, top_k="all"))
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "top_k must be an integer"
+    assert client.post("/api/match_entire_resume", json=dict(body, resume_id="missing")).status_code == 404
@@ -0,0 +1,76 @@
+from services.structured_output import fill_missing_rewrites, parse_id_outputs, rewrite_by_id
+
+IDS = ["b1", "b2", "b3"]
+
+
+def test_json_object_keyed_by_id():
+    text = '```json\n{"b1": "First", "b2": "Second", "b3": "Third",}\n```'
+    assert parse_id_outputs(text, IDS) == {"b1": "First", "b2": "Second", "b3": "Third"}
+
+
+def test_missing_ids_are_left_out_not_guessed():
+    assert parse_id_outputs('{"b1": "First", "b3": "Third"}', IDS) == {"b1": "First", "b3": "Third"}
+    # A bare list that doesn't line up with the IDs can't be trusted
+    assert parse_id_outputs('["First", "Second"]', IDS) == {}
+
+
+def test_ids_that_were_not_sent_are_ignored():
+    assert parse_id_outputs('{"b1": "First", "b7": "Stray"}', IDS) == {"b1": "First"}
+
+
+def test_bare_numbers_count_positions_in_the_ids_sent():
+    # A follow-up call for only b2 and b5: its "1." is b2 and its "2" key is b5
+    assert parse_id_outputs("1. Second again\n2. Fifth again", ["b2", "b5"]) == {"b2": "Second again",
+                                                                                  "b5": "Fifth again"}
+    assert parse_id_outputs('{"1": "Second again", "2": "Fifth again"}', ["b2", "b5"]) == {
+        "b2": "Second again", "b5": "Fifth again"
+    }
+    assert parse_id_outputs('{"3": "Out of range"}', ["b2", "b5"]) == {}
+
+
+def test_explicit_tags_are_taken_as_written():
+    assert parse_id_outputs("[b5] Fifth\nb2: Second", ["b2", "b5"]) == {"b2": "Second", "b5": "Fifth"}
+
+
+def test_list_of_objects_and_truncated_json():
+    assert parse_id_outputs('[{"id": "b2", "text": "Second"}, {"id": "b1", "rewrite": "First"}]', IDS) == {
+        "b1": "First", "b2": "Second"
+    }
+    # Cut off by the token limit: complete lines are kept, the unterminated one is dropped
+    truncated = '{\n"b1": "First",\n"b2": "Second",\n"b3": "Thi'
+    assert parse_id_outputs(truncated, IDS) == {"b1": "First", "b2": "Second"}
+
+
+def test_structure_labels_and_markers_are_stripped():
+    assert parse_id_outputs('{"b1": "- Result: Cut costs 20%"}', ["b1"], "star") == {"b1": "Cut costs 20%"}
+
+
+def test_follow_up_asks_only_for_missing_ids():
+    prompts = []
+
+    def generate(prompt):
+        prompts.append(prompt)
+        # First answer skips b2; the follow-up is numbered from 1
+        return '{"b1": "One", "b3": "Three"}' if len(prompts) == 1 else "1. Two"
+
+    rewrites = rewrite_by_id(["one", "two", "three"], lambda items: repr(items), generate)
+
+    assert rewrites == ["One", "Two", "Three"]
+    assert prompts[1] == repr([("b2", "two")])
+
+
+def test_failed_follow_up_keeps_partial_results_and_fills_locally():
+    calls = []
+
+    def generate(prompt):
+        calls.append(prompt)
+        if len(calls) > 1:
+            raise RuntimeError("upstream down")
+        return '{"b1": "One"}'
+
+    rewrites = rewrite_by_id(["one", "two"], lambda items: repr(items), generate)
+    filled, local_positions = fill_missing_rewrites(rewrites, ["one", "two"])
+
+    assert rewrites == ["One", None]
+    assert filled[0] == "One" and filled[1]
+    assert local_positions == [1]